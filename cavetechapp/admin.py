@@ -2,7 +2,20 @@
 Admin configuration for Cave Tech Labs website.
 """
 from django.contrib import admin
-from .models import Person, Project, Category, SiteSettings
+from django.utils import timezone
+from .models import Person, Project, Category, SiteSettings, Job, SearchDocument
+from .search import matching
+
+
+class FullTextSearchMixin:
+    """Answer the changelist search box from the full-text index instead of icontains scans."""
+    search_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        ids = matching(search_term).filter(kind=self.search_kind).values('object_id')
+        return queryset.filter(pk__in=ids), False
 
 
 @admin.register(SiteSettings)
@@ -77,10 +90,12 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Person)
-class PersonAdmin(admin.ModelAdmin):
+class PersonAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ('name', 'title', 'email', 'created_at')
     list_filter = ('created_at', 'updated_at')
+    # Enables the search box; matches come from the search index
     search_fields = ('name', 'title', 'email', 'bio')
+    search_kind = SearchDocument.PERSON
     fieldsets = (
         ('Basic Information', {
             'fields': ('name', 'title', 'email')
@@ -97,10 +112,12 @@ class PersonAdmin(admin.ModelAdmin):
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ('title', 'category', 'creator', 'featured', 'created_at')
     list_filter = ('category', 'featured', 'created_at', 'updated_at')
+    # Enables the search box; matches come from the search index
     search_fields = ('title', 'description', 'creator__name')
+    search_kind = SearchDocument.PROJECT
     prepopulated_fields = {'slug': ('title',)}
     fieldsets = (
         ('Basic Information', {
@@ -118,3 +135,25 @@ class ProjectAdmin(admin.ModelAdmin):
         }),
     )
     readonly_fields = ('created_at', 'updated_at')
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('task', 'status', 'attempts', 'max_attempts', 'run_after', 'updated_at')
+    list_filter = ('status', 'task')
+    search_fields = ('task', 'last_error')
+    readonly_fields = ('task', 'payload', 'attempts', 'last_error', 'created_at', 'updated_at')
+    fields = ('task', 'payload', 'status', 'attempts', 'max_attempts', 'run_after', 'last_error', 'created_at', 'updated_at')
+    actions = ['retry_jobs']
+
+    def has_add_permission(self, request):
+        """Jobs are queued by the application, not by hand."""
+        return False
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        """Put selected jobs back in the queue with a fresh set of attempts."""
+        updated = queryset.exclude(status=Job.RUNNING).update(
+            status=Job.PENDING, attempts=0, run_after=timezone.now(), last_error=''
+        )
+        self.message_user(request, f"{updated} job(s) queued for retry.")
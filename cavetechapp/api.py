@@ -0,0 +1,231 @@
+"""
+Read-only JSON API for projects, people and categories.
+
+    GET /api/projects/?fields=slug,title&category=electronics&limit=50
+    GET /api/projects/?after=<next cursor from the previous page>
+    GET /api/people/?format=ndjson
+
+Pages are JSON objects ``{"results": [...], "next": <url or null>}``
+paginated with the same keyset cursors as the HTML listings (see
+pagination.py), so deep pages stay cheap. ``?fields=`` selects a sparse
+fieldset and only the columns those fields need are loaded (``only()``).
+``?format=ndjson`` streams every row as one JSON object per line, reading
+the table in chunks of API_EXPORT_CHUNK_SIZE rows instead of loading it
+into memory.
+"""
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.views import View
+
+from .cache import ConditionalGetMixin, PageCacheMixin, latest_change
+from .dependencies import track_listing
+from .i18n import translate
+from .models import Category, Person, Project
+from .pagination import InvalidCursor, KeysetPaginator
+
+# columns: what the field reads, as only() names; value: obj -> JSON value
+ApiField = namedtuple('ApiField', 'columns value')
+
+
+def image_url(image):
+    """The image's URL, or None when there is no image."""
+    return image.url if image else None
+
+
+def column(name):
+    """A field serialised straight from the model attribute name."""
+    return ApiField((name,), lambda obj: getattr(obj, name))
+
+
+class InvalidParameter(ValueError):
+    """Raised for a malformed query parameter; reported as 400."""
+
+
+class ResourceView(ConditionalGetMixin, PageCacheMixin, View):
+    """
+    List one model as JSON pages or an NDJSON stream.
+
+    Subclasses set ``model``, a unique ``ordering`` for the cursors and
+    ``fields``, a dict of public field name to ApiField.
+    """
+
+    model = None
+    ordering = ()
+    fields = {}
+    default_limit = 20
+    max_limit = 100
+
+    def get_queryset(self, request):
+        """The filtered, unordered rows to list."""
+        return self.model.objects.all()
+
+    def get_validators(self, request):
+        return [latest_change(self.get_queryset(request))]
+
+    def selected_fields(self, request):
+        """The requested field names, in the order given (default: all)."""
+        requested = request.GET.get('fields')
+        if not requested:
+            return list(self.fields)
+        names = [name.strip() for name in requested.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown or not names:
+            raise InvalidParameter(
+                f"Unknown field(s) {', '.join(unknown)}; choose from {', '.join(self.fields)}"
+            )
+        return names
+
+    def limit(self, request):
+        """The page size from ?limit=."""
+        value = request.GET.get('limit')
+        if value is None:
+            return self.default_limit
+        try:
+            limit = int(value)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.max_limit:
+            raise InvalidParameter(f"limit must be between 1 and {self.max_limit}")
+        return limit
+
+    def build_queryset(self, request, names):
+        """Load only the columns the selected fields and the ordering need."""
+        columns = {self.model._meta.pk.name}
+        columns.update(field.lstrip('-') for field in self.ordering if field.lstrip('-') != 'pk')
+        for name in names:
+            columns.update(self.fields[name].columns)
+        queryset = self.get_queryset(request).only(*sorted(columns))
+        related = sorted({name.split('__')[0] for name in columns if '__' in name})
+        if related:
+            # select_related() without arguments would follow every foreign key
+            queryset = queryset.select_related(*related)
+        return queryset
+
+    def serialise(self, obj, names):
+        """Return the selected fields of obj as a dict."""
+        return {name: self.fields[name].value(obj) for name in names}
+
+    def get(self, request):
+        # New and deleted rows of every listed model purge the cached pages
+        for model in self.cache_models:
+            track_listing(model)
+        try:
+            names = self.selected_fields(request)
+            queryset = self.build_queryset(request, names)
+            if request.GET.get('format') == 'ndjson':
+                return self.stream(queryset, names)
+            return self.page(request, queryset, names)
+        except InvalidParameter as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+
+    def page(self, request, queryset, names):
+        """One cursor page as a JSON object."""
+        paginator = KeysetPaginator(queryset, self.ordering, self.limit(request))
+        try:
+            page = paginator.page(request.GET.get('after'))
+        except InvalidCursor:
+            raise InvalidParameter("Invalid after cursor")
+        next_url = None
+        if page.has_next():
+            params = {key: value for key, value in request.GET.items() if key != 'after'}
+            next_url = request.build_absolute_uri(
+                f"{request.path}?{urlencode({**params, 'after': page.next_cursor})}"
+            )
+        return JsonResponse({
+            'results': [self.serialise(obj, names) for obj in page],
+            'next': next_url,
+        })
+
+    def stream(self, queryset, names):
+        """Every row as newline-delimited JSON, read in chunks."""
+        queryset = queryset.order_by(*self.ordering)
+        chunk_size = settings.API_EXPORT_CHUNK_SIZE
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+        if settings.ASYNC_VIEWS:
+            # Served over ASGI: an async iterator is streamed as it is read,
+            # a sync one would first be consumed into a list
+            async def lines():
+                async for obj in queryset.aiterator(chunk_size=chunk_size):
+                    yield encoder.encode(self.serialise(obj, names)) + '\n'
+        else:
+            def lines():
+                for obj in queryset.iterator(chunk_size=chunk_size):
+                    yield encoder.encode(self.serialise(obj, names)) + '\n'
+
+        return StreamingHttpResponse(lines(), content_type='application/x-ndjson; charset=utf-8')
+
+
+class ProjectsAPIView(ResourceView):
+    """Projects, newest first; ``?category=<slug>`` filters."""
+
+    model = Project
+    ordering = ('-created_at', 'pk')
+    cache_models = (Project, Category)
+    fields = {
+        'id': column('id'),
+        'slug': column('slug'),
+        'title': column('title'),
+        'description': column('description'),
+        'category': ApiField(('category', 'category__slug'), lambda project: project.category.slug),
+        'creator': ApiField(('creator',), lambda project: project.creator_id),
+        'featured': column('featured'),
+        'image': ApiField(('image',), lambda project: image_url(project.image)),
+        'url': ApiField(('slug',), lambda project: reverse('cavetechapp:project_detail', args=[project.slug])),
+        'created_at': column('created_at'),
+        'updated_at': column('updated_at'),
+    }
+
+    def get_queryset(self, request):
+        projects = Project.objects.all()
+        category_slug = request.GET.get('category')
+        if category_slug:
+            projects = projects.filter(category__slug=category_slug)
+        return projects
+
+    def get_validators(self, request):
+        return [latest_change(self.get_queryset(request), 'category__updated_at')]
+
+
+class PeopleAPIView(ResourceView):
+    """Members by name."""
+
+    model = Person
+    ordering = ('name', 'pk')
+    cache_models = (Person,)
+    fields = {
+        'id': column('id'),
+        'name': column('name'),
+        'title': column('title'),
+        'bio': column('bio'),
+        'email': column('email'),
+        'image': ApiField(('image',), lambda person: image_url(person.image)),
+        'url': ApiField((), lambda person: reverse('cavetechapp:person_detail', args=[person.pk])),
+        'created_at': column('created_at'),
+        'updated_at': column('updated_at'),
+    }
+
+
+class CategoriesAPIView(ResourceView):
+    """Categories by name, with their name in every language."""
+
+    model = Category
+    ordering = ('name', 'pk')
+    cache_models = (Category,)
+    fields = {
+        'id': column('id'),
+        'slug': column('slug'),
+        'name': column('name'),
+        'names': ApiField(('slug', 'name'), lambda category: {
+            code: translate(f'categories.{category.slug}', code, default=category.name)
+            for code, _ in settings.LANGUAGES
+        }),
+        'description': column('description'),
+        'created_at': column('created_at'),
+        'updated_at': column('updated_at'),
+    }
@@ -7,5 +7,6 @@ class CavetechappConfig(AppConfig):
     verbose_name = 'Cave Tech Application'
 
     def ready(self):
-        """Register signals when app is ready."""
-        import cavetechapp.signals
\ No newline at end of file
+        """Register signals and background tasks."""
+        import cavetechapp.signals
+        import cavetechapp.tasks
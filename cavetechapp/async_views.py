@@ -0,0 +1,145 @@
+"""
+Async counterparts of the public views, served when ASYNC_VIEWS is enabled.
+
+Each view reuses the cache settings and validators of its synchronous
+original in views.py, but loads its rows with the async ORM and renders the
+template in a worker thread, so a request waiting on the database does not
+hold a thread of its own. Django 4.2 runs async ORM calls through
+sync_to_async(thread_sensitive=True), so the queries a view awaits with
+asyncio.gather() still run one after another.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.shortcuts import render
+
+from . import views
+from .cache import AsyncCacheMixin
+from .dependencies import track_listing, uncacheable
+from .models import Person, Project, Category
+from .pagination import paginate
+from .related import fallback_related_projects, related_projects
+from .search import search
+
+# Templates may still touch the database (context processors, lazy
+# relations), so they are rendered in a worker thread.
+arender = sync_to_async(render)
+apaginate = sync_to_async(paginate)
+
+
+async def alist(queryset):
+    """Evaluate queryset with the async ORM."""
+    return [obj async for obj in queryset]
+
+
+class IndexView(AsyncCacheMixin, views.IndexView):
+    """Home page view."""
+
+    async def get(self, request):
+        featured_projects, people = await asyncio.gather(
+            alist(
+                Project.objects.filter(featured=True).select_related('category', 'creator')
+                .defer('description', 'creator__bio')[:6]
+            ),
+            alist(Person.objects.defer('bio')),
+        )
+        track_listing(Project)
+        track_listing(Person)
+        context = {
+            'featured_projects': featured_projects,
+            'people': people,
+        }
+        return await arender(request, 'cavetechapp/index.html', context)
+
+
+class AboutView(AsyncCacheMixin, views.AboutView):
+    """About Us page view."""
+
+    async def get(self, request):
+        # A single cached row and catalogue lookups: nothing to await
+        return await sync_to_async(super().get)(request)
+
+
+class PeopleListView(AsyncCacheMixin, views.PeopleListView):
+    """View listing all members, paginated by name."""
+
+    async def get(self, request):
+        context = await apaginate(request, Person.objects.defer('bio'), self.ordering, self.paginate_by)
+        context['people'] = context['page_obj'].object_list
+        track_listing(Person)
+        return await arender(request, 'cavetechapp/people_list.html', context)
+
+
+class PersonDetailView(AsyncCacheMixin, views.PersonDetailView):
+    """View for individual person profile."""
+
+    async def get(self, request, pk):
+        person, projects = await asyncio.gather(
+            Person.objects.filter(pk=pk).afirst(),
+            alist(Project.objects.filter(creator_id=pk).select_related('category').defer('description')),
+        )
+        if person is None:
+            raise Http404("No Person matches the given query.")
+        track_listing(Project, creator=person.pk)
+        context = {'person': person, 'projects': projects}
+        return await arender(request, 'cavetechapp/person_detail.html', context)
+
+
+class ProjectsListView(AsyncCacheMixin, views.ProjectsListView):
+    """View listing all projects with filtering, newest first."""
+
+    async def get(self, request):
+        projects = Project.objects.select_related('category', 'creator').defer('description', 'creator__bio')
+        category_slug = request.GET.get('category')
+        if category_slug:
+            projects = projects.filter(category__slug=category_slug)
+        context, categories = await asyncio.gather(
+            apaginate(request, projects, self.ordering, self.paginate_by),
+            alist(Category.objects.all()),
+        )
+        if category_slug and category_slug not in {category.slug for category in categories}:
+            uncacheable()
+        track_listing(Project)
+        track_listing(Category)
+        context.update({
+            'projects': context['page_obj'].object_list,
+            'categories': categories,
+            'selected_category': category_slug,
+        })
+        return await arender(request, 'cavetechapp/projects_list.html', context)
+
+
+class ProjectDetailView(AsyncCacheMixin, views.ProjectDetailView):
+    """View for individual project details."""
+
+    async def get(self, request, slug):
+        # Related projects are looked up through the slug, so neither query
+        # needs the result of the other.
+        project, related = await asyncio.gather(
+            Project.objects.select_related('category', 'creator').filter(slug=slug).afirst(),
+            alist(related_projects(slug)),
+        )
+        if project is None:
+            raise Http404("No Project matches the given query.")
+        if not related:
+            related = await alist(fallback_related_projects(slug))
+            track_listing(Project, category=project.category_id)
+        context = {
+            'project': project,
+            'related_projects': related,
+        }
+        return await arender(request, 'cavetechapp/project_detail.html', context)
+
+
+class SearchView(AsyncCacheMixin, views.SearchView):
+    """Full-text search across projects and members, best match first."""
+
+    async def get(self, request):
+        query = request.GET.get('q', '').strip()
+        context = await apaginate(request, search(query), None, self.paginate_by)
+        context.update({
+            'query': query,
+            'results': context['page_obj'].object_list,
+        })
+        return await arender(request, 'cavetechapp/search.html', context)
@@ -0,0 +1,336 @@
+"""
+Full-page response cache and conditional GET support for the public views.
+
+Every cached page is keyed by its URL (including the query string), the
+active language, the translation catalogue version, the deployed code's
+version (site_version()) and the current version stamp of each model the
+page reads.
+Saving or deleting a row bumps its model's stamp (see signals.py), so only
+the pages built from that model stop matching and are re-rendered on the
+next request; stale entries simply expire.
+
+Projects, members and categories are tracked per row instead: their stamps
+are left out of page keys and a change purges and re-renders only the pages
+that show the changed row (see dependencies.py). Only the plain URL and the
+query parameters a view lists in ``tracked_params`` are tracked that way;
+any other query string (search terms, API options, campaign tags) keeps
+every stamp in its key. Tracked parameters that match no real variant (an
+unknown category, a page out of range) are not cached at all, so arbitrary
+URLs never write to the database.
+
+ETag/Last-Modified validators are derived from the ``updated_at`` stamps of
+the rows a page shows and are cached under the same versioned key, so a
+revalidation that ends in 304 costs no ORM queries when warm.
+
+AsyncCacheMixin provides the same behaviour for the async views.
+"""
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import HttpRequest
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views import View
+
+from . import dependencies
+from .i18n import catalogue_version
+
+
+PAGE_CACHE_PREFIX = 'cavetechapp:page'
+MODEL_VERSION_PREFIX = 'cavetechapp:version'
+
+# Values of tracked query parameters: page numbers, cursors and slugs
+TRACKED_VALUE = re.compile(r'[\w-]{1,200}')
+
+
+def is_shared_cache():
+    """
+    Whether the default cache is shared by every process.
+
+    The per-process memory cache is not: a purge made by the job worker or
+    one Gunicorn worker would never reach the pages the others serve.
+    """
+    return not isinstance(caches['default'], LocMemCache)
+
+
+@lru_cache(maxsize=None)
+def _code_digest():
+    digest = hashlib.md5()
+    # Hashed asset names, as written by collectstatic
+    manifest = Path(settings.STATIC_ROOT) / 'staticfiles.json'
+    if manifest.is_file():
+        digest.update(manifest.read_bytes())
+    for engine in settings.TEMPLATES:
+        for directory in map(Path, engine.get('DIRS', [])):
+            for path in sorted(directory.rglob('*')):
+                if path.is_file():
+                    digest.update(str(path.relative_to(directory)).encode())
+                    digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def site_version():
+    """
+    Stamp of the deployed code: SITE_VERSION, or a digest of the staticfiles
+    manifest and the templates, computed once per process.
+
+    Part of every page cache key, ETag and card key, so pages rendered by a
+    previous deploy (pointing at asset names that are gone) are not reused.
+    """
+    return settings.SITE_VERSION or _code_digest()
+
+
+def _version_key(model):
+    return f'{MODEL_VERSION_PREFIX}:{model._meta.label_lower}'
+
+
+def model_versions(models):
+    """Return the current version stamp of each model, creating missing ones."""
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # add() so concurrent workers settle on a single stamp
+            cache.add(key, uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    """
+    Invalidate every cached page that depends on model, once the current
+    transaction commits (so no page of the old rows gets the new stamp).
+    """
+    transaction.on_commit(lambda: cache.set(_version_key(model), uuid4().hex, None))
+
+
+def forget_validators(path, models):
+    """
+    Drop the cached ETag validators of the page at path in every language.
+
+    For changes that touch a few pages without bumping a model version.
+    """
+    request = HttpRequest()
+    request.path = path
+    for language, _ in settings.LANGUAGES:
+        with translation.override(language):
+            cache.delete(page_cache_key(request, models) + ':validators')
+
+
+def page_cache_key(request, models):
+    """Build the cache key for request given the models the page depends on."""
+    parts = [
+        request.get_full_path(),
+        translation.get_language() or '',
+        catalogue_version(),
+        site_version(),
+        *model_versions(models),
+    ]
+    digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+    return f'{PAGE_CACHE_PREFIX}:{digest}'
+
+
+def is_cacheable_request(request):
+    """Only anonymous GET/HEAD requests share cached pages."""
+    if settings.PAGE_CACHE_TIMEOUT <= 0 or request.method not in ('GET', 'HEAD'):
+        return False
+    user = getattr(request, 'user', None)
+    return user is None or not user.is_authenticated
+
+
+def is_cacheable_response(response):
+    """Only store complete, successful responses that set no cookies."""
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+    )
+
+
+class PageCacheMixin:
+    """
+    Serve a view from the page cache.
+
+    Set ``cache_models`` to every model whose rows the page (including
+    base.html) renders; a change to any of them purges the page. Set
+    ``tracked_params`` to the query parameters of the variants whose
+    dependencies are recorded, such as ``?category=`` and the pagination.
+    """
+
+    cache_models = ()
+    tracked_params = ()
+
+    def tracks_dependencies(self, request):
+        """Whether the page is recorded in dependencies.py rather than versioned."""
+        if not any(model in dependencies.TRACKED_MODELS for model in self.cache_models):
+            return False
+        for name, values in request.GET.lists():
+            if name not in self.tracked_params or len(values) != 1 or not TRACKED_VALUE.fullmatch(values[0]):
+                return False
+        return True
+
+    def get_page_cache_key(self, request):
+        """Return the cache key for request, or None if it must not be cached."""
+        if not is_cacheable_request(request):
+            return None
+        if len(request.get_full_path()) > dependencies.MAX_PATH_LENGTH:
+            return None
+        models = self.cache_models
+        if self.tracks_dependencies(request):
+            # Changes to tracked rows purge the pages showing them instead
+            models = [model for model in models if model not in dependencies.TRACKED_MODELS]
+        return page_cache_key(request, models)
+
+    def store_page(self, request, key, response, tokens, stamp):
+        """Cache a freshly rendered response along with its dependencies."""
+        cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+        if self.tracks_dependencies(request):
+            dependencies.record_page(key, request.get_full_path(), translation.get_language() or '', tokens, stamp)
+
+    def dispatch(self, request, *args, **kwargs):
+        key = self.get_page_cache_key(request)
+        if key is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        response = cache.get(key)
+        if response is not None:
+            return response
+
+        stamp = dependencies.change_stamp()
+        with dependencies.collect() as tokens:
+            response = super().dispatch(request, *args, **kwargs)
+        if is_cacheable_response(response) and dependencies.UNCACHEABLE not in tokens:
+            self.store_page(request, key, response, tokens, stamp)
+        return response
+
+
+def latest_change(queryset, *fields):
+    """
+    Return ``(max updated_at, row count)`` for queryset in one query.
+
+    ``fields`` lists extra related stamps to include, such as
+    ``'category__updated_at'``. The count lets validators notice deletions,
+    which do not move the maximum.
+    """
+    stamps = ('updated_at',) + fields
+    aggregates = {f'stamp_{i}': Max(field) for i, field in enumerate(stamps)}
+    result = queryset.order_by().aggregate(rows=Count('pk'), **aggregates)
+    values = [result[f'stamp_{i}'] for i in range(len(stamps))]
+    values = [value for value in values if value is not None]
+    return (max(values) if values else None), result['rows']
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional GET/HEAD requests with 304 before rendering.
+
+    Views implement ``get_validators(request, *args, **kwargs)`` returning a
+    list of ``(max updated_at, row count)`` pairs (see latest_change()) for
+    everything the page renders, or None when the page does not exist.
+    Validators are cached per ``cache_models`` versions like PageCacheMixin.
+    """
+
+    cache_models = ()
+
+    def get_validators(self, request, *args, **kwargs):
+        return None
+
+    def compute_validators(self, request, *args, **kwargs):
+        """Return ``(etag, last_modified timestamp)`` or None."""
+        changes = self.get_validators(request, *args, **kwargs)
+        if changes is None:
+            return None
+        stamps = [stamp for stamp, _ in changes if stamp is not None]
+        last_modified = int(max(stamps).timestamp()) if stamps else None
+        signature = '|'.join(
+            [request.get_full_path(), translation.get_language() or '', catalogue_version(), site_version()]
+            + [f'{stamp.isoformat() if stamp else ""}:{rows}' for stamp, rows in changes]
+        )
+        return quote_etag(hashlib.md5(signature.encode()).hexdigest()), last_modified
+
+    def resolve_validators(self, request, *args, **kwargs):
+        """Return the page's validators, from the cache when possible."""
+        key = None
+        validators = None
+        if settings.PAGE_CACHE_TIMEOUT > 0:
+            key = page_cache_key(request, self.cache_models) + ':validators'
+            validators = cache.get(key)
+        if validators is None:
+            validators = self.compute_validators(request, *args, **kwargs)
+            if validators is not None and key is not None:
+                cache.set(key, validators, settings.PAGE_CACHE_TIMEOUT)
+        return validators
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+
+        validators = self.resolve_validators(request, *args, **kwargs)
+        if validators is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        patch_validator_headers(response, validators)
+        return response
+
+
+def patch_validator_headers(response, validators):
+    """Add ETag/Last-Modified to successful and Not Modified responses."""
+    if response.status_code in (200, 304):
+        etag, last_modified = validators
+        response.headers['ETag'] = etag
+        if last_modified is not None:
+            response.headers['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, no_cache=True)
+
+
+class AsyncCacheMixin:
+    """
+    ConditionalGetMixin and PageCacheMixin for views with async handlers.
+
+    Combine it with a view that already declares ``cache_models`` and
+    ``get_validators`` (normally the synchronous view being mirrored). The
+    synchronous lookups (session, cache stamps, validator queries) run in
+    one thread hop before the handler is awaited.
+    """
+
+    def _lookup(self, request, *args, **kwargs):
+        validators = self.resolve_validators(request, *args, **kwargs)
+        key = self.get_page_cache_key(request)
+        return validators, key, dependencies.change_stamp() if key is not None else None
+
+    async def dispatch(self, request, *args, **kwargs):
+        # Skip the synchronous mixins' dispatch; View.dispatch returns the
+        # coroutine of the async handler.
+        if request.method not in ('GET', 'HEAD'):
+            return await View.dispatch(self, request, *args, **kwargs)
+
+        validators, key, stamp = await sync_to_async(self._lookup)(request, *args, **kwargs)
+        response = None
+        if validators is not None:
+            etag, last_modified = validators
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None and key is not None:
+            response = await cache.aget(key)
+        if response is None:
+            # The ORM's worker threads share the context, and so the token set
+            with dependencies.collect() as tokens:
+                response = await View.dispatch(self, request, *args, **kwargs)
+            if key is not None and is_cacheable_response(response) and dependencies.UNCACHEABLE not in tokens:
+                await sync_to_async(self.store_page)(request, key, response, tokens, stamp)
+        if validators is not None:
+            patch_validator_headers(response, validators)
+        return response
@@ -1,14 +1,27 @@
 """
 Context processors for the cavetechapp.
 """
+from django.conf import settings as django_settings
+
+from .i18n import section
 from .models import SiteSettings
 
 
 def site_settings(request):
     """Make SiteSettings available to all templates."""
     try:
-        settings = SiteSettings.get_settings()
+        settings = SiteSettings.get_cached()
     except:
         settings = None
     
     return {'settings': settings}
+
+
+def site_text(request):
+    """Make the SiteSettings texts for the active language available to all templates."""
+    return {'site_text': section('site')}
+
+
+def fragment_cache(request):
+    """Expose FRAGMENT_CACHE_TIMEOUT to the {% cache %} blocks of the card templates."""
+    return {'fragment_cache_timeout': django_settings.FRAGMENT_CACHE_TIMEOUT}
@@ -0,0 +1,258 @@
+"""
+Row-level dependencies of cached pages, for targeted regeneration.
+
+While PageCacheMixin renders a page into the cache it collects what the page
+was built from, as tokens:
+
+    cavetechapp.project:12            shows project 12 (noted automatically
+                                      for every TRACKED_MODELS row loaded)
+    cavetechapp.project               lists projects (track_listing())
+    cavetechapp.project@category=3    lists the projects of category 3
+
+and stores them as CachedPage / PageDependency rows (only for the plain URL
+and the query parameters the view tracks; see PageCacheMixin). Saving or
+deleting a tracked row (see signals.py) deletes only the cached pages whose
+tokens it matches. When the cache is shared by every process, it also
+queues the ``pages.regenerate`` job, which renders those pages again in the
+background so the next visitor is served a warm copy. The job worker prunes
+the rows of pages expired from the cache.
+
+Page bodies are therefore not keyed by the version stamps of TRACKED_MODELS
+(see cache.py). Other models, such as SiteSettings, still purge every page
+that reads them, as do the ETag validators, which are cheap to recompute.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+from functools import partial
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .export import get_client
+from .jobs import enqueue
+from .models import CachedPage, Category, PageDependency, Person, Project, RelatedProject
+
+# RelatedProject is rewritten in bulk by related.refresh_related(), which
+# purges the pages of the projects whose neighbours changed
+TRACKED_MODELS = (Category, Person, Project, RelatedProject)
+
+# Longer URLs are served uncached rather than tracked
+MAX_PATH_LENGTH = CachedPage._meta.get_field('path').max_length
+
+# Changes whenever a tracked row is saved or deleted
+CHANGE_STAMP_KEY = 'cavetechapp:dependencies:changed'
+
+# The token set of the page being rendered in this context, if any
+_collected = ContextVar('page_dependencies', default=None)
+
+# Added to the tokens of a page that must not be cached (see uncacheable())
+UNCACHEABLE = '!uncacheable'
+
+
+def change_stamp():
+    """The current change stamp, compared before and after rendering a page."""
+    stamp = cache.get(CHANGE_STAMP_KEY)
+    if stamp is None:
+        cache.add(CHANGE_STAMP_KEY, uuid4().hex, None)
+        stamp = cache.get(CHANGE_STAMP_KEY)
+    return stamp
+
+
+def row_token(model, pk):
+    """Token for a page showing the row pk of model."""
+    return f'{model._meta.label_lower}:{pk}'
+
+
+def listing_token(model, **filters):
+    """Token for a page listing rows of model, optionally those with one field value."""
+    label = model._meta.label_lower
+    if not filters:
+        return label
+    (field, value), = filters.items()
+    return f'{label}@{field}={value}'
+
+
+@contextmanager
+def collect():
+    """Collect the tokens of the page rendered inside the block into a set."""
+    tokens = set()
+    reset = _collected.set(tokens)
+    try:
+        yield tokens
+    finally:
+        _collected.reset(reset)
+
+
+def note_row(instance):
+    """Record that the page being rendered (if any) shows instance."""
+    tokens = _collected.get()
+    if tokens is not None and instance.pk is not None:
+        tokens.add(row_token(instance._meta.model, instance.pk))
+
+
+def track_listing(model, **filters):
+    """
+    Record that the page being rendered lists rows of model.
+
+    Pass a single ``field=value`` filter when the page only lists the rows
+    with that foreign key, such as one member's projects.
+    """
+    tokens = _collected.get()
+    if tokens is not None:
+        tokens.add(listing_token(model, **filters))
+
+
+def uncacheable():
+    """
+    Keep the page being rendered out of the page cache.
+
+    For variants no link leads to, such as an unknown category or a page
+    number out of range: caching and recording them would let any crawler
+    grow the cache tables.
+    """
+    tokens = _collected.get()
+    if tokens is not None:
+        tokens.add(UNCACHEABLE)
+
+
+def record_page(key, path, language, tokens, stamp):
+    """
+    Store the dependencies of the page just cached under key.
+
+    stamp is the change_stamp() read before the page was rendered. If a
+    tracked row changed since, the page may show the old row: it is dropped
+    from the cache again and left for the pages.regenerate job.
+    """
+    values = {'cache_key': key, 'stale': False, 'updated_at': timezone.now()}
+    with transaction.atomic():
+        # Write before reading: SQLite then takes the write lock up front,
+        # waiting up to busy_timeout, instead of failing to upgrade a read lock
+        pages = CachedPage.objects.filter(path=path, language=language)
+        if not pages.update(**values):
+            CachedPage.objects.bulk_create(
+                [CachedPage(path=path, language=language, **values)], ignore_conflicts=True,
+            )
+        page = pages.get()
+        page.dependencies.exclude(token__in=tokens).delete()
+        PageDependency.objects.bulk_create(
+            [PageDependency(page=page, token=token) for token in sorted(tokens)],
+            ignore_conflicts=True,
+        )
+    # Checked after the commit, so a later change is sure to find the page
+    if change_stamp() != stamp:
+        cache.delete(key)
+        CachedPage.objects.filter(pk=page.pk).update(stale=True)
+        queue_regeneration()
+
+
+def foreign_keys(instance):
+    """The instance's foreign key values as ``{field name: id}``."""
+    return {
+        field.name: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields if field.many_to_one
+    }
+
+
+def stored_foreign_keys(instance):
+    """The foreign keys of instance as last saved, or {} for a new row."""
+    names = {field.name: field.attname for field in instance._meta.concrete_fields if field.many_to_one}
+    if not names or instance.pk is None:
+        return {}
+    row = instance._meta.model.objects.filter(pk=instance.pk).values(*names.values()).first()
+    return {name: row[attname] for name, attname in names.items()} if row else {}
+
+
+def change_tokens(instance, previous=None):
+    """
+    Tokens of the pages a save or delete of instance may change.
+
+    previous holds the foreign keys the row had before the save (see
+    stored_foreign_keys()), so lists the row leaves are refreshed as well as the
+    ones it joins.
+    """
+    model = instance._meta.model
+    tokens = {row_token(model, instance.pk), listing_token(model)}
+    for values in (foreign_keys(instance), previous or {}):
+        for field, value in values.items():
+            if value is not None:
+                tokens.add(listing_token(model, **{field: value}))
+    return tokens
+
+
+def invalidate(tokens):
+    """
+    Purge the cached pages depending on any of tokens once the current
+    transaction commits (see purge()).
+
+    Purging earlier would let a request render the rows as they were before
+    the commit, under the new change stamp, and cache that page for good.
+    """
+    transaction.on_commit(partial(purge, frozenset(tokens)))
+
+
+def purge(tokens):
+    """
+    Purge the cached pages depending on any of tokens and queue their
+    regeneration. Returns the number of pages purged.
+    """
+    cache.set(CHANGE_STAMP_KEY, uuid4().hex, None)
+    pages = dict(
+        CachedPage.objects.filter(dependencies__token__in=tokens, stale=False)
+        .values_list('pk', 'cache_key').distinct()
+    )
+    if not pages:
+        return 0
+    cache.delete_many(pages.values())
+    CachedPage.objects.filter(pk__in=pages).update(stale=True)
+    queue_regeneration()
+    return len(pages)
+
+
+def prune_pages():
+    """Forget the pages that have expired from the cache; returns the number removed."""
+    cutoff = timezone.now() - timedelta(seconds=settings.PAGE_CACHE_TIMEOUT)
+    _, deleted = CachedPage.objects.filter(updated_at__lt=cutoff).delete()
+    return deleted.get(CachedPage._meta.label, 0)
+
+
+def warms_web_cache():
+    """
+    Whether pages rendered by the job worker reach the web processes.
+
+    With a per-process cache they would only warm the worker's own memory;
+    purged pages are then rendered by their next visitor instead.
+    """
+    from .cache import is_shared_cache  # cache.py imports this module
+    return is_shared_cache()
+
+
+def queue_regeneration():
+    """Queue the pages.regenerate job, when its renders can be served."""
+    if warms_web_cache():
+        enqueue('pages.regenerate')
+
+
+def regenerate_stale():
+    """Render purged pages into the cache again; returns the number rendered."""
+    # Pages nobody has requested within the cache lifetime are not kept warm
+    prune_pages()
+    if not warms_web_cache():
+        return 0
+
+    client = get_client()
+    rendered = 0
+    for page in CachedPage.objects.filter(stale=True).order_by('pk'):
+        client.cookies[settings.LANGUAGE_COOKIE_NAME] = page.language
+        response = client.get(page.path)
+        if response.status_code != 200:
+            # Gone (such as a deleted project): nothing left to keep warm
+            page.delete()
+            continue
+        # Rendering records the page afresh; a visitor may have beaten us to it
+        CachedPage.objects.filter(pk=page.pk, stale=True).update(stale=False)
+        rendered += 1
+    return rendered
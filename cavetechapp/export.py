@@ -0,0 +1,280 @@
+"""
+Export the public site as static files (see ``manage.py export_site``).
+
+Every page is rendered through the full middleware stack, once per
+language, and written under ``<output>/<language>/``:
+
+    /                               -> nb/index.html
+    /projects/                      -> nb/projects/index.html
+    /projects/?category=electronics -> nb/projects/index~category=electronics.html
+
+Pages are found by enumerating the public URLs (every member, project and
+category filter) and then following the internal links each page renders,
+which picks up pagination. Rendering runs in a process pool, one batch of
+pages per task, breadth first.
+
+An export manifest records each page's ETag. Re-exporting sends it back as
+If-None-Match, so pages whose rows have not changed are answered 304 by
+ConditionalGetMixin and left alone; only pages affected by a change are
+re-rendered, and pages that no longer exist are deleted.
+"""
+import html
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.urls import reverse
+
+MANIFEST_NAME = 'export-manifest.json'
+
+# Paths that are not part of the static site
+EXCLUDED_PREFIXES = ('/admin/', '/api/', '/search/', '/static/', '/media/')
+# Longer query strings would not make portable file names
+MAX_QUERY_LENGTH = 200
+
+HREF = re.compile(r'href="([^"#]*)')
+
+_client = None
+
+
+def seed_urls():
+    """Every public URL that can be enumerated from the database."""
+    from .models import Category, Person, Project
+
+    urls = [
+        reverse('cavetechapp:index'),
+        reverse('cavetechapp:about'),
+        reverse('cavetechapp:people_list'),
+        reverse('cavetechapp:projects_list'),
+    ]
+    projects_list = reverse('cavetechapp:projects_list')
+    urls += [f'{projects_list}?category={slug}' for slug in Category.objects.values_list('slug', flat=True)]
+    urls += [reverse('cavetechapp:person_detail', args=[pk]) for pk in Person.objects.values_list('pk', flat=True)]
+    urls += [reverse('cavetechapp:project_detail', args=[slug]) for slug in Project.objects.values_list('slug', flat=True)]
+    return urls
+
+
+def normalise_link(href, page_url):
+    """
+    Return href as a site-relative URL if it is an exportable page, else None.
+
+    Query-only links such as ``?page=2`` are resolved against page_url.
+    """
+    href = html.unescape(href)
+    if href.startswith('?'):
+        href = urlsplit(page_url).path + href
+    if not href.startswith('/') or href.startswith('//'):
+        return None
+    parts = urlsplit(href)
+    if parts.path.startswith(EXCLUDED_PREFIXES) or '..' in parts.path.split('/'):
+        return None
+    if '/' in parts.query or len(parts.query) > MAX_QUERY_LENGTH:
+        return None
+    return f'{parts.path}?{parts.query}' if parts.query else parts.path
+
+
+def page_links(content, page_url):
+    """The exportable links in a rendered page, in order of appearance."""
+    links = []
+    for href in HREF.findall(content):
+        link = normalise_link(href, page_url)
+        if link is not None and link not in links:
+            links.append(link)
+    return links
+
+
+def page_file(language, url):
+    """The file a page is written to, relative to the export root."""
+    parts = urlsplit(url)
+    directory = parts.path.strip('/')
+    name = f'index~{parts.query}.html' if parts.query else 'index.html'
+    return os.path.join(language, directory, name)
+
+
+def get_client():
+    """The per-process client pages are rendered with."""
+    global _client
+    if _client is None:
+        # The test client drives the full middleware stack (locale, caching,
+        # conditional GET) without a server
+        from django.test import Client
+        host = next((h for h in settings.ALLOWED_HOSTS if h not in ('*', '') and not h.startswith('.')), 'localhost')
+        _client = Client(HTTP_HOST=host)
+    return _client
+
+
+def render_page(output, language, url, etag=None):
+    """
+    Render url in language and write it below output unless it is unchanged.
+
+    Returns ``{'status', 'etag', 'links', 'file'}``; status is 304 when the
+    stored ETag still matches and nothing was written.
+    """
+    client = get_client()
+    client.cookies[settings.LANGUAGE_COOKIE_NAME] = language
+    headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+    response = client.get(url, **headers)
+    result = {'status': response.status_code, 'etag': response.headers.get('ETag'), 'links': None, 'file': None}
+    if response.status_code != 200:
+        return result
+
+    content = response.content.decode(response.charset or 'utf-8')
+    relative = page_file(language, url)
+    path = os.path.join(output, relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp, path)
+    result.update(links=page_links(content, url), file=relative)
+    return result
+
+
+def render_batch(output, tasks):
+    """Render a list of ``(language, url, etag)`` tasks; run in pool workers."""
+    return [(language, url, render_page(output, language, url, etag)) for language, url, etag in tasks]
+
+
+def _init_worker():
+    # Forked workers inherit settings; spawned ones need a fresh setup.
+    # Either way they must open their own database connections.
+    django.setup()
+    connections.close_all()
+
+
+def sync_tree(source, target):
+    """Copy files from source into target when their size or mtime differ."""
+    copied = 0
+    if not os.path.isdir(source):
+        return copied
+    for root, _, files in os.walk(source):
+        destination = os.path.join(target, os.path.relpath(root, source))
+        os.makedirs(destination, exist_ok=True)
+        for name in files:
+            src, dst = os.path.join(root, name), os.path.join(destination, name)
+            src_stat = os.stat(src)
+            try:
+                dst_stat = os.stat(dst)
+                if dst_stat.st_size == src_stat.st_size and int(dst_stat.st_mtime) == int(src_stat.st_mtime):
+                    continue
+            except FileNotFoundError:
+                pass
+            shutil.copy2(src, dst)
+            copied += 1
+    return copied
+
+
+def build_image_renditions():
+    """Make sure every uploaded image has its renditions before pages render."""
+    from .images import get_renditions
+    from .models import Person, Project, SiteSettings
+
+    for model in (Project, Person, SiteSettings):
+        for name in model.objects.exclude(image='').exclude(image=None).values_list('image', flat=True):
+            get_renditions(name)
+
+
+def load_manifest(output):
+    """Pages recorded by the previous export: ``{"<language> <url>": entry}``."""
+    try:
+        with open(os.path.join(output, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)['pages']
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(output, pages):
+    """Record the exported pages with their ETags, files and links."""
+    path = os.path.join(output, MANIFEST_NAME)
+    with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+        json.dump({'pages': pages}, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(f'{path}.tmp', path)
+
+
+class Exporter:
+    """Crawl and write the site for the given languages."""
+
+    def __init__(self, output, languages, workers=1, incremental=False, log=None):
+        self.output = str(output)
+        self.languages = languages
+        self.workers = workers
+        self.incremental = incremental
+        self.log = log or (lambda message: None)
+        self.stats = {'written': 0, 'unchanged': 0, 'removed': 0, 'skipped': 0}
+
+    def run(self):
+        previous = load_manifest(self.output) if self.incremental else {}
+        pages = {}
+        seen = set()
+        frontier = []
+        for language in self.languages:
+            for url in seed_urls():
+                if (language, url) not in seen:
+                    seen.add((language, url))
+                    frontier.append((language, url))
+
+        executor = None
+        if self.workers > 1:
+            # Children must not share the parent's database connections
+            connections.close_all()
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        try:
+            while frontier:
+                discovered = []
+                for language, url, result in self._render(executor, frontier, previous):
+                    key = f'{language} {url}'
+                    entry = previous.get(key)
+                    if result['status'] == 304 and entry:
+                        pages[key] = entry
+                        self.stats['unchanged'] += 1
+                    elif result['status'] == 200:
+                        pages[key] = {'etag': result['etag'], 'file': result['file'], 'links': result['links']}
+                        self.stats['written'] += 1
+                    else:
+                        self.stats['skipped'] += 1
+                        self.log(f"Skipped {url} ({language}): HTTP {result['status']}")
+                        continue
+                    for link in pages[key]['links']:
+                        if (language, link) not in seen:
+                            seen.add((language, link))
+                            discovered.append((language, link))
+                frontier = discovered
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        for key, entry in previous.items():
+            if key not in pages:
+                try:
+                    os.remove(os.path.join(self.output, entry['file']))
+                    self.stats['removed'] += 1
+                except FileNotFoundError:
+                    pass
+        save_manifest(self.output, pages)
+        return self.stats
+
+    def _tasks(self, frontier, previous):
+        tasks = []
+        for language, url in frontier:
+            entry = previous.get(f'{language} {url}')
+            # Only trust a 304 when the file from the last export is still there
+            etag = entry['etag'] if entry and os.path.exists(os.path.join(self.output, entry['file'])) else None
+            tasks.append((language, url, etag))
+        return tasks
+
+    def _render(self, executor, frontier, previous):
+        tasks = self._tasks(frontier, previous)
+        if executor is None:
+            return render_batch(self.output, tasks)
+        size = max(1, len(tasks) // (self.workers * 4))
+        batches = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+        results = []
+        for batch in executor.map(render_batch, [self.output] * len(batches), batches):
+            results.extend(batch)
+        return results
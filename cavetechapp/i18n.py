@@ -0,0 +1,154 @@
+"""
+Server-side translation catalogue.
+
+Every translated string the site shows is compiled into one flat mapping of
+dotted keys to strings per language:
+
+- ``static/i18n/<language>.json`` (UI strings such as ``nav.home``)
+- ``static/i18n/categories.json`` as ``categories.<slug>``
+- the SiteSettings translation fields as ``site.about_title``,
+  ``site.about_content`` and ``site.history``
+
+The catalogue is built once per process and rebuilt only when one of the
+JSON files' mtime or ``SiteSettings.updated_at`` changes. Those stamps are
+checked at most every ``I18N_RELOAD_INTERVAL`` seconds, so lookups are plain
+dict reads. Templates resolve keys for the active language (negotiated by
+Django's LocaleMiddleware from the ``language`` cookie or Accept-Language),
+so pages arrive already translated.
+"""
+import hashlib
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import translation
+
+I18N_DIR = settings.BASE_DIR / 'static' / 'i18n'
+CATEGORIES_FILE = I18N_DIR / 'categories.json'
+
+# SiteSettings fields compiled under ``site.<name>``
+SITE_FIELDS = ('about_title', 'about_content', 'history')
+
+_lock = threading.Lock()
+_compiled = None  # (stamp, version, {language: {dotted key: string}})
+_checked_at = 0.0
+
+
+def source_files():
+    """The JSON files the catalogue is compiled from."""
+    files = [I18N_DIR / f'{code}.json' for code, _ in settings.LANGUAGES]
+    files.append(CATEGORIES_FILE)
+    return files
+
+
+def _site_settings():
+    from .models import SiteSettings
+    try:
+        return SiteSettings.get_cached()
+    except DatabaseError:
+        # e.g. before the first migrate
+        return None
+
+
+def _flatten(tree, prefix, out):
+    for key, value in tree.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            _flatten(value, f'{name}.', out)
+        elif isinstance(value, str):
+            out[name] = value
+    return out
+
+
+def _read_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _current_stamp(site_settings):
+    mtimes = tuple(path.stat().st_mtime_ns for path in source_files())
+    return mtimes, site_settings.updated_at if site_settings is not None else None
+
+
+def compile_catalogues(site_settings=None):
+    """Build the flat catalogue of every supported language."""
+    categories = _read_json(CATEGORIES_FILE)
+    compiled = {}
+    for code, _ in settings.LANGUAGES:
+        flat = _flatten(_read_json(I18N_DIR / f'{code}.json'), '', {})
+        _flatten(categories.get(code, {}), 'categories.', flat)
+        if site_settings is not None:
+            for field in SITE_FIELDS:
+                translations = getattr(site_settings, f'{field}_translations') or {}
+                flat[f'site.{field}'] = (
+                    translations.get(code)
+                    or translations.get(settings.LANGUAGE_CODE)
+                    or getattr(site_settings, field)
+                )
+        compiled[code] = flat
+    return compiled
+
+
+def load_catalogues(force=False):
+    """
+    Return the compiled catalogues, rebuilding them if a source changed.
+
+    Sources are only re-checked once the reload interval has passed since
+    the previous check, unless force is true.
+    """
+    global _compiled, _checked_at
+    now = time.monotonic()
+    if (
+        not force
+        and _compiled is not None
+        and now - _checked_at < settings.I18N_RELOAD_INTERVAL
+    ):
+        return _compiled[2]
+
+    with _lock:
+        site_settings = _site_settings()
+        stamp = _current_stamp(site_settings)
+        if force or _compiled is None or _compiled[0] != stamp:
+            version = hashlib.md5(repr(stamp).encode()).hexdigest()
+            _compiled = (stamp, version, compile_catalogues(site_settings))
+        _checked_at = now
+        return _compiled[2]
+
+
+def catalogue_version():
+    """A short stamp that changes whenever the catalogue is rebuilt."""
+    load_catalogues()
+    return _compiled[1]
+
+
+def get_catalogue(language=None):
+    """Return the flat catalogue for language (default: the active one)."""
+    catalogues = load_catalogues()
+    language = language or translation.get_language()
+    return catalogues.get(language) or catalogues[settings.LANGUAGE_CODE]
+
+
+def section(prefix, language=None):
+    """Return the keys under prefix (without it), e.g. section('site')."""
+    prefix = f'{prefix}.'
+    return {
+        key[len(prefix):]: value
+        for key, value in get_catalogue(language).items()
+        if key.startswith(prefix)
+    }
+
+
+def translate(key, language=None, default=None):
+    """
+    Resolve a dotted key for language, falling back to the default language,
+    then to default and finally to the key itself so missing strings are
+    easy to spot.
+    """
+    value = get_catalogue(language).get(key)
+    if value is None:
+        value = get_catalogue(settings.LANGUAGE_CODE).get(key)
+    if value is None:
+        return key if default is None else default
+    return value
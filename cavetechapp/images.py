@@ -0,0 +1,127 @@
+"""
+Responsive image renditions for uploaded images.
+
+Uploaded images are resized with Pillow into a handful of widths in WebP and
+JPEG and stored under ``MEDIA_ROOT/renditions/`` next to a small JSON
+manifest. Building them is slow, so saving an image only queues a
+background job (see the post_save receiver in signals.py and tasks.py);
+until the worker has run, templates fall back to the original upload.
+Afterwards lookups only read the manifest, memoised in the cache.
+"""
+import json
+import logging
+import posixpath
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+RENDITION_DIR = 'renditions'
+RENDITION_WIDTHS = (320, 640, 960, 1280)
+RENDITION_FORMATS = (
+    # (extension, Pillow format, MIME type, save options)
+    ('webp', 'WEBP', 'image/webp', {'quality': 80, 'method': 6}),
+    ('jpg', 'JPEG', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+MANIFEST_CACHE_PREFIX = 'cavetechapp:renditions'
+
+
+def _stem(name):
+    return posixpath.join(RENDITION_DIR, posixpath.splitext(name)[0])
+
+
+def manifest_name(name):
+    """Storage path of the rendition manifest for the image stored at name."""
+    return f'{_stem(name)}.json'
+
+
+def rendition_name(name, width, extension):
+    """Storage path of one rendition of the image stored at name."""
+    return f'{_stem(name)}-{width}w.{extension}'
+
+
+def target_widths(source_width):
+    """Widths to generate for a source image, never upscaling."""
+    widths = [width for width in RENDITION_WIDTHS if width < source_width]
+    widths.append(min(source_width, RENDITION_WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def generate_renditions(name, storage=default_storage):
+    """
+    Create every rendition of the image stored at name and write its manifest.
+
+    Returns the manifest: ``{mime type: [[width, path], ...]}``.
+    """
+    with storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    manifest = {}
+    for width in target_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        for extension, pil_format, mime, options in RENDITION_FORMATS:
+            frame = resized.convert('RGB') if pil_format == 'JPEG' else resized
+            buffer = BytesIO()
+            frame.save(buffer, pil_format, **options)
+            path = rendition_name(name, width, extension)
+            if storage.exists(path):
+                storage.delete(path)
+            storage.save(path, ContentFile(buffer.getvalue()))
+            manifest.setdefault(mime, []).append([width, path])
+
+    path = manifest_name(name)
+    if storage.exists(path):
+        storage.delete(path)
+    storage.save(path, ContentFile(json.dumps(manifest).encode()))
+    cache.set(f'{MANIFEST_CACHE_PREFIX}:{name}', manifest, None)
+    return manifest
+
+
+def get_renditions(name, storage=default_storage, generate=True):
+    """
+    Return the rendition manifest for the image stored at name.
+
+    Generates missing renditions when generate is true. Returns None when
+    they are missing (and generate is false), or when the source cannot be
+    read or is not an image, so callers can fall back to the original file.
+    """
+    if not name:
+        return None
+    key = f'{MANIFEST_CACHE_PREFIX}:{name}'
+    manifest = cache.get(key)
+    if manifest is not None:
+        return manifest
+
+    path = manifest_name(name)
+    try:
+        if storage.exists(path):
+            with storage.open(path, 'rb') as f:
+                manifest = json.loads(f.read())
+            cache.set(key, manifest, None)
+            return manifest
+        if not generate:
+            return None
+        return generate_renditions(name, storage)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning("Could not build renditions for %s", name, exc_info=True)
+        return None
+
+
+def build_srcset(entries, storage=default_storage):
+    """Format manifest entries as a srcset attribute value."""
+    return ', '.join(f'{storage.url(path)} {width}w' for width, path in entries)
+
+
+def has_renditions(name, storage=default_storage):
+    """Whether renditions for the image stored at name have been built."""
+    return get_renditions(name, storage, generate=False) is not None
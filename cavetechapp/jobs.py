@@ -0,0 +1,130 @@
+"""
+A small database-backed job queue.
+
+Heavy post-save work (image renditions and the like) is recorded as a Job row
+inside the same transaction as the save and executed later by
+``python manage.py run_jobs``, so admin requests never wait on it. No broker
+is needed: workers claim rows with a conditional UPDATE, which is safe with
+several workers on both SQLite and PostgreSQL.
+
+Tasks are plain functions registered by name::
+
+    @task('images.build_renditions')
+    def build_renditions(name):
+        ...
+
+    enqueue('images.build_renditions', name='people/me.jpg')
+
+Each job runs in one transaction, unless its task is registered with
+``atomic=False``: long runs that write as they go commit each step instead,
+so they do not hold the database's write lock (on SQLite) throughout.
+"""
+import logging
+import traceback
+from collections import namedtuple
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# func: the handler; atomic: whether a job runs in a single transaction
+Task = namedtuple('Task', 'func atomic')
+
+_registry = {}
+
+
+def task(name, atomic=True):
+    """Register a function as the handler for jobs called name."""
+    def decorator(func):
+        _registry[name] = Task(func, atomic)
+        return func
+    return decorator
+
+
+def get_task(name):
+    """Return the Task registered under name."""
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f"No task registered as {name!r}") from None
+
+
+def enqueue(task_name, /, run_after=None, unique=False, **payload):
+    """
+    Queue a job for task_name with keyword arguments payload.
+
+    An identical job that is still pending is reused rather than duplicated.
+    With unique, so is one that is running or has failed: for jobs whose
+    outcome would not change by running them again, such as the renditions
+    of one upload (failed jobs are retried from the admin).
+    """
+    get_task(task_name)
+    statuses = [Job.PENDING, Job.RUNNING, Job.FAILED] if unique else [Job.PENDING]
+    existing = Job.objects.filter(task=task_name, payload=payload, status__in=statuses).first()
+    if existing is not None:
+        return existing
+    return Job.objects.create(task=task_name, payload=payload, run_after=run_after or timezone.now())
+
+
+def requeue_stale(timeout=None):
+    """Return jobs stuck in RUNNING (e.g. after a worker crash) to the queue."""
+    timeout = settings.JOB_TIMEOUT if timeout is None else timeout
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return Job.objects.filter(status=Job.RUNNING, updated_at__lt=cutoff).update(
+        status=Job.PENDING, updated_at=timezone.now()
+    )
+
+
+def claim_next():
+    """Atomically claim the next due job, or return None if there is none."""
+    now = timezone.now()
+    candidates = Job.objects.filter(status=Job.PENDING, run_after__lte=now)
+    for pk in candidates.values_list('pk', flat=True)[:10]:
+        claimed = Job.objects.filter(pk=pk, status=Job.PENDING).update(
+            status=Job.RUNNING, updated_at=now
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """Execute a claimed job and record the outcome, scheduling a retry on error."""
+    job.attempts += 1
+    try:
+        handler = get_task(job.task)
+        with transaction.atomic() if handler.atomic else nullcontext():
+            handler.func(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+            logger.error("Job %s failed permanently", job, exc_info=True)
+        else:
+            job.status = Job.PENDING
+            delay = settings.JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+            job.run_after = timezone.now() + timedelta(seconds=delay)
+            logger.warning("Job %s failed, retrying in %ss", job, delay, exc_info=True)
+    else:
+        job.status = Job.DONE
+        job.last_error = ''
+    job.save()
+    return job
+
+
+def run_pending(limit=None):
+    """Run due jobs until the queue is empty (or limit jobs ran). Returns the count."""
+    count = 0
+    while limit is None or count < limit:
+        job = claim_next()
+        if job is None:
+            break
+        run_job(job)
+        count += 1
+    return count
@@ -0,0 +1,49 @@
+"""
+Recompute the stored description and bio excerpts shown on cards.
+
+    python manage.py backfill_excerpts
+
+Excerpts are refreshed by save(); run this after changing EXCERPT_WORDS on
+Project or Person, or after bulk changes that bypass save(), such as
+QuerySet.update(). Rows whose excerpt changes get a new updated_at and
+their cached pages are purged, so cards and ETags follow.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from cavetechapp.dependencies import invalidate, row_token
+from cavetechapp.models import Person, Project, excerpt
+
+# (model, source field, excerpt field)
+EXCERPTS = [
+    (Project, 'description', 'description_excerpt'),
+    (Person, 'bio', 'bio_excerpt'),
+]
+
+
+class Command(BaseCommand):
+    help = "Recompute the card excerpts of every project and member."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Rows read and written per database round trip.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model, source, target in EXCERPTS:
+            now = timezone.now()
+            changed = []
+            rows = model.objects.only('pk', source, target).iterator(chunk_size=batch_size)
+            for row in rows:
+                value = excerpt(getattr(row, source), model.EXCERPT_WORDS)
+                if value != getattr(row, target):
+                    setattr(row, target, value)
+                    row.updated_at = now
+                    changed.append(row)
+            with transaction.atomic():
+                model.objects.bulk_update(changed, [target, 'updated_at'], batch_size=batch_size)
+                invalidate({row_token(model, row.pk) for row in changed})
+            self.stdout.write(f"Updated {len(changed)} {model._meta.verbose_name_plural.lower()}")
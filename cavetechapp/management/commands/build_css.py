@@ -0,0 +1,47 @@
+"""
+Compile the site stylesheet with the Tailwind CLI.
+
+    python manage.py build_css            # write static/css/site.css (minified)
+    python manage.py build_css --watch    # rebuild while editing templates
+
+Tailwind scans the templates (see tailwind.config.js) and emits only the
+utility classes they use, so pages load one small static file instead of
+compiling CSS in the browser. The standalone CLI is installed in the Docker
+image; elsewhere point TAILWIND_CLI at it (or at ``npx tailwindcss``).
+"""
+import shlex
+import shutil
+import subprocess
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+CONFIG = settings.BASE_DIR / 'tailwind.config.js'
+SOURCE = settings.BASE_DIR / 'tailwind' / 'site.css'
+OUTPUT = settings.BASE_DIR / 'static' / 'css' / 'site.css'
+
+
+class Command(BaseCommand):
+    help = "Compile static/css/site.css from the templates with the Tailwind CLI."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true', help="Rebuild when templates change.")
+
+    def handle(self, *args, **options):
+        cli = shlex.split(settings.TAILWIND_CLI)
+        if not cli or shutil.which(cli[0]) is None:
+            raise CommandError(
+                f"Tailwind CLI {settings.TAILWIND_CLI!r} not found; install the standalone "
+                "tailwindcss binary or set TAILWIND_CLI"
+            )
+
+        OUTPUT.parent.mkdir(parents=True, exist_ok=True)
+        command = cli + ['--config', str(CONFIG), '--input', str(SOURCE), '--output', str(OUTPUT)]
+        command.append('--watch' if options['watch'] else '--minify')
+        try:
+            subprocess.run(command, cwd=settings.BASE_DIR, check=True)
+        except subprocess.CalledProcessError as exc:
+            raise CommandError(f"Tailwind exited with status {exc.returncode}")
+
+        if not options['watch']:
+            self.stdout.write(f"Wrote {OUTPUT} ({OUTPUT.stat().st_size // 1024} KB)")
@@ -0,0 +1,75 @@
+"""
+Pre-render the public site to static files.
+
+    python manage.py export_site                  # full export to EXPORT_ROOT
+    python manage.py export_site --incremental    # rewrite only changed pages
+    python manage.py export_site /srv/site --languages en --workers 8
+
+Each language gets a complete page tree under ``<output>/<language>/``;
+collected static files (hashed and pre-compressed, see storage.py) and
+uploaded media with their image renditions are copied to
+``<output>/static/`` and ``<output>/media/``. See DESIGN.md for serving the
+tree with nginx.
+"""
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from cavetechapp.export import Exporter, build_image_renditions, sync_tree
+
+
+class Command(BaseCommand):
+    help = "Render every public page in every language to a static file tree."
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', nargs='?', default=settings.EXPORT_ROOT, help="Export directory.")
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help="Only rewrite pages whose ETag changed since the last export.",
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help="Processes rendering pages in parallel.",
+        )
+        parser.add_argument(
+            '--languages', default=','.join(code for code, _ in settings.LANGUAGES),
+            help="Comma-separated language codes to export.",
+        )
+        parser.add_argument('--no-assets', action='store_true', help="Skip collectstatic and copying files.")
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        known = {code for code, _ in settings.LANGUAGES}
+        languages = [code.strip() for code in options['languages'].split(',') if code.strip()]
+        unknown = [code for code in languages if code not in known]
+        if unknown or not languages:
+            raise CommandError(f"Unknown language(s) {', '.join(unknown)}; choose from {', '.join(sorted(known))}")
+
+        workers = max(1, options['workers'])
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            workers = 1  # other processes cannot see an in-memory database
+
+        output.mkdir(parents=True, exist_ok=True)
+        if not options['no_assets']:
+            if not isinstance(staticfiles_storage, ManifestFilesMixin):
+                self.stderr.write("Static files are not hashed (DEBUG=True?); pages will link unversioned assets.")
+            call_command('collectstatic', interactive=False, verbosity=0)
+            copied = sync_tree(settings.STATIC_ROOT, output / 'static')
+            build_image_renditions()
+            copied += sync_tree(settings.MEDIA_ROOT, output / 'media')
+            self.stdout.write(f"Copied {copied} asset file(s)")
+
+        exporter = Exporter(
+            output, languages, workers=workers, incremental=options['incremental'],
+            log=lambda message: self.stderr.write(message),
+        )
+        stats = exporter.run()
+        self.stdout.write(
+            f"Exported to {output}: {stats['written']} written, {stats['unchanged']} unchanged, "
+            f"{stats['removed']} removed, {stats['skipped']} skipped"
+        )
@@ -0,0 +1,22 @@
+"""
+Rebuild the full-text search index from scratch.
+
+    python manage.py rebuild_search_index
+
+Documents are kept up to date by signals; run this after editing
+static/i18n/categories.json (category names in every language are indexed)
+or after bulk changes that bypass save(), such as QuerySet.update().
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cavetechapp.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rewrite every search document for projects and members."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_index()
+        self.stdout.write(f"Indexed {count} documents")
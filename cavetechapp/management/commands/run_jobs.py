@@ -0,0 +1,59 @@
+"""
+Process queued background jobs.
+
+    python manage.py run_jobs           # run forever, polling for new jobs
+    python manage.py run_jobs --once    # drain the queue and exit
+
+Jobs purge cached pages, so the worker refuses to start unless the cache is
+shared with the web processes (CACHE_BACKEND, e.g. memcached).
+"""
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cavetechapp.cache import is_shared_cache
+from cavetechapp.dependencies import prune_pages
+from cavetechapp.jobs import requeue_stale, run_pending
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (image renditions and other post-save work)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Drain the queue once and exit.")
+        parser.add_argument(
+            '--sleep', type=float, default=settings.JOB_POLL_INTERVAL,
+            help="Seconds to wait when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        if not is_shared_cache():
+            raise CommandError(
+                "The job worker needs a cache shared with the web processes; set "
+                "CACHE_BACKEND and CACHE_LOCATION (e.g. memcached) instead of the "
+                "per-process memory cache."
+            )
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        next_prune = 0
+        while not self.stopping:
+            if time.monotonic() >= next_prune:
+                # Forget the dependencies of pages that expired from the cache
+                prune_pages()
+                next_prune = time.monotonic() + max(settings.PAGE_CACHE_TIMEOUT, 60)
+            requeue_stale()
+            count = run_pending()
+            if count:
+                self.stdout.write(f"Processed {count} job(s)")
+            if options['once']:
+                break
+            if not count:
+                time.sleep(options['sleep'])
+
+    def stop(self, signum, frame):
+        """Finish the current job, then exit."""
+        self.stopping = True
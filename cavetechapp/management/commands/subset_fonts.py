@@ -0,0 +1,119 @@
+"""
+Subset the self-hosted fonts to the glyphs the site uses and write WOFF2.
+
+    python manage.py subset_fonts           # rewrite static/fonts/*.subset.woff2
+    python manage.py subset_fonts --check   # fail if a subset is out of date
+
+Glyphs are collected from the visible text of every template and from the
+Norwegian and English translation files; Chinese pages fall back to system
+fonts, so zh-hans is left out. Run it again after adding characters to the
+templates or translations, then commit the result.
+"""
+import html
+import json
+import re
+import string
+from io import BytesIO
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template.utils import get_app_template_dirs
+
+FONT_DIR = settings.BASE_DIR / 'static' / 'fonts'
+I18N_DIR = settings.BASE_DIR / 'static' / 'i18n'
+
+# (source font, subset written next to it)
+FONTS = (
+    ('dream-avenue.ttf', 'dream-avenue.subset.woff2'),
+)
+SUBSET_LANGUAGES = ('nb', 'en')
+
+# Template syntax, scripts and styles are not rendered text
+NON_TEXT = re.compile(
+    r'{%.*?%}|{{.*?}}|{#.*?#}|<script\b.*?</script>|<style\b.*?</style>|<[^>]+>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def template_text():
+    """Return the visible text of every project and app template."""
+    dirs = [d for engine in settings.TEMPLATES for d in engine.get('DIRS', [])]
+    dirs += list(get_app_template_dirs('templates'))
+    text = []
+    for directory in dirs:
+        for path in sorted(directory.rglob('*.html')):
+            text.append(html.unescape(NON_TEXT.sub(' ', path.read_text(encoding='utf-8'))))
+    return ''.join(text)
+
+
+def translation_text():
+    """Return every nb/en string from the translation files."""
+    def strings(tree):
+        for value in tree.values():
+            if isinstance(value, dict):
+                yield from strings(value)
+            elif isinstance(value, str):
+                yield value
+
+    text = []
+    with open(I18N_DIR / 'categories.json', encoding='utf-8') as f:
+        categories = json.load(f)
+    for code in SUBSET_LANGUAGES:
+        with open(I18N_DIR / f'{code}.json', encoding='utf-8') as f:
+            text.extend(strings(json.load(f)))
+        text.extend(strings(categories.get(code, {})))
+    return ''.join(text)
+
+
+def used_codepoints():
+    """Code points to keep: printable ASCII plus all collected text."""
+    text = string.printable + template_text() + translation_text()
+    return {ord(char) for char in text if not char.isspace() or char == ' '}
+
+
+class Command(BaseCommand):
+    help = "Subset the self-hosted fonts to the glyphs used by the site and write WOFF2."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help="Exit with an error if a subset is missing or out of date, without writing.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from fontTools import subset
+            from fontTools.ttLib import TTFont
+        except ImportError:
+            raise CommandError("subset_fonts needs fontTools and Brotli: pip install fonttools brotli")
+
+        codepoints = used_codepoints()
+        stale = []
+        for source_name, target_name in FONTS:
+            source, target = FONT_DIR / source_name, FONT_DIR / target_name
+            expected = codepoints & set(TTFont(source).getBestCmap())
+
+            if options['check']:
+                if not target.exists() or set(TTFont(target).getBestCmap()) != expected:
+                    stale.append(target_name)
+                continue
+
+            font = TTFont(source)
+            subset_options = subset.Options()
+            subset_options.flavor = 'woff2'
+            subset_options.hinting = False  # browsers ignore TrueType hints at display sizes
+            subset_options.drop_tables += ['DSIG']
+            subsetter = subset.Subsetter(subset_options)
+            subsetter.populate(unicodes=expected)
+            subsetter.subset(font)
+            buffer = BytesIO()
+            font.flavor = 'woff2'
+            font.save(buffer)
+            target.write_bytes(buffer.getvalue())
+            self.stdout.write(
+                f"{target_name}: {len(expected)} glyphs, "
+                f"{source.stat().st_size // 1024} KB -> {target.stat().st_size // 1024} KB"
+            )
+
+        if stale:
+            raise CommandError(f"Out of date, run manage.py subset_fonts: {', '.join(stale)}")
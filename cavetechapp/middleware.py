@@ -0,0 +1,92 @@
+"""
+Middleware for the cavetechapp.
+"""
+import mimetypes
+import os
+import posixpath
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# Preferred first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticFilesMiddleware:
+    """
+    Serve collected files from STATIC_ROOT without a separate web server.
+
+    Files whose names are listed as hashed in the staticfiles manifest are
+    sent with a one-year ``immutable`` Cache-Control; anything else gets
+    STATIC_MAX_AGE and Last-Modified revalidation. Pre-compressed ``.br`` /
+    ``.gz`` variants written by collectstatic are picked according to
+    Accept-Encoding. Requests for files that were not collected fall through
+    to the rest of the stack (e.g. the DEBUG static view).
+    """
+
+    IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith('/') else f'/{settings.STATIC_URL}'
+        self.root = str(settings.STATIC_ROOT)
+        self._hashed_names = None
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            response = self.serve(request, request.path_info[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    @property
+    def hashed_names(self):
+        if self._hashed_names is None:
+            hashed_files = getattr(staticfiles_storage, 'hashed_files', None) or {}
+            self._hashed_names = set(hashed_files.values())
+        return self._hashed_names
+
+    def serve(self, request, name):
+        name = posixpath.normpath(unquote(name)).lstrip('/')
+        if not name or name.endswith(('.gz', '.br')):
+            return None
+        try:
+            path = safe_join(self.root, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        stat = os.stat(path)
+        if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+            return HttpResponseNotModified()
+
+        content_type, _ = mimetypes.guess_type(name)
+        accepted = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        encoding = None
+        for candidate, suffix in ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                encoding, path = candidate, path + suffix
+                break
+
+        response = FileResponse(
+            open(path, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+            filename=posixpath.basename(name),
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response.headers['Last-Modified'] = http_date(stat.st_mtime)
+        if name in self.hashed_names:
+            response.headers['Cache-Control'] = f'public, max-age={self.IMMUTABLE_MAX_AGE}, immutable'
+        else:
+            response.headers['Cache-Control'] = f'public, max-age={settings.STATIC_MAX_AGE}'
+        return response
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.8 on 2026-10-17 20:42
+
+import json
+
+from django.db import migrations, models
+
+
+def serialise_translations(apps, schema_editor):
+    """Fill translations_json for the existing SiteSettings row."""
+    SiteSettings = apps.get_model('cavetechapp', 'SiteSettings')
+    for settings in SiteSettings.objects.all():
+        site_translations = {
+            'about_content': settings.about_content_translations,
+            'history': settings.history_translations,
+            'about_title': settings.about_title_translations,
+        }
+        settings.translations_json = json.dumps(site_translations, ensure_ascii=False, separators=(',', ': '))
+        settings.save(update_fields=['translations_json'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cavetechapp', '0005_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sitesettings',
+            name='translations_json',
+            field=models.TextField(blank=True, editable=False, help_text='Translation fields serialised for the About page, refreshed on save'),
+        ),
+        migrations.RunPython(serialise_translations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.8 on 2026-10-17 20:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cavetechapp', '0006_sitesettings_translations_json'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['name', 'id'], name='cavetechapp_name_668aa8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at', 'id'], name='cavetechapp_created_1a7648_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['category', '-created_at', 'id'], name='cavetechapp_categor_2576c3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('featured', True)), fields=['-created_at'], name='project_featured_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['creator', '-created_at'], name='cavetechapp_creator_bb7ee7_idx'),
+        ),
+    ]
@@ -0,0 +1,127 @@
+# Generated by Django 4.2.8 on 2026-10-17 21:06
+
+import json
+
+from django.conf import settings
+from django.db import migrations, models
+from django.urls import reverse
+
+FTS_TABLE = 'cavetechapp_searchdocument_fts'
+
+SQLITE_FORWARDS = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, summary, keywords,
+        content='cavetechapp_searchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER cavetechapp_searchdocument_ai AFTER INSERT ON cavetechapp_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, summary, keywords)
+        VALUES (new.id, new.title, new.summary, new.keywords);
+    END""",
+    f"""CREATE TRIGGER cavetechapp_searchdocument_ad AFTER DELETE ON cavetechapp_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, summary, keywords)
+        VALUES ('delete', old.id, old.title, old.summary, old.keywords);
+    END""",
+    f"""CREATE TRIGGER cavetechapp_searchdocument_au AFTER UPDATE ON cavetechapp_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, summary, keywords)
+        VALUES ('delete', old.id, old.title, old.summary, old.keywords);
+        INSERT INTO {FTS_TABLE}(rowid, title, summary, keywords)
+        VALUES (new.id, new.title, new.summary, new.keywords);
+    END""",
+]
+SQLITE_BACKWARDS = [
+    'DROP TRIGGER IF EXISTS cavetechapp_searchdocument_au',
+    'DROP TRIGGER IF EXISTS cavetechapp_searchdocument_ad',
+    'DROP TRIGGER IF EXISTS cavetechapp_searchdocument_ai',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+POSTGRES_FORWARDS = [
+    """ALTER TABLE cavetechapp_searchdocument ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', title), 'A')
+            || setweight(to_tsvector('simple', summary), 'B')
+            || setweight(to_tsvector('simple', keywords), 'C')
+        ) STORED""",
+    'CREATE INDEX cavetechapp_searchdocument_vector_idx ON cavetechapp_searchdocument USING GIN (search_vector)',
+]
+POSTGRES_BACKWARDS = [
+    'DROP INDEX IF EXISTS cavetechapp_searchdocument_vector_idx',
+    'ALTER TABLE cavetechapp_searchdocument DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def _run(schema_editor, statements):
+    vendor = schema_editor.connection.vendor
+    for sql in statements.get(vendor, ()):
+        schema_editor.execute(sql, params=None)
+
+
+def create_text_index(apps, schema_editor):
+    """Create the database's full-text index over SearchDocument."""
+    _run(schema_editor, {'sqlite': SQLITE_FORWARDS, 'postgresql': POSTGRES_FORWARDS})
+
+
+def drop_text_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_BACKWARDS, 'postgresql': POSTGRES_BACKWARDS})
+
+
+def index_existing_rows(apps, schema_editor):
+    """Create documents for the projects and members that already exist."""
+    SearchDocument = apps.get_model('cavetechapp', 'SearchDocument')
+    Project = apps.get_model('cavetechapp', 'Project')
+    Person = apps.get_model('cavetechapp', 'Person')
+    with open(settings.BASE_DIR / 'static' / 'i18n' / 'categories.json', encoding='utf-8') as f:
+        categories = json.load(f)
+
+    documents = []
+    for project in Project.objects.select_related('category', 'creator'):
+        keywords = [project.category.name]
+        for names in categories.values():
+            name = names.get(project.category.slug)
+            if name and name not in keywords:
+                keywords.append(name)
+        if project.creator is not None:
+            keywords.append(project.creator.name)
+        documents.append(SearchDocument(
+            kind='project', object_id=project.pk,
+            url=reverse('cavetechapp:project_detail', args=[project.slug]),
+            title=project.title, summary=project.description, keywords=' '.join(keywords),
+        ))
+    for person in Person.objects.all():
+        documents.append(SearchDocument(
+            kind='person', object_id=person.pk,
+            url=reverse('cavetechapp:person_detail', args=[person.pk]),
+            title=person.name, summary=person.bio,
+            keywords=' '.join(filter(None, [person.title, person.email])),
+        ))
+    SearchDocument.objects.bulk_create(documents)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cavetechapp', '0007_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('project', 'Project'), ('person', 'Person')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('url', models.CharField(max_length=300)),
+                ('title', models.CharField(max_length=200)),
+                ('summary', models.TextField(blank=True, help_text='Description or bio, shown in results')),
+                ('keywords', models.TextField(blank=True, help_text='Category names in every language, creator, role')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document'),
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+        migrations.RunPython(index_existing_rows, migrations.RunPython.noop),
+    ]
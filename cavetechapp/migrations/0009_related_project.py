@@ -0,0 +1,42 @@
+# Generated by Django 4.2.8 on 2026-10-17 21:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def queue_refresh(apps, schema_editor):
+    """Ask the job worker to fill the table for the existing projects."""
+    Job = apps.get_model('cavetechapp', 'Job')
+    Project = apps.get_model('cavetechapp', 'Project')
+    if Project.objects.exists():
+        Job.objects.create(task='related.refresh', payload={}, run_after=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cavetechapp', '0008_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(help_text='0 is the most similar')),
+                ('score', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='cavetechapp.project')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_backlinks', to='cavetechapp.project')),
+            ],
+            options={
+                'ordering': ['project', 'rank'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedproject',
+            constraint=models.UniqueConstraint(fields=('project', 'rank'), name='unique_related_project_rank'),
+        ),
+        migrations.RunPython(queue_refresh, migrations.RunPython.noop),
+    ]
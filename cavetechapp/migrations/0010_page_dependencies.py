@@ -0,0 +1,56 @@
+# Generated by Django 4.2.8 on 2026-10-17 21:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cavetechapp', '0009_related_project'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachedPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(help_text='Path and query string', max_length=500)),
+                ('language', models.CharField(max_length=10)),
+                ('cache_key', models.CharField(max_length=100)),
+                ('stale', models.BooleanField(default=False, help_text='Purged and waiting to be rendered again')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PageDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(help_text='e.g. cavetechapp.project:12', max_length=100)),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dependencies', to='cavetechapp.cachedpage')),
+            ],
+            options={
+                'verbose_name_plural': 'Page dependencies',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='cachedpage',
+            index=models.Index(fields=['stale', 'id'], name='cavetechapp_stale_a55039_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cachedpage',
+            index=models.Index(fields=['updated_at'], name='cavetechapp_updated_063886_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='cachedpage',
+            constraint=models.UniqueConstraint(fields=('path', 'language'), name='unique_cached_page'),
+        ),
+        migrations.AddIndex(
+            model_name='pagedependency',
+            index=models.Index(fields=['token', 'page'], name='cavetechapp_token_d109de_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='pagedependency',
+            constraint=models.UniqueConstraint(fields=('page', 'token'), name='unique_page_dependency'),
+        ),
+    ]
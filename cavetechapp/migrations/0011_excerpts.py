@@ -0,0 +1,38 @@
+# Generated by Django 4.2.8 on 2026-10-17 21:29
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpts(apps, schema_editor):
+    """Compute the excerpts of existing rows (word counts as in models.py)."""
+    for model_name, source, target, words in [
+        ('Project', 'description', 'description_excerpt', 20),
+        ('Person', 'bio', 'bio_excerpt', 15),
+    ]:
+        model = apps.get_model('cavetechapp', model_name)
+        rows = list(model.objects.only('pk', source))
+        for row in rows:
+            setattr(row, target, Truncator(getattr(row, source)).words(words, truncate=' …'))
+        model.objects.bulk_update(rows, [target], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cavetechapp', '0010_page_dependencies'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='bio_excerpt',
+            field=models.TextField(blank=True, editable=False, help_text='Start of the bio shown on cards, refreshed on save'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='description_excerpt',
+            field=models.TextField(blank=True, editable=False, help_text='Start of the description shown on cards, refreshed on save'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,44 @@
 """
 Models for the Cave Tech Labs website.
 """
-from django.db import models
-from django.utils.text import slugify
+import json
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.text import Truncator, slugify
 from django.db.models import JSONField
 
 
+SITE_SETTINGS_CACHE_KEY = 'cavetechapp:site_settings'
+SITE_SETTINGS_VERSION_KEY = 'cavetechapp:site_settings:version'
+
+# Per-process copy of the singleton as (version, instance). Only trusted while
+# its version matches the stamp in the shared cache.
+_site_settings_memo = (None, None)
+
+
+def excerpt(text, words):
+    """The first words of text, exactly as the truncatewords filter renders them."""
+    return Truncator(text).words(words, truncate=' …')
+
+
+def refresh_excerpt(instance, source, target, words, save_kwargs):
+    """
+    Recompute instance's excerpt field target from source before a save.
+
+    Skipped when source was deferred (it cannot have changed); when saving
+    with update_fields, the excerpt is saved along with its source.
+    """
+    if source in instance.get_deferred_fields():
+        return
+    setattr(instance, target, excerpt(getattr(instance, source), words))
+    update_fields = save_kwargs.get('update_fields')
+    if update_fields is not None and source in update_fields:
+        save_kwargs['update_fields'] = {*update_fields, target}
+
+
 class SiteSettings(models.Model):
     """Model for storing site-wide settings like About Us, Contact Info, etc."""
     about_title = models.CharField(max_length=200, default="About The Cave Tech")
@@ -22,6 +55,7 @@ class SiteSettings(models.Model):
     instagram = models.URLField(blank=True, help_text="Instagram profile URL")
     phone = models.CharField(max_length=20, blank=True, help_text="Contact phone number")
     image = models.ImageField(upload_to='about/', blank=True, null=True, help_text="Hero image for About Us page")
+    translations_json = models.TextField(blank=True, editable=False, help_text="Translation fields serialised for the About page, refreshed on save")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -35,8 +69,22 @@ class SiteSettings(models.Model):
     def save(self, *args, **kwargs):
         """Ensure only one SiteSettings instance exists."""
         self.pk = 1
+        self.translations_json = self.build_translations_json()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'translations_json'}
         super().save(*args, **kwargs)
 
+    def build_translations_json(self):
+        """Serialise the translation fields for the About page's client-side script."""
+        site_translations = {
+            'about_content': self.about_content_translations,
+            'history': self.history_translations,
+            'about_title': self.about_title_translations,
+        }
+        # Without escaping unicode characters or newlines
+        return json.dumps(site_translations, ensure_ascii=False, separators=(',', ': '))
+
     def delete(self, *args, **kwargs):
         """Prevent deletion of SiteSettings."""
         pass
@@ -47,6 +95,52 @@ class SiteSettings(models.Model):
         obj, created = cls.objects.get_or_create(pk=1)
         return obj
 
+    @classmethod
+    def get_cached(cls):
+        """
+        Get the singleton without touching the database on the hot path.
+
+        Checks the in-process memo first, then the shared cache, and only
+        falls back to get_settings() when both are stale or empty.
+        """
+        global _site_settings_memo
+        version = cache.get(SITE_SETTINGS_VERSION_KEY)
+        memo_version, memo_obj = _site_settings_memo
+        if version is not None and memo_version == version:
+            return memo_obj
+
+        entry = cache.get(SITE_SETTINGS_CACHE_KEY)
+        if version is not None and entry is not None and entry[0] == version:
+            obj = entry[1]
+        else:
+            obj = cls.get_settings()
+            if version is None:
+                # add() so concurrent workers settle on a single stamp
+                cache.add(SITE_SETTINGS_VERSION_KEY, uuid4().hex, None)
+                version = cache.get(SITE_SETTINGS_VERSION_KEY)
+            cache.set(SITE_SETTINGS_CACHE_KEY, (version, obj), None)
+
+        _site_settings_memo = (version, obj)
+        return obj
+
+    @classmethod
+    def invalidate_cache(cls):
+        """
+        Bump the version stamp so every process reloads the singleton.
+
+        Deferred until the current transaction commits: bumping earlier would
+        let a concurrent request cache the old row under the new stamp, which
+        never expires.
+        """
+        transaction.on_commit(cls._bump_cache_version)
+
+    @staticmethod
+    def _bump_cache_version():
+        global _site_settings_memo
+        cache.set(SITE_SETTINGS_VERSION_KEY, uuid4().hex, None)
+        cache.delete(SITE_SETTINGS_CACHE_KEY)
+        _site_settings_memo = (None, None)
+
 
 class Category(models.Model):
     """Model representing a project category."""
@@ -75,24 +169,38 @@ class Person(models.Model):
     name = models.CharField(max_length=200)
     title = models.CharField(max_length=200, blank=True, help_text="e.g., Founder, Lead Instructor")
     bio = models.TextField(blank=True)
+    bio_excerpt = models.TextField(blank=True, editable=False, help_text="Start of the bio shown on cards, refreshed on save")
     email = models.EmailField(blank=True)
     image = models.ImageField(upload_to='people/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Words of the bio kept in bio_excerpt
+    EXCERPT_WORDS = 15
+
     class Meta:
         ordering = ['name']
         verbose_name_plural = 'People'
+        indexes = [
+            # PeopleListView pages by (name, pk)
+            models.Index(fields=['name', 'id']),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        """Refresh the bio excerpt."""
+        refresh_excerpt(self, 'bio', 'bio_excerpt', self.EXCERPT_WORDS, kwargs)
+        super().save(*args, **kwargs)
+
 
 class Project(models.Model):
     """Model representing a project created at or by members of Cave Tech Labs."""
     title = models.CharField(max_length=200)
     slug = models.SlugField(unique=True)
     description = models.TextField()
+    description_excerpt = models.TextField(blank=True, editable=False, help_text="Start of the description shown on cards, refreshed on save")
     category = models.ForeignKey(Category, on_delete=models.PROTECT, related_name='projects')
     creator = models.ForeignKey(Person, on_delete=models.SET_NULL, null=True, blank=True, related_name='projects')
     image = models.ImageField(upload_to='projects/', blank=True, null=True)
@@ -100,14 +208,165 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Words of the description kept in description_excerpt
+    EXCERPT_WORDS = 20
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # ProjectsListView pages by (-created_at, pk), optionally per category
+            models.Index(fields=['-created_at', 'id']),
+            models.Index(fields=['category', '-created_at', 'id']),
+            # IndexView's featured projects, newest first. Partial, because
+            # Django filters booleans as a bare "WHERE featured" term that a
+            # (featured, created_at) index cannot serve on SQLite.
+            models.Index(
+                fields=['-created_at'], condition=models.Q(featured=True),
+                name='project_featured_created_idx',
+            ),
+            # PersonDetailView's projects, newest first
+            models.Index(fields=['creator', '-created_at']),
+        ]
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        """Auto-generate slug if not provided."""
+        """Auto-generate slug if not provided and refresh the description excerpt."""
         if not self.slug:
             self.slug = slugify(self.title)
+        refresh_excerpt(self, 'description', 'description_excerpt', self.EXCERPT_WORDS, kwargs)
         super().save(*args, **kwargs)
+
+
+class RelatedProject(models.Model):
+    """
+    One of a project's precomputed nearest neighbours, best first.
+
+    The whole table is recomputed by the ``related.refresh`` job after
+    projects change; see cavetechapp/related.py.
+    """
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='related_backlinks')
+    rank = models.PositiveSmallIntegerField(help_text="0 is the most similar")
+    score = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['project', 'rank']
+        constraints = [
+            # ProjectDetailView reads a project's neighbours in rank order
+            models.UniqueConstraint(fields=['project', 'rank'], name='unique_related_project_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.project} -> {self.related} ({self.score:.2f})"
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of a Project or Person, kept in sync by signals.
+
+    The full-text index over these rows lives outside the ORM (an FTS5 table
+    on SQLite, a tsvector column on PostgreSQL); see cavetechapp/search.py.
+    """
+    PROJECT = 'project'
+    PERSON = 'person'
+    KIND_CHOICES = [
+        (PROJECT, 'Project'),
+        (PERSON, 'Person'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    url = models.CharField(max_length=300)
+    title = models.CharField(max_length=200)
+    summary = models.TextField(blank=True, help_text="Description or bio, shown in results")
+    keywords = models.TextField(blank=True, help_text="Category names in every language, creator, role")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
+
+
+class CachedPage(models.Model):
+    """
+    A page rendered into the page cache, per language.
+
+    Its dependencies record the rows it was rendered from so a change can
+    purge and re-render just this page; see cavetechapp/dependencies.py.
+    """
+    path = models.CharField(max_length=500, help_text="Path and query string")
+    language = models.CharField(max_length=10)
+    cache_key = models.CharField(max_length=100)
+    stale = models.BooleanField(default=False, help_text="Purged and waiting to be rendered again")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['path', 'language'], name='unique_cached_page'),
+        ]
+        indexes = [
+            # The pages.regenerate job picks up purged pages
+            models.Index(fields=['stale', 'id']),
+            # ...and forgets pages that have expired from the cache
+            models.Index(fields=['updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.path} ({self.language})"
+
+
+class PageDependency(models.Model):
+    """A row or list of rows a CachedPage shows, as a dependency token."""
+    page = models.ForeignKey(CachedPage, on_delete=models.CASCADE, related_name='dependencies')
+    token = models.CharField(max_length=100, help_text="e.g. cavetechapp.project:12")
+
+    class Meta:
+        verbose_name_plural = 'Page dependencies'
+        constraints = [
+            models.UniqueConstraint(fields=['page', 'token'], name='unique_page_dependency'),
+        ]
+        indexes = [
+            # Saving a row looks up the pages depending on it
+            models.Index(fields=['token', 'page']),
+        ]
+
+    def __str__(self):
+        return f"{self.page} <- {self.token}"
+
+
+class Job(models.Model):
+    """A unit of background work processed by the run_jobs management command."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    task = models.CharField(max_length=100, help_text="Registered task name, see cavetechapp/tasks.py")
+    payload = JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now, help_text="Not picked up before this time")
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_after', 'pk']
+        indexes = [models.Index(fields=['status', 'run_after'])]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.status})"
@@ -0,0 +1,201 @@
+"""
+Pagination helpers for the listing views.
+
+Two modes are supported side by side:
+
+- ``?page=N`` uses Django's Paginator, so visitors can jump to any page.
+- ``?after=<cursor>`` uses keyset pagination: the cursor encodes the ordering
+  values of the last row shown and the next page is fetched with a WHERE
+  clause on those values, so deep pages cost O(page size) instead of an
+  OFFSET scan.
+"""
+import base64
+import binascii
+import json
+
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.http import urlencode
+
+from .dependencies import uncacheable
+
+
+# Query parameters that select a page of a listing
+PAGINATION_PARAMS = ('page', 'after')
+
+
+class InvalidCursor(ValueError):
+    """Raised when an ``after`` cursor cannot be decoded."""
+
+
+def encode_cursor(values):
+    """Encode a list of ordering values as an opaque, URL-safe token."""
+    raw = json.dumps([str(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Decode a token produced by encode_cursor()."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor(token) from exc
+    if not isinstance(values, list):
+        raise InvalidCursor(token)
+    return values
+
+
+class KeysetPage:
+    """A page of results fetched with a keyset cursor."""
+
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by the values of its ordering fields.
+
+    ``ordering`` must identify rows uniquely, e.g. ``('-created_at', 'pk')``.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset.order_by(*ordering)
+        self.ordering = [
+            (field.lstrip('-'), field.startswith('-')) for field in ordering
+        ]
+        self.per_page = per_page
+
+    def _field(self, name):
+        opts = self.queryset.model._meta
+        return opts.pk if name == 'pk' else opts.get_field(name)
+
+    def cursor_for(self, obj):
+        """Return the cursor pointing just past obj."""
+        return encode_cursor([getattr(obj, name) for name, _ in self.ordering])
+
+    def cursor_values(self, cursor):
+        """Decode cursor into the values of the ordering fields."""
+        values = decode_cursor(cursor)
+        if len(values) != len(self.ordering):
+            raise InvalidCursor(cursor)
+        try:
+            return [
+                self._field(name).to_python(value)
+                for (name, _), value in zip(self.ordering, values)
+            ]
+        except Exception as exc:
+            raise InvalidCursor(cursor) from exc
+
+    def points_at_row(self, cursor):
+        """Whether cursor was made by cursor_for() from a row that exists."""
+        values = self.cursor_values(cursor)
+        return self.queryset.filter(
+            **{name: value for (name, _), value in zip(self.ordering, values)}
+        ).exists()
+
+    def filter_after(self, cursor):
+        """Return a Q selecting the rows that sort after cursor."""
+        values = self.cursor_values(cursor)
+        condition = Q()
+        for i, (name, descending) in enumerate(self.ordering):
+            step = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[i]})
+            for j in range(i):
+                step &= Q(**{self.ordering[j][0]: values[j]})
+            condition |= step
+        return condition
+
+    def page(self, cursor=None):
+        """Return the page following cursor (or the first page)."""
+        queryset = self.queryset
+        if cursor:
+            queryset = queryset.filter(self.filter_after(cursor))
+        rows = list(queryset[:self.per_page + 1])
+        next_cursor = None
+        if len(rows) > self.per_page:
+            rows = rows[:self.per_page]
+            next_cursor = self.cursor_for(rows[-1])
+        return KeysetPage(rows, next_cursor)
+
+
+def paginate(request, queryset, ordering, per_page):
+    """
+    Paginate queryset according to the request's ``page``/``after`` parameters.
+
+    Returns a context dict with ``page_obj`` (the rows to render), the query
+    strings for the previous/next links and whether cursor mode is active.
+    Other GET parameters (such as ``?category=``) are kept in the links.
+
+    Pass ``ordering=None`` for querysets that are already ordered by
+    something a cursor cannot encode (such as a search rank); they are
+    paginated by page number only.
+
+    Malformed or stale cursors and page numbers out of range fall back to
+    the nearest page, which is then kept out of the page cache.
+    """
+    params = {
+        key: value for key, value in request.GET.items()
+        if key not in PAGINATION_PARAMS and value
+    }
+    keyset = KeysetPaginator(queryset, ordering, per_page) if ordering else None
+    after = request.GET.get('after')
+
+    page_obj = None
+    if after and keyset is not None:
+        try:
+            if keyset.points_at_row(after):
+                page_obj = keyset.page(after)
+        except InvalidCursor:
+            pass
+    if after and page_obj is None:
+        uncacheable()
+
+    if page_obj is not None:
+        previous_query = urlencode(params)
+        page_range = []
+        cursor_mode = True
+    else:
+        paginator = Paginator(keyset.queryset if keyset else queryset, per_page)
+        number_page = paginator.get_page(request.GET.get('page'))
+        if 'page' in request.GET and request.GET['page'] != str(number_page.number):
+            uncacheable()
+        rows = list(number_page.object_list)
+        next_cursor = None
+        if keyset is not None and number_page.has_next():
+            next_cursor = keyset.cursor_for(rows[-1])
+        page_obj = KeysetPage(rows, next_cursor)
+        page_obj.number = number_page.number
+        page_obj.paginator = paginator
+        previous_query = (
+            urlencode({**params, 'page': number_page.previous_page_number()})
+            if number_page.has_previous() else None
+        )
+        page_range = list(paginator.get_elided_page_range(number_page.number))
+        cursor_mode = False
+
+    if page_obj.has_next():
+        next_query = urlencode({**params, 'after': page_obj.next_cursor})
+    elif not cursor_mode and number_page.has_next():
+        next_query = urlencode({**params, 'page': number_page.next_page_number()})
+    else:
+        next_query = None
+    return {
+        'page_obj': page_obj,
+        'is_paginated': bool(previous_query is not None or next_query or len(page_range) > 1),
+        'cursor_mode': cursor_mode,
+        'previous_query': previous_query,
+        'next_query': next_query,
+        'page_range': page_range,
+        'page_params': urlencode(params),
+    }
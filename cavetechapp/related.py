@@ -0,0 +1,159 @@
+"""
+Related-project recommendations, computed offline.
+
+Two projects are similar when they share a category or a creator and when
+their titles and descriptions use the same words. Every project's top
+NEIGHBOURS are stored in RelatedProject by the ``related.refresh`` job,
+which signals queue whenever a project is saved or deleted (see signals.py),
+so ProjectDetailView reads them with one indexed lookup.
+
+Text similarity is the Jaccard overlap of the projects' word sets. Words
+used by more than COMMON_WORD_SHARE of all projects carry no signal in any
+language and are ignored, which also keeps the candidate lists short:
+candidates come from an inverted index instead of comparing every pair.
+"""
+import heapq
+import re
+from collections import Counter, defaultdict
+from functools import partial
+
+from django.db import transaction
+from django.urls import reverse
+
+from .cache import forget_validators
+from .dependencies import invalidate, row_token
+from .models import Project, RelatedProject
+
+NEIGHBOURS = 3
+
+CATEGORY_WEIGHT = 1.0
+CREATOR_WEIGHT = 0.5
+TEXT_WEIGHT = 2.0
+
+COMMON_WORD_SHARE = 0.5
+WORD = re.compile(r'\w{3,}')
+
+
+def words(text):
+    """The set of lowercase words of at least three characters in text."""
+    return set(WORD.findall(text.lower()))
+
+
+def similarity(a, b, shared_words):
+    """Score how related project rows a and b are, given their shared word count."""
+    score = 0.0
+    if a['category_id'] == b['category_id']:
+        score += CATEGORY_WEIGHT
+    if a['creator_id'] is not None and a['creator_id'] == b['creator_id']:
+        score += CREATOR_WEIGHT
+    if shared_words:
+        union = len(a['words']) + len(b['words']) - shared_words
+        score += TEXT_WEIGHT * shared_words / union
+    return score
+
+
+def compute_neighbours(rows, count=NEIGHBOURS):
+    """
+    Return ``{pk: [(score, related pk), ...]}`` best first for project rows.
+
+    rows are dicts with pk, category_id, creator_id, created_at, title and
+    description. Ties go to the newer project.
+    """
+    projects = {row['pk']: {**row, 'words': words(f"{row['title']} {row['description']}")} for row in rows}
+    by_category = defaultdict(set)
+    by_creator = defaultdict(set)
+    postings = defaultdict(list)
+    for pk, project in projects.items():
+        by_category[project['category_id']].add(pk)
+        if project['creator_id'] is not None:
+            by_creator[project['creator_id']].add(pk)
+        for word in project['words']:
+            postings[word].append(pk)
+
+    common = max(2, int(len(projects) * COMMON_WORD_SHARE))
+    for project in projects.values():
+        project['words'] = {word for word in project['words'] if len(postings[word]) <= common}
+
+    neighbours = {}
+    for pk, project in projects.items():
+        shared = Counter()
+        for word in project['words']:
+            shared.update(postings[word])
+        candidates = set(shared) | by_category[project['category_id']]
+        if project['creator_id'] is not None:
+            candidates |= by_creator[project['creator_id']]
+        candidates.discard(pk)
+
+        scored = []
+        for other_pk in candidates:
+            other = projects[other_pk]
+            score = similarity(project, other, shared[other_pk])
+            if score > 0:
+                scored.append((score, other['created_at'], other_pk))
+        neighbours[pk] = [(score, other_pk) for score, _, other_pk in heapq.nlargest(count, scored)]
+    return neighbours
+
+
+def refresh_related():
+    """
+    Recompute every project's neighbours and store those that changed.
+
+    Only the rows of projects whose ranking changed are rewritten, so the
+    ETags of every other project page stay valid. Returns the number of
+    rows written.
+    """
+    rows = Project.objects.values('pk', 'category_id', 'creator_id', 'created_at', 'title', 'description')
+    neighbours = compute_neighbours(rows)
+    stored = defaultdict(list)
+    for pk, related_pk in RelatedProject.objects.order_by('project', 'rank').values_list('project', 'related'):
+        stored[pk].append(related_pk)
+    changed = {
+        pk for pk in set(stored) | set(neighbours)
+        if stored.get(pk, []) != [related_pk for _, related_pk in neighbours.get(pk, [])]
+    }
+    links = [
+        RelatedProject(project_id=pk, related_id=related_pk, rank=rank, score=score)
+        for pk in changed
+        for rank, (score, related_pk) in enumerate(neighbours.get(pk, []))
+    ]
+    with transaction.atomic():
+        RelatedProject.objects.filter(project__in=changed).delete()
+        RelatedProject.objects.bulk_create(links)
+    # Only the pages of projects whose neighbours changed are re-rendered
+    invalidate({row_token(Project, pk) for pk in changed})
+    slugs = Project.objects.filter(pk__in=changed).values_list('slug', flat=True)
+    transaction.on_commit(partial(forget_project_validators, list(slugs)))
+    return len(links)
+
+
+def forget_project_validators(slugs):
+    """Drop the cached ETag validators of the detail pages of slugs."""
+    from .views import ProjectDetailView  # views imports this module
+    for slug in slugs:
+        path = reverse('cavetechapp:project_detail', kwargs={'slug': slug})
+        forget_validators(path, ProjectDetailView.cache_models)
+
+
+def related_projects(slug, count=NEIGHBOURS):
+    """
+    The stored neighbours of the project with slug, best first.
+
+    Looked up by slug so it can run before (or alongside) fetching the
+    project itself.
+    """
+    return (
+        Project.objects.filter(related_backlinks__project__slug=slug)
+        .order_by('related_backlinks__rank')
+        .select_related('category', 'creator')
+        .defer('description', 'creator__bio')[:count]
+    )
+
+
+def fallback_related_projects(slug, count=NEIGHBOURS):
+    """Same-category projects, for projects the job has not reached yet."""
+    return (
+        Project.objects.filter(category__projects__slug=slug)
+        .exclude(slug=slug)
+        .select_related('category', 'creator')
+        .defer('description', 'creator__bio')[:count]
+    )
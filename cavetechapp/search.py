@@ -0,0 +1,156 @@
+"""
+Full-text search over projects and members.
+
+Each Project and Person has one SearchDocument row holding its title, its
+description or bio, and keywords (category names in every language, the
+creator's name, the member's role). Signals rewrite the row whenever its
+sources change (see signals.py). The text index itself is maintained by
+the database, created in migration 0008:
+
+- SQLite: the external-content FTS5 table ``cavetechapp_searchdocument_fts``,
+  updated by triggers on the document table and ranked with bm25().
+- PostgreSQL: the generated ``search_vector`` tsvector column with a GIN
+  index, ranked with ts_rank_cd().
+
+Both use language-neutral tokenising (no stemming) because the documents mix
+Norwegian, English and Chinese. Every search term is matched as a prefix and
+all terms must match.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+
+from .i18n import load_catalogues
+from .models import Person, Project, SearchDocument
+
+FTS_TABLE = 'cavetechapp_searchdocument_fts'
+# Relative importance of title, summary and keywords matches (SQLite bm25)
+FTS_WEIGHTS = (10.0, 4.0, 1.0)
+# Longer queries are cut off rather than building huge MATCH expressions
+MAX_TERMS = 8
+
+TERM = re.compile(r'\w+')
+
+
+def parse_terms(query):
+    """Split a visitor's query into lowercase word terms, dropping syntax."""
+    return TERM.findall(query.lower())[:MAX_TERMS]
+
+
+def category_names(category):
+    """The category's name plus its translation in every language."""
+    names = [category.name]
+    for catalogue in load_catalogues().values():
+        name = catalogue.get(f'categories.{category.slug}')
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def project_document(project):
+    """Field values of the SearchDocument for project."""
+    keywords = category_names(project.category)
+    if project.creator is not None:
+        keywords.append(project.creator.name)
+    return {
+        'url': reverse('cavetechapp:project_detail', args=[project.slug]),
+        'title': project.title,
+        'summary': project.description,
+        'keywords': ' '.join(keywords),
+    }
+
+
+def person_document(person):
+    """Field values of the SearchDocument for person."""
+    return {
+        'url': reverse('cavetechapp:person_detail', args=[person.pk]),
+        'title': person.name,
+        'summary': person.bio,
+        'keywords': ' '.join(filter(None, [person.title, person.email])),
+    }
+
+
+def index_project(project):
+    """Create or refresh the document for project."""
+    SearchDocument.objects.update_or_create(
+        kind=SearchDocument.PROJECT, object_id=project.pk, defaults=project_document(project)
+    )
+
+
+def index_person(person):
+    """Create or refresh the document for person."""
+    SearchDocument.objects.update_or_create(
+        kind=SearchDocument.PERSON, object_id=person.pk, defaults=person_document(person)
+    )
+
+
+def index_projects(projects):
+    """Reindex every project in the queryset projects."""
+    for project in projects.select_related('category', 'creator'):
+        index_project(project)
+
+
+def remove_document(kind, object_id):
+    """Drop the document of a deleted row."""
+    SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def rebuild_index():
+    """Rewrite every document from scratch; returns the number indexed."""
+    SearchDocument.objects.all().delete()
+    index_projects(Project.objects.all())
+    for person in Person.objects.all():
+        index_person(person)
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return SearchDocument.objects.count()
+
+
+def _postgres_query(terms):
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def _fts5_query(terms):
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def matching(query):
+    """SearchDocuments containing every term of query, unordered."""
+    terms = parse_terms(query)
+    if not terms:
+        return SearchDocument.objects.none()
+    if connection.vendor == 'postgresql':
+        matched = RawSQL(
+            "search_vector @@ to_tsquery('simple', %s)", [_postgres_query(terms)],
+            output_field=BooleanField(),
+        )
+        return SearchDocument.objects.alias(matched=matched).filter(matched=True)
+    rowids = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [_fts5_query(terms)])
+    return SearchDocument.objects.filter(id__in=rowids)
+
+
+def search(query):
+    """SearchDocuments matching query, best match first."""
+    terms = parse_terms(query)
+    documents = matching(query)
+    if not terms:
+        return documents
+    if connection.vendor == 'postgresql':
+        rank = RawSQL(
+            "ts_rank_cd(search_vector, to_tsquery('simple', %s))", [_postgres_query(terms)],
+            output_field=FloatField(),
+        )
+        return documents.annotate(rank=rank).order_by('-rank', 'pk')
+    # bm25() is lower for better matches
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+    rank = RawSQL(
+        f"SELECT bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %s AND rowid = {SearchDocument._meta.db_table}.id",
+        [_fts5_query(terms)],
+        output_field=FloatField(),
+    )
+    return documents.annotate(rank=rank).order_by('rank', 'pk')
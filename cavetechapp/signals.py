@@ -1,9 +1,33 @@
 """
 Signals for the cavetechapp.
 """
-from django.db.models.signals import post_migrate
+import re
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from .models import SiteSettings
+from . import dependencies, search
+from .cache import bump_model_version
+from .i18n import load_catalogues
+from .images import has_renditions
+from .jobs import enqueue
+from .models import Category, Person, Project, SearchDocument, SiteSettings
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply settings.SQLITE_PRAGMAS to each new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            value = str(value)
+            if not value:
+                continue
+            if not re.fullmatch(r'-?\w+', value):
+                raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+            cursor.execute(f'PRAGMA {name} = {value}')
 
 
 @receiver(post_migrate)
@@ -19,3 +43,109 @@ def create_site_settings(sender, **kwargs):
             'instagram': '',
             'phone': '',
         })
+
+
+@receiver(post_save, sender=SiteSettings)
+def invalidate_site_settings_cache(sender, **kwargs):
+    """Drop cached copies of SiteSettings and recompile its translated texts."""
+    SiteSettings.invalidate_cache()
+    load_catalogues(force=True)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Person)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Person)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=SearchDocument)
+@receiver(post_delete, sender=SearchDocument)
+def purge_page_cache(sender, **kwargs):
+    """Purge cached pages that render rows of the changed model."""
+    bump_model_version(sender)
+
+
+@receiver(post_init, sender=Project)
+@receiver(post_init, sender=Person)
+@receiver(post_init, sender=Category)
+def note_page_dependency(sender, instance, **kwargs):
+    """Note the rows loaded while a page is rendered into the page cache."""
+    dependencies.note_row(instance)
+
+
+@receiver(pre_save, sender=Project)
+def remember_foreign_keys(sender, instance, **kwargs):
+    """Note the project's category and creator before an edit may change them."""
+    instance._stored_foreign_keys = dependencies.stored_foreign_keys(instance)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Person)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Person)
+@receiver(post_delete, sender=Category)
+def purge_dependent_pages(sender, instance, **kwargs):
+    """Purge the cached pages showing the changed row and queue their re-rendering."""
+    dependencies.invalidate(
+        dependencies.change_tokens(instance, getattr(instance, '_stored_foreign_keys', None))
+    )
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Person)
+@receiver(post_save, sender=SiteSettings)
+def queue_image_renditions(sender, instance, **kwargs):
+    """Queue responsive renditions for newly uploaded images."""
+    if instance.image and not has_renditions(instance.image.name, instance.image.storage):
+        enqueue('images.build_renditions', unique=True, name=instance.image.name, model=sender._meta.label)
+
+
+@receiver(post_save, sender=Project)
+def index_project(sender, instance, raw=False, **kwargs):
+    """Refresh the project's search document."""
+    if not raw:
+        search.index_project(instance)
+
+
+@receiver(post_save, sender=Person)
+def index_person(sender, instance, raw=False, **kwargs):
+    """Refresh the member's document and those of their projects, which name them."""
+    if not raw:
+        search.index_person(instance)
+        search.index_projects(instance.projects.all())
+
+
+@receiver(post_save, sender=Category)
+def index_category_projects(sender, instance, raw=False, **kwargs):
+    """Refresh the documents of projects listing the category's names."""
+    if not raw:
+        search.index_projects(instance.projects.all())
+
+
+@receiver(post_delete, sender=Project)
+def remove_project_document(sender, instance, **kwargs):
+    """Drop a deleted project from search."""
+    search.remove_document(SearchDocument.PROJECT, instance.pk)
+
+
+@receiver(pre_delete, sender=Person)
+def remember_person_projects(sender, instance, **kwargs):
+    """Note the member's projects before their creator is cleared."""
+    instance._search_project_ids = list(instance.projects.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Person)
+def remove_person_document(sender, instance, **kwargs):
+    """Drop a deleted member from search and from their former projects' documents."""
+    search.remove_document(SearchDocument.PERSON, instance.pk)
+    search.index_projects(Project.objects.filter(pk__in=getattr(instance, '_search_project_ids', [])))
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def queue_related_refresh(sender, raw=False, **kwargs):
+    """Recompute related projects in the background; pending requests are merged."""
+    if not raw:
+        enqueue('related.refresh')
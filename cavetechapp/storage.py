@@ -0,0 +1,83 @@
+"""
+Static file storage with content-hashed names and pre-compressed variants.
+
+``collectstatic`` copies every file to STATIC_ROOT under a name containing a
+hash of its content (``fonts/dream-avenue.3f2a1b.ttf``), records the mapping
+in ``staticfiles.json`` for ``{% static %}``, and writes ``.gz`` (and
+``.br`` when the optional ``brotli`` package is installed) next to each
+compressible file. Hashed names never change content, so they can be cached
+forever; see StaticFilesMiddleware for serving them.
+"""
+import gzip
+import hashlib
+import logging
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.json', '.map', '.svg', '.txt', '.html', '.xml',
+    '.ttf', '.otf', '.eot', '.ico',
+}
+# Below this, compression overhead outweighs the saving
+MIN_COMPRESS_SIZE = 256
+
+
+def compress_file(path, memo=None):
+    """
+    Write path.gz (and path.br) if they are smaller than path.
+
+    memo, a dict shared between calls, reuses the output for files with
+    identical content (such as a file and its hashed copy). Returns the list
+    of variants written.
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    if len(content) < MIN_COMPRESS_SIZE:
+        return []
+
+    digest = hashlib.sha256(content).digest()
+    variants = memo.get(digest) if memo is not None else None
+    if variants is None:
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content)))
+        if memo is not None:
+            memo[digest] = variants
+
+    written = []
+    for suffix, compressed in variants:
+        if len(compressed) >= len(content):
+            continue
+        with open(path + suffix, 'wb') as f:
+            f.write(compressed)
+        written.append(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that also writes gzip/brotli variants."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        # Compress the final hashed files (and the originals, which stay
+        # reachable for anything that links them without {% static %}).
+        names = set(self.hashed_files.values()) | set(paths)
+        memo = {}
+        for name in sorted(names):
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            path = self.path(name)
+            if os.path.exists(path):
+                for variant in compress_file(path, memo):
+                    logger.debug("Compressed %s", variant)
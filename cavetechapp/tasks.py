@@ -0,0 +1,48 @@
+"""
+Background tasks executed by the job queue (see jobs.py).
+"""
+from django.apps import apps
+from django.utils import timezone
+
+from .cache import bump_model_version
+from .dependencies import TRACKED_MODELS, invalidate, regenerate_stale, row_token
+from .images import generate_renditions
+from .jobs import task
+from .related import refresh_related
+
+
+@task('images.build_renditions')
+def build_renditions(name, model=None):
+    """
+    Build the responsive renditions for the image stored at name.
+
+    model is the label of the model owning the image; its cached pages are
+    purged so they pick up the new srcset.
+    """
+    generate_renditions(name)
+    if model:
+        model = apps.get_model(model)
+        bump_model_version(model)
+        if model in TRACKED_MODELS:
+            owners = list(model.objects.filter(image=name).values_list('pk', flat=True))
+            # The owners' markup changed: move their ETags and cached cards on
+            model.objects.filter(pk__in=owners).update(updated_at=timezone.now())
+            invalidate({row_token(model, pk) for pk in owners})
+
+
+@task('related.refresh')
+def refresh_related_projects():
+    """Recompute the stored related projects after projects changed."""
+    refresh_related()
+
+
+@task('pages.regenerate', atomic=False)
+def regenerate_pages():
+    """
+    Render the cached pages purged by a change again, so they stay warm.
+
+    Each page is recorded in its own transaction: one spanning the whole run
+    would hold SQLite's write lock and hide changes made meanwhile from
+    record_page()'s change stamp check.
+    """
+    regenerate_stale()
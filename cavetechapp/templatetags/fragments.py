@@ -0,0 +1,38 @@
+"""
+Cache keys for template fragments rendering one row.
+
+Usage::
+
+    {% load cache fragments %}
+    {% cache fragment_cache_timeout project_card project|fragment_version words %}
+        ...
+    {% endcache %}
+"""
+from django import template
+from django.utils import translation
+
+from cavetechapp.cache import site_version
+from cavetechapp.i18n import catalogue_version
+
+register = template.Library()
+
+
+@register.filter
+def fragment_version(obj):
+    """
+    A stamp that changes whenever a fragment showing obj may change.
+
+    Combines the pk and updated_at of obj and of the related rows loaded
+    with it (select_related), the active language, the translation
+    catalogue version and the deployed code's version. Related rows that
+    were not loaded are not covered, so views must select_related whatever
+    the fragment shows.
+    """
+    rows = [obj]
+    for field in obj._meta.concrete_fields:
+        if field.many_to_one and field.is_cached(obj):
+            rows.append(field.get_cached_value(obj))
+    parts = [translation.get_language() or '', catalogue_version(), site_version()]
+    for row in rows:
+        parts.append(f'{row._meta.label_lower}:{row.pk}:{row.updated_at.isoformat()}' if row is not None else '')
+    return '|'.join(parts)
@@ -0,0 +1,55 @@
+"""
+Template tags for responsive images.
+
+Usage::
+
+    {% load responsive_images %}
+    {% responsive_image project.image alt=project.title sizes="(min-width: 768px) 33vw, 100vw" class="w-full h-full object-cover" %}
+"""
+from django import template
+from django.utils.html import format_html
+
+from cavetechapp.images import build_srcset, get_renditions
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image, alt='', sizes='100vw', **attrs):
+    """
+    Render a <picture> with WebP and JPEG srcsets for an ImageField value.
+
+    Falls back to a plain <img> of the original upload when the renditions
+    are not available yet; they are queued when the image is saved, never
+    from a page view. Extra keyword arguments (e.g. ``class``, ``loading``)
+    become attributes of the <img> element.
+    """
+    if not image:
+        return ''
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    extra = format_html(
+        ''.join(f' {key}="{{}}"' for key in attrs), *attrs.values()
+    )
+
+    manifest = get_renditions(image.name, image.storage, generate=False)
+    if not manifest or 'image/jpeg' not in manifest:
+        return format_html('<img src="{}" alt="{}"{}>', image.url, alt, extra)
+
+    fallback = manifest['image/jpeg']
+    webp = manifest.get('image/webp')
+    source = ''
+    if webp:
+        source = format_html(
+            '<source type="image/webp" srcset="{}" sizes="{}">',
+            build_srcset(webp, image.storage), sizes,
+        )
+    return format_html(
+        '<picture style="display: contents">{}<img src="{}" srcset="{}" sizes="{}" alt="{}"{}></picture>',
+        source,
+        image.storage.url(fallback[-1][1]),
+        build_srcset(fallback, image.storage),
+        sizes,
+        alt,
+        extra,
+    )
@@ -0,0 +1,26 @@
+"""
+Template tag for the compiled Tailwind stylesheet.
+
+Usage::
+
+    {% load site_css %}
+    {% tailwind_stylesheet %}
+"""
+from django import template
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+register = template.Library()
+
+STYLESHEET = 'css/site.css'
+# Used until `manage.py build_css` has produced the stylesheet
+CDN_SCRIPT = 'https://cdn.tailwindcss.com'
+
+
+@register.simple_tag
+def tailwind_stylesheet():
+    """Link the built stylesheet, or load the in-browser compiler if it is missing."""
+    if finders.find(STYLESHEET):
+        return format_html('<link rel="stylesheet" href="{}">', static(STYLESHEET))
+    return format_html('<script src="{}"></script>', CDN_SCRIPT)
@@ -0,0 +1,36 @@
+"""
+Template tags for the site's UI translations (see cavetechapp/i18n.py).
+
+Usage::
+
+    {% load site_i18n %}
+    <a href="/">{% t "nav.home" %}</a>
+    <h1>{% t_html "homepage.title" %}</h1>
+    <span>{{ project.category|category_name }}</span>
+"""
+from django import template
+from django.utils.safestring import mark_safe
+
+from cavetechapp.i18n import translate
+
+register = template.Library()
+
+
+@register.simple_tag
+def t(key):
+    """Translate key for the active language (HTML-escaped)."""
+    return translate(key)
+
+
+@register.simple_tag
+def t_html(key):
+    """Translate key for the active language, allowing markup such as <br>."""
+    return mark_safe(translate(key))
+
+
+@register.filter
+def category_name(category):
+    """Translated name of a Category, falling back to its stored name."""
+    if not category:
+        return ''
+    return translate(f'categories.{category.slug}', default=category.name)
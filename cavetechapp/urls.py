@@ -1,19 +1,24 @@
 """
 URL routing for cavetechapp.
 """
+from django.conf import settings
 from django.urls import path
-from .views import (
-    IndexView, AboutView, PeopleListView, PersonDetailView,
-    ProjectsListView, ProjectDetailView
-)
+from . import api, async_views, views as sync_views
+
+# Async views need an ASGI server (see gunicorn.conf.py)
+views = async_views if settings.ASYNC_VIEWS else sync_views
 
 app_name = 'cavetechapp'
 
 urlpatterns = [
-    path('', IndexView.as_view(), name='index'),
-    path('about/', AboutView.as_view(), name='about'),
-    path('people/', PeopleListView.as_view(), name='people_list'),
-    path('people/<int:pk>/', PersonDetailView.as_view(), name='person_detail'),
-    path('projects/', ProjectsListView.as_view(), name='projects_list'),
-    path('projects/<slug:slug>/', ProjectDetailView.as_view(), name='project_detail'),
+    path('', views.IndexView.as_view(), name='index'),
+    path('about/', views.AboutView.as_view(), name='about'),
+    path('people/', views.PeopleListView.as_view(), name='people_list'),
+    path('people/<int:pk>/', views.PersonDetailView.as_view(), name='person_detail'),
+    path('projects/', views.ProjectsListView.as_view(), name='projects_list'),
+    path('projects/<slug:slug>/', views.ProjectDetailView.as_view(), name='project_detail'),
+    path('search/', views.SearchView.as_view(), name='search'),
+    path('api/projects/', api.ProjectsAPIView.as_view(), name='api_projects'),
+    path('api/people/', api.PeopleAPIView.as_view(), name='api_people'),
+    path('api/categories/', api.CategoriesAPIView.as_view(), name='api_categories'),
 ]
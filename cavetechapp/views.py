@@ -1,19 +1,44 @@
 """
 Views for the Cave Tech Labs website.
 """
-import json
 from django.shortcuts import render, get_object_or_404
 from django.views import View
 from django.utils.html import mark_safe
-from .models import Person, Project, Category, SiteSettings
+from .cache import ConditionalGetMixin, PageCacheMixin, latest_change
+from .dependencies import track_listing, uncacheable
+from .i18n import translate
+from .models import Person, Project, Category, RelatedProject, SearchDocument, SiteSettings
+from .pagination import PAGINATION_PARAMS, paginate
+from .related import fallback_related_projects, related_projects
+from .search import matching, search
 
 
-class IndexView(View):
+def site_settings_change():
+    """Validator pair for the SiteSettings row rendered by base.html."""
+    return SiteSettings.get_cached().updated_at, 1
+
+
+class IndexView(ConditionalGetMixin, PageCacheMixin, View):
     """Home page view."""
 
+    cache_models = (Project, Person, Category, SiteSettings)
+
+    def get_validators(self, request):
+        return [
+            latest_change(Project.objects.filter(featured=True), 'category__updated_at', 'creator__updated_at'),
+            latest_change(Person.objects.all()),
+            site_settings_change(),
+        ]
+
     def get(self, request):
-        featured_projects = Project.objects.filter(featured=True)[:6]
-        people = Person.objects.all()
+        # Cards show the stored excerpts; the long text columns stay unread
+        featured_projects = (
+            Project.objects.filter(featured=True).select_related('category', 'creator')
+            .defer('description', 'creator__bio')[:6]
+        )
+        people = Person.objects.defer('bio')
+        track_listing(Project)
+        track_listing(Person)
         context = {
             'featured_projects': featured_projects,
             'people': people,
@@ -21,78 +46,163 @@ class IndexView(View):
         return render(request, 'cavetechapp/index.html', context)
 
 
-class AboutView(View):
+class AboutView(ConditionalGetMixin, PageCacheMixin, View):
     """About Us page view."""
 
+    cache_models = (SiteSettings,)
+
+    def get_validators(self, request):
+        return [site_settings_change()]
+
     def get(self, request):
-        settings = SiteSettings.get_settings()
-        # Build translations JSON for the template
-        site_translations = {
-            'about_content': settings.about_content_translations,
-            'history': settings.history_translations,
-            'about_title': settings.about_title_translations,
-        }
-        
-        # Get Norwegian versions for data-default (since Norwegian is the default language)
-        default_about_content = settings.about_content_translations.get('nb', settings.about_content)
-        default_history = settings.history_translations.get('nb', settings.history)
-        
-        # Create JSON without escaping unicode characters or newlines
-        json_str = json.dumps(site_translations, ensure_ascii=False, separators=(',', ': '))
-        
+        settings = SiteSettings.get_cached()
+        # Texts for the active language, with fallbacks resolved by the catalogue;
+        # the translations JSON is serialised when SiteSettings is saved
         context = {
             'settings': settings,
-            'site_translations_json': mark_safe(json_str),
-            'default_about_content': default_about_content,
-            'default_history': default_history,
+            'site_translations_json': mark_safe(settings.translations_json),
+            'default_about_content': translate('site.about_content'),
+            'default_history': translate('site.history'),
         }
         return render(request, 'cavetechapp/about.html', context)
 
 
-class PeopleListView(View):
-    """View listing all members."""
+class PeopleListView(ConditionalGetMixin, PageCacheMixin, View):
+    """View listing all members, paginated by name."""
+
+    cache_models = (Person, SiteSettings)
+    tracked_params = PAGINATION_PARAMS
+
+    paginate_by = 12
+    ordering = ('name', 'pk')
+
+    def get_validators(self, request):
+        return [latest_change(Person.objects.all()), site_settings_change()]
 
     def get(self, request):
-        people = Person.objects.all()
-        context = {'people': people}
+        context = paginate(request, Person.objects.defer('bio'), self.ordering, self.paginate_by)
+        context['people'] = context['page_obj'].object_list
+        track_listing(Person)
         return render(request, 'cavetechapp/people_list.html', context)
 
 
-class PersonDetailView(View):
+class PersonDetailView(ConditionalGetMixin, PageCacheMixin, View):
     """View for individual person profile."""
 
+    cache_models = (Person, Project, Category, SiteSettings)
+
+    def get_validators(self, request, pk):
+        person = latest_change(Person.objects.filter(pk=pk))
+        if not person[1]:
+            return None
+        return [
+            person,
+            latest_change(Project.objects.filter(creator_id=pk), 'category__updated_at'),
+            site_settings_change(),
+        ]
+
     def get(self, request, pk):
         person = get_object_or_404(Person, pk=pk)
-        projects = person.projects.all()
+        projects = person.projects.select_related('category').defer('description')
+        track_listing(Project, creator=person.pk)
         context = {'person': person, 'projects': projects}
         return render(request, 'cavetechapp/person_detail.html', context)
 
 
-class ProjectsListView(View):
-    """View listing all projects with filtering."""
+class ProjectsListView(ConditionalGetMixin, PageCacheMixin, View):
+    """View listing all projects with filtering, newest first."""
 
-    def get(self, request):
+    cache_models = (Project, Person, Category, SiteSettings)
+    tracked_params = ('category', *PAGINATION_PARAMS)
+
+    paginate_by = 12
+    ordering = ('-created_at', 'pk')
+
+    def get_validators(self, request):
         projects = Project.objects.all()
         category_slug = request.GET.get('category')
         if category_slug:
             projects = projects.filter(category__slug=category_slug)
-        categories = Category.objects.all()
-        context = {
-            'projects': projects,
+        return [
+            latest_change(projects, 'category__updated_at', 'creator__updated_at'),
+            latest_change(Category.objects.all()),
+            site_settings_change(),
+        ]
+
+    def get(self, request):
+        projects = Project.objects.select_related('category', 'creator').defer('description', 'creator__bio')
+        category_slug = request.GET.get('category')
+        if category_slug:
+            projects = projects.filter(category__slug=category_slug)
+        categories = list(Category.objects.all())
+        if category_slug and category_slug not in {category.slug for category in categories}:
+            uncacheable()
+        track_listing(Project)
+        track_listing(Category)
+        context = paginate(request, projects, self.ordering, self.paginate_by)
+        context.update({
+            'projects': context['page_obj'].object_list,
             'categories': categories,
             'selected_category': category_slug,
-        }
+        })
         return render(request, 'cavetechapp/projects_list.html', context)
 
 
-class ProjectDetailView(View):
+class ProjectDetailView(ConditionalGetMixin, PageCacheMixin, View):
     """View for individual project details."""
 
+    cache_models = (Project, Person, Category, RelatedProject, SiteSettings)
+
+    def get_validators(self, request, slug):
+        project = latest_change(
+            Project.objects.filter(slug=slug), 'category__updated_at', 'creator__updated_at'
+        )
+        if not project[1]:
+            return None
+        stored = latest_change(
+            RelatedProject.objects.filter(project__slug=slug),
+            'related__updated_at', 'related__category__updated_at', 'related__creator__updated_at',
+        )
+        if stored[1]:
+            return [project, stored, site_settings_change()]
+        fallback = latest_change(
+            Project.objects.filter(category__projects__slug=slug).exclude(slug=slug),
+            'creator__updated_at',
+        )
+        return [project, fallback, site_settings_change()]
+
     def get(self, request, slug):
-        project = get_object_or_404(Project, slug=slug)
-        related_projects = Project.objects.filter(category=project.category).exclude(pk=project.pk)[:3]
+        project = get_object_or_404(Project.objects.select_related('category', 'creator'), slug=slug)
+        # Precomputed by the related.refresh job; new projects fall back to
+        # their category until it has run
+        related = list(related_projects(slug))
+        if not related:
+            related = fallback_related_projects(slug)
+            track_listing(Project, category=project.category_id)
         context = {
             'project': project,
-            'related_projects': related_projects,
+            'related_projects': related,
         }
         return render(request, 'cavetechapp/project_detail.html', context)
+
+
+class SearchView(ConditionalGetMixin, PageCacheMixin, View):
+    """Full-text search across projects and members, best match first."""
+
+    cache_models = (SearchDocument, SiteSettings)
+
+    paginate_by = 12
+
+    def get_validators(self, request):
+        query = request.GET.get('q', '').strip()
+        return [latest_change(matching(query)), site_settings_change()]
+
+    def get(self, request):
+        query = request.GET.get('q', '').strip()
+        # Ranked results are paged by number; a rank cannot be a keyset cursor
+        context = paginate(request, search(query), None, self.paginate_by)
+        context.update({
+            'query': query,
+            'results': context['page_obj'].object_list,
+        })
+        return render(request, 'cavetechapp/search.html', context)
@@ -30,6 +30,18 @@ else:
     print(f"✓ Admin user '{username}' already exists")
 END
 
-# Start the application with debugpy
+# Start the application: SERVER_MODE=production runs Gunicorn (see
+# gunicorn.conf.py), anything else the dev server under debugpy
+if [ "${SERVER_MODE:-development}" = "production" ]; then
+    echo "🎨 Building stylesheet..."
+    python manage.py build_css
+
+    echo "🗜️  Collecting static files..."
+    python manage.py collectstatic --noinput
+
+    echo "🏭 Starting Gunicorn..."
+    exec gunicorn --config gunicorn.conf.py
+fi
+
 echo "🔧 Starting with debugpy debugger..."
 exec python -m debugpy --listen 0.0.0.0:5678 manage.py runserver 0.0.0.0:8000
@@ -0,0 +1,96 @@
+"""
+Gunicorn settings for the production serving mode (see entrypoint.sh).
+
+Every value can be overridden from the environment so the same image can be
+sized per host without rebuilding.
+"""
+import math
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+if os.getenv('ASYNC_VIEWS', 'False') == 'True':
+    # Async views: one event loop per worker holds many slow clients
+    wsgi_app = 'cavetechlabs.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    # Threaded workers: pages are mostly cached, and the remaining time is
+    # spent waiting on the database or cache rather than on the CPU.
+    wsgi_app = 'cavetechlabs.wsgi:application'
+    worker_class = 'gthread'
+
+
+def available_cpus():
+    """
+    The CPUs this container may use.
+
+    os.cpu_count() reports the host's CPUs; the CPU affinity mask and the
+    cgroup CPU quota (docker run --cpus) are what the container gets.
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    quota_files = [
+        ('/sys/fs/cgroup/cpu.max', None),  # cgroup v2: "<quota> <period>" or "max <period>"
+        ('/sys/fs/cgroup/cpu/cpu.cfs_quota_us', '/sys/fs/cgroup/cpu/cpu.cfs_period_us'),  # cgroup v1
+    ]
+    for quota_file, period_file in quota_files:
+        try:
+            with open(quota_file) as f:
+                values = f.read().split()
+            if period_file:
+                with open(period_file) as f:
+                    values.append(f.read().strip())
+            quota, period = values
+        except (OSError, ValueError):
+            continue
+        if quota not in ('max', '-1'):
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+        break
+    return cpus
+
+
+workers = int(os.getenv('WEB_CONCURRENCY', available_cpus() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))  # gthread only
+
+# Import Django once in the master and fork it into the workers, so they
+# start fast and share the memory for the loaded code.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+# Reuse connections from the reverse proxy between requests
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Kill workers stuck on a single request, but let in-flight requests finish
+# on restarts (SIGHUP reloads workers one by one, SIGTERM stops gracefully).
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+
+# Recycle workers periodically to bound memory growth; the jitter keeps them
+# from all restarting at the same moment.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+# Log to stdout/stderr for docker logs
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+# Trust X-Forwarded-* from the reverse proxy in front of the container
+forwarded_allow_ips = os.getenv('FORWARDED_ALLOW_IPS', '127.0.0.1')
+
+
+def on_starting(server):
+    """
+    Refuse to start on the per-process memory cache.
+
+    Cached pages, version stamps and SiteSettings are invalidated through the
+    cache: with one copy per worker (and one in the job worker), an edit
+    would only reach the process that made it.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cavetechlabs.settings')
+    import django
+    django.setup()
+    from cavetechapp.cache import is_shared_cache
+    if not is_shared_cache():
+        raise SystemExit(
+            "Production mode needs a cache shared by every process: set CACHE_BACKEND "
+            "and CACHE_LOCATION (e.g. PyMemcacheCache at memcached:11211)."
+        )
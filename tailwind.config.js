@@ -0,0 +1,11 @@
+/** Tailwind build for the site stylesheet, see `python manage.py build_css`. */
+module.exports = {
+  content: [
+    './templates/**/*.html',
+    './cavetechapp/templatetags/**/*.py',
+  ],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};
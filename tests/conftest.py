@@ -12,6 +12,77 @@ if not settings.configured:
     django.setup()
 
 
+def pytest_report_header(config):
+    """Show which database backend the suite runs against (set DATABASE_URL to switch)"""
+    database = settings.DATABASES['default']
+    return f"database: {database['ENGINE'].rsplit('.', 1)[-1]} {database.get('HOST') or ''}".rstrip()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Fixture: Start every test with an empty cache"""
+    from django.core.cache import cache
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def commit_hooks(monkeypatch):
+    """
+    Fixture: Run on_commit callbacks when the code under test commits
+
+    Tests run inside a transaction that is rolled back, so Django would never
+    run them. Treat leaving the last atomic block the test did not open as
+    the commit, as it is outside tests.
+    """
+    from django.db import transaction
+    from django.db.backends.base.base import BaseDatabaseWrapper
+
+    def test_transaction_only(connection):
+        return all(block._from_testcase for block in connection.atomic_blocks)
+
+    on_commit = BaseDatabaseWrapper.on_commit
+    atomic_exit = transaction.Atomic.__exit__
+
+    def run_or_defer(self, func, robust=False):
+        if self.in_atomic_block and test_transaction_only(self):
+            func()
+        else:
+            on_commit(self, func, robust)
+
+    def exit_and_commit(self, exc_type, exc_value, traceback):
+        result = atomic_exit(self, exc_type, exc_value, traceback)
+        connection = transaction.get_connection(self.using)
+        if connection.in_atomic_block and test_transaction_only(connection):
+            callbacks, connection.run_on_commit = connection.run_on_commit, []
+            for _, func, _ in callbacks:
+                func()
+        return result
+
+    monkeypatch.setattr(BaseDatabaseWrapper, 'on_commit', run_or_defer)
+    monkeypatch.setattr(transaction.Atomic, '__exit__', exit_and_commit)
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """Fixture: Use a cache shared between processes, as the job worker requires"""
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        }
+    }
+
+
+@pytest.fixture
+def sample_category(db):
+    """Fixture: Get the electronics category (seeded by migration 0002)"""
+    from cavetechapp.models import Category
+    category, _ = Category.objects.get_or_create(slug="electronics", defaults={'name': "Electronics"})
+    return category
+
+
 @pytest.fixture
 def sample_person(db):
     """Fixture: Create a sample person"""
@@ -0,0 +1,177 @@
+"""
+JSON API tests for The Cave Tech Labs application
+"""
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from cavetechapp.api import ProjectsAPIView
+from cavetechapp.models import Category, Person, Project
+
+
+@pytest.fixture
+def catalogue(db, settings, sample_category, sample_person):
+    """Fixture: Five projects, the newest first in the API, with the page cache off"""
+    settings.PAGE_CACHE_TIMEOUT = 0
+    other = Category.objects.create(name="Woodworking Test", slug="woodworking-test")
+    return [
+        Project.objects.create(
+            title=f"Project {i}", description="Test",
+            category=sample_category if i % 2 == 0 else other,
+            creator=sample_person if i == 0 else None,
+        )
+        for i in range(5)
+    ][::-1]
+
+
+def ndjson(response):
+    """Decode a streamed NDJSON response"""
+    return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+
+class TestApiPages:
+    """Test the paginated JSON listings"""
+
+    def test_projects_default_fields(self, client, catalogue, sample_person):
+        """Test that every field is returned by default"""
+        response = client.get('/api/projects/')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/json'
+        oldest = response.json()['results'][-1]
+        assert oldest['slug'] == catalogue[-1].slug
+        assert oldest['category'] == 'electronics'
+        assert oldest['creator'] == sample_person.pk
+        assert oldest['url'] == f'/projects/{catalogue[-1].slug}/'
+        assert oldest['image'] is None
+        assert 'created_at' in oldest
+
+    def test_sparse_fieldset(self, client, catalogue):
+        """Test that ?fields= returns only the named fields, in order"""
+        results = client.get('/api/projects/', {'fields': 'title,slug'}).json()['results']
+        assert list(results[0]) == ['title', 'slug']
+
+    def test_sparse_fieldset_loads_only_needed_columns(self, client, catalogue):
+        """Test that unselected columns are not read from the database"""
+        with CaptureQueriesContext(connection) as ctx:
+            client.get('/api/projects/', {'fields': 'slug'})
+        select = next(q['sql'] for q in ctx.captured_queries if 'LIMIT' in q['sql'])
+        assert '"description"' not in select
+        assert '"cavetechapp_category"' not in select
+
+    def test_related_field_is_joined(self, client, catalogue):
+        """Test that category slugs are read in the same query"""
+        with CaptureQueriesContext(connection) as ctx:
+            results = client.get('/api/projects/', {'fields': 'category'}).json()['results']
+        assert {result['category'] for result in results} == {'electronics', 'woodworking-test'}
+        assert sum('LIMIT' in q['sql'] for q in ctx.captured_queries) == 1
+
+    def test_unknown_field_is_rejected(self, client, catalogue):
+        """Test that a typo in ?fields= is a 400 with the valid names"""
+        response = client.get('/api/projects/', {'fields': 'title,secret'})
+        assert response.status_code == 400
+        assert 'secret' in response.json()['error']
+
+    def test_cursor_pagination(self, client, catalogue):
+        """Test that following next visits every project once, newest first"""
+        slugs = []
+        url = '/api/projects/?fields=slug&limit=2'
+        while url:
+            page = client.get(url).json()
+            slugs += [result['slug'] for result in page['results']]
+            url = page['next']
+        assert slugs == [project.slug for project in catalogue]
+
+    def test_invalid_cursor_and_limit(self, client, catalogue):
+        """Test that bad pagination parameters are a 400"""
+        assert client.get('/api/projects/', {'after': 'garbage'}).status_code == 400
+        assert client.get('/api/projects/', {'limit': '1000'}).status_code == 400
+        assert client.get('/api/projects/', {'limit': 'ten'}).status_code == 400
+
+    def test_category_filter(self, client, catalogue):
+        """Test that ?category= filters projects like the HTML listing"""
+        results = client.get('/api/projects/', {'category': 'woodworking-test'}).json()['results']
+        assert len(results) == 2
+
+    def test_people_and_categories(self, client, catalogue, sample_person):
+        """Test the people and category listings"""
+        people = client.get('/api/people/').json()['results']
+        assert people[0]['name'] == sample_person.name
+        assert people[0]['url'] == f'/people/{sample_person.pk}/'
+        categories = client.get('/api/categories/', {'fields': 'slug,names'}).json()['results']
+        electronics = next(c for c in categories if c['slug'] == 'electronics')
+        assert electronics['names'] == {'nb': "Elektronikk", 'en': "Electronics", 'zh-hans': "电子产品"}
+
+    def test_conditional_get(self, client, catalogue):
+        """Test that unchanged listings answer 304"""
+        etag = client.get('/api/people/').headers['ETag']
+        assert client.get('/api/people/', HTTP_IF_NONE_MATCH=etag).status_code == 304
+        Person.objects.create(name="New Member")
+        assert client.get('/api/people/', HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+class TestApiPageCache:
+    """Test that cached API pages follow the rows they list"""
+
+    @pytest.mark.parametrize('path, create', [
+        ('/api/projects/', lambda category: Project.objects.create(title="Fresh", description="Test", category=category)),
+        ('/api/people/', lambda category: Person.objects.create(name="Fresh")),
+        ('/api/categories/', lambda category: Category.objects.create(name="Fresh", slug="fresh")),
+    ])
+    def test_new_row_shows_up(self, db, client, settings, sample_category, path, create):
+        """Test that a new row appears in a cached API listing"""
+        settings.PAGE_CACHE_TIMEOUT = 60
+        client.get(path)
+        create(sample_category)
+        names = [row.get('title') or row.get('name') for row in client.get(path).json()['results']]
+        assert "Fresh" in names
+
+    def test_category_rename_purges_projects(self, db, client, settings, sample_category):
+        """Test that the projects listing follows changes to the categories it shows"""
+        settings.PAGE_CACHE_TIMEOUT = 60
+        Project.objects.create(title="Filed", description="Test", category=sample_category)
+        client.get('/api/projects/')
+        sample_category.slug = "electronics-renamed"
+        sample_category.save()
+        assert client.get('/api/projects/').json()['results'][0]['category'] == "electronics-renamed"
+
+
+class TestApiStreaming:
+    """Test the NDJSON export"""
+
+    def test_ndjson_streams_every_row(self, client, catalogue):
+        """Test that the export is one JSON object per line, in order"""
+        response = client.get('/api/projects/', {'format': 'ndjson', 'fields': 'slug', 'limit': '1'})
+        assert response.streaming
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        assert ndjson(response) == [{'slug': project.slug} for project in catalogue]
+
+    def test_ndjson_reads_in_chunks(self, client, catalogue, settings, monkeypatch):
+        """Test that rows are fetched with a chunked iterator"""
+        settings.API_EXPORT_CHUNK_SIZE = 2
+        calls = []
+        original = QuerySet.iterator
+
+        def spy(queryset, chunk_size=None):
+            calls.append(chunk_size)
+            return original(queryset, chunk_size=chunk_size)
+
+        monkeypatch.setattr(QuerySet, 'iterator', spy)
+        assert len(ndjson(client.get('/api/projects/', {'format': 'ndjson'}))) == 5
+        assert calls == [2]
+
+    def test_ndjson_streams_asynchronously_over_asgi(self, catalogue, settings):
+        """Test that ASGI deployments get an async iterator that is not buffered"""
+        settings.ASYNC_VIEWS = True
+        request = RequestFactory().get('/api/projects/', {'format': 'ndjson', 'fields': 'slug'})
+        response = ProjectsAPIView.as_view()(request)
+        assert response.is_async
+
+        async def collect():
+            return [chunk async for chunk in response.streaming_content]
+
+        lines = [json.loads(line) for line in async_to_sync(collect)()]
+        assert lines == [{'slug': project.slug} for project in catalogue]
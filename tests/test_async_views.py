@@ -0,0 +1,105 @@
+"""
+Async view tests for The Cave Tech Labs application
+"""
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import Http404
+from django.test import AsyncRequestFactory, RequestFactory
+from cavetechapp import async_views, views
+from cavetechapp.models import Person, Project
+
+
+def get(view_class, path, async_view=False, **kwargs):
+    """Call view_class with a GET request for path"""
+    if async_view:
+        request = AsyncRequestFactory().get(path)
+        return async_to_sync(view_class.as_view())(request, **kwargs)
+    return view_class.as_view()(RequestFactory().get(path), **kwargs)
+
+
+@pytest.fixture
+def projects(db, sample_person, sample_category):
+    """Fixture: A featured project and two related ones"""
+    return [
+        Project.objects.create(
+            title=f"Async Project {i}",
+            description="Test",
+            category=sample_category,
+            creator=sample_person,
+            featured=i == 0,
+        )
+        for i in range(3)
+    ]
+
+
+class TestAsyncViews:
+    """Test that the async views render the same pages as the sync ones"""
+
+    @pytest.fixture(autouse=True)
+    def disable_page_cache(self, settings):
+        settings.PAGE_CACHE_TIMEOUT = 0
+
+    @pytest.mark.parametrize('name, path, kwargs', [
+        ('IndexView', '/', {}),
+        ('AboutView', '/about/', {}),
+        ('PeopleListView', '/people/', {}),
+        ('ProjectsListView', '/projects/', {}),
+        ('ProjectsListView', '/projects/?category=electronics', {}),
+        ('SearchView', '/search/?q=async', {}),
+    ])
+    def test_async_view_matches_sync_view(self, projects, name, path, kwargs):
+        """Test that each async view renders the same content"""
+        sync_response = get(getattr(views, name), path, **kwargs)
+        async_response = get(getattr(async_views, name), path, async_view=True, **kwargs)
+        assert async_response.status_code == 200
+        assert async_response.content == sync_response.content
+
+    def test_async_detail_views_match_sync_views(self, projects, sample_person):
+        """Test that the detail views render the same content"""
+        for name, kwargs in [
+            ('PersonDetailView', {'pk': sample_person.pk}),
+            ('ProjectDetailView', {'slug': projects[0].slug}),
+        ]:
+            sync_response = get(getattr(views, name), '/', **kwargs)
+            async_response = get(getattr(async_views, name), '/', async_view=True, **kwargs)
+            assert async_response.content == sync_response.content
+
+    def test_async_project_detail_shows_related(self, projects):
+        """Test that related projects are fetched alongside the project"""
+        content = get(async_views.ProjectDetailView, '/', async_view=True, slug=projects[0].slug).content.decode()
+        assert "Async Project 1" in content
+        assert "Async Project 2" in content
+
+    def test_async_detail_views_404(self, db):
+        """Test that missing rows raise Http404"""
+        with pytest.raises(Http404):
+            get(async_views.PersonDetailView, '/', async_view=True, pk=999)
+        with pytest.raises(Http404):
+            get(async_views.ProjectDetailView, '/', async_view=True, slug='missing')
+
+
+class TestAsyncCache:
+    """Test page caching and conditional GET for the async views"""
+
+    def test_async_page_is_cached(self, db, sample_person, django_assert_num_queries):
+        """Test that a warm page is served without queries"""
+        get(async_views.PeopleListView, '/people/', async_view=True)
+        with django_assert_num_queries(0):
+            response = get(async_views.PeopleListView, '/people/', async_view=True)
+        assert sample_person.name in response.content.decode()
+
+    def test_async_page_is_purged_on_save(self, db, sample_person):
+        """Test that saving a row purges the cached async page"""
+        get(async_views.PeopleListView, '/people/', async_view=True)
+        Person.objects.create(name="New Member", title="Maker", bio="Bio")
+        response = get(async_views.PeopleListView, '/people/', async_view=True)
+        assert "New Member" in response.content.decode()
+
+    def test_async_conditional_get(self, db, sample_person):
+        """Test that a matching If-None-Match is answered with 304"""
+        response = get(async_views.PeopleListView, '/people/', async_view=True)
+        etag = response.headers['ETag']
+        request = AsyncRequestFactory().get('/people/', headers={'If-None-Match': etag})
+        response = async_to_sync(async_views.PeopleListView.as_view())(request)
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
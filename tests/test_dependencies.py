@@ -0,0 +1,288 @@
+"""
+Cached page dependency tracking tests for The Cave Tech Labs application
+"""
+import pytest
+from datetime import timedelta
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import AsyncRequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from cavetechapp import async_views, dependencies
+from cavetechapp.jobs import run_pending
+from cavetechapp.models import CachedPage, Category, Job, Person, Project
+from cavetechapp.pagination import encode_cursor
+from cavetechapp.related import refresh_related
+
+
+@pytest.fixture
+def workshop(db, settings):
+    """Fixture: Two members with a project each in separate categories, page cache on"""
+    settings.PAGE_CACHE_TIMEOUT = 60
+    ada = Person.objects.create(name="Ada", bio="Bio")
+    grace = Person.objects.create(name="Grace", bio="Bio")
+    lamp = Project.objects.create(
+        title="Desk Lamp", description="Brass reading lamp",
+        category=Category.objects.create(name="Lighting"), creator=ada,
+    )
+    loom = Project.objects.create(
+        title="Tape Loom", description="Weaving narrow bands",
+        category=Category.objects.create(name="Textiles"), creator=grace,
+    )
+    return {'ada': ada, 'grace': grace, 'lamp': lamp, 'loom': loom}
+
+
+def tokens(path):
+    """The recorded dependency tokens of the cached page at path"""
+    page = CachedPage.objects.get(path=path)
+    return set(page.dependencies.values_list('token', flat=True))
+
+
+def is_cached(path):
+    """Whether the rendered page at path is still in the page cache"""
+    page = CachedPage.objects.filter(path=path).first()
+    return page is not None and not page.stale and cache.get(page.cache_key) is not None
+
+
+class TestRecording:
+    """Test that cached pages record what they were rendered from"""
+
+    def test_detail_page_records_rows(self, client, workshop):
+        """Test that a project page depends on the project, its category and creator"""
+        lamp = workshop['lamp']
+        client.get(f'/projects/{lamp.slug}/')
+        recorded = tokens(f'/projects/{lamp.slug}/')
+        assert {
+            f'cavetechapp.project:{lamp.pk}',
+            f'cavetechapp.category:{lamp.category_id}',
+            f'cavetechapp.person:{workshop["ada"].pk}',
+            f'cavetechapp.project@category={lamp.category_id}',
+        } <= recorded
+        assert f'cavetechapp.project:{workshop["loom"].pk}' not in recorded
+
+    def test_profile_records_project_listing(self, client, workshop):
+        """Test that a profile depends on the list of the member's projects"""
+        ada = workshop['ada']
+        client.get(f'/people/{ada.pk}/')
+        assert f'cavetechapp.project@creator={ada.pk}' in tokens(f'/people/{ada.pk}/')
+
+    def test_async_view_records_rows(self, workshop):
+        """Test that the async views record the rows their ORM calls load"""
+        request = AsyncRequestFactory().get('/people/')
+        async_to_sync(async_views.PeopleListView.as_view())(request)
+        assert {
+            'cavetechapp.person',
+            f'cavetechapp.person:{workshop["ada"].pk}',
+            f'cavetechapp.person:{workshop["grace"].pk}',
+        } <= tokens('/people/')
+
+    def test_overlong_paths_are_not_cached(self, client, workshop):
+        """Test that URLs too long to record bypass the page cache"""
+        path = '/people/?' + 'x' * dependencies.MAX_PATH_LENGTH
+        client.get(path)
+        assert not CachedPage.objects.exists()
+        with CaptureQueriesContext(connection) as ctx:
+            client.get(path)
+        assert len(ctx.captured_queries) > 0
+
+    def test_only_known_query_parameters_are_recorded(self, client, workshop):
+        """Test that search, API options and unknown parameters write no dependency rows"""
+        lamp = workshop['lamp']
+        client.get(f'/projects/?category={lamp.category.slug}')
+        client.get('/people/?page=1')
+        for path in ['/search/?q=lamp', '/api/projects/?fields=title', '/projects/?utm=1',
+                     '/projects/?category=a&category=b', f'/projects/{lamp.slug}/?ref=feed']:
+            client.get(path)
+        assert set(CachedPage.objects.values_list('path', flat=True)) == {
+            f'/projects/?category={lamp.category.slug}', '/people/?page=1',
+        }
+
+    def test_unknown_variants_write_no_rows(self, client, workshop):
+        """Test that unknown categories, stale cursors and pages out of range are served but not recorded"""
+        ada = workshop['ada']
+        stale = encode_cursor(['Zed', ada.pk + 100])
+        for path in ['/projects/?category=nope', '/people/?page=999', '/people/?page=abc',
+                     '/people/?after=garbage', f'/people/?after={stale}']:
+            assert client.get(path).status_code == 200
+        assert not CachedPage.objects.exists()
+
+        valid = f'/people/?after={encode_cursor([ada.name, ada.pk])}'
+        client.get(valid)
+        assert set(CachedPage.objects.values_list('path', flat=True)) == {valid}
+
+    def test_untracked_variant_is_cached_and_follows_changes(self, client, workshop):
+        """Test that other query strings are cached under the model version stamps"""
+        client.get('/projects/?utm=1')
+        with CaptureQueriesContext(connection) as ctx:
+            client.get('/projects/?utm=1')
+        assert len(ctx.captured_queries) == 0
+        Project.objects.create(title="Lamp Shade", description="Paper shade", category=workshop['lamp'].category)
+        assert b"Lamp Shade" in client.get('/projects/?utm=1').content
+
+    def test_recording_writes_before_reading(self, client, workshop):
+        """Test that recording a page starts its transaction with a write"""
+        client.get('/people/')
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            client.get('/people/')
+        statements = [query['sql'] for query in ctx.captured_queries]
+        first = next(sql for sql in statements if 'cavetechapp_cachedpage' in sql)
+        assert first.startswith('UPDATE')
+
+    def test_expired_pages_are_pruned(self, client, workshop, settings):
+        """Test that pages not rendered within the cache lifetime are forgotten"""
+        client.get('/people/')
+        client.get('/projects/')
+        CachedPage.objects.filter(path='/people/').update(
+            updated_at=timezone.now() - timedelta(seconds=settings.PAGE_CACHE_TIMEOUT + 1)
+        )
+        assert dependencies.prune_pages() == 1
+        assert list(CachedPage.objects.values_list('path', flat=True)) == ['/projects/']
+
+
+class TestInvalidation:
+    """Test that a change purges only the pages showing it"""
+
+    def test_change_purges_only_dependent_pages(self, client, workshop):
+        """Test that editing a project leaves unrelated pages warm"""
+        lamp, loom, grace = workshop['lamp'], workshop['loom'], workshop['grace']
+        paths = [f'/projects/{lamp.slug}/', f'/projects/{loom.slug}/', f'/people/{grace.pk}/', '/projects/']
+        for path in paths:
+            client.get(path)
+        lamp.title = "Floor Lamp"
+        lamp.save()
+        assert b"Floor Lamp" in client.get(f'/projects/{lamp.slug}/').content
+        assert b"Floor Lamp" in client.get('/projects/').content
+        # Only the ETag validators of other pages are recomputed
+        assert is_cached(f'/projects/{loom.slug}/')
+        assert is_cached(f'/people/{grace.pk}/')
+
+    def test_purge_waits_for_commit(self, client, workshop):
+        """Test that a change made in a transaction purges its pages only once committed"""
+        lamp = workshop['lamp']
+        path = f'/projects/{lamp.slug}/'
+        client.get(path)
+        stamp = dependencies.change_stamp()
+        with transaction.atomic():
+            lamp.title = "Floor Lamp"
+            lamp.save()
+            assert is_cached(path)
+            assert dependencies.change_stamp() == stamp
+        assert not is_cached(path)
+        assert dependencies.change_stamp() != stamp
+
+    def test_rolled_back_change_purges_nothing(self, client, workshop):
+        """Test that a change that is rolled back leaves the cached pages alone"""
+        lamp = workshop['lamp']
+        path = f'/projects/{lamp.slug}/'
+        client.get(path)
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                lamp.title = "Floor Lamp"
+                lamp.save()
+                raise RuntimeError("abort")
+        assert is_cached(path)
+
+    def test_new_project_purges_creator_profile(self, client, workshop):
+        """Test that a new project shows up on its creator's profile"""
+        ada = workshop['ada']
+        client.get(f'/people/{ada.pk}/')
+        Project.objects.create(
+            title="Soldering Stand", description="Test", category=workshop['lamp'].category, creator=ada
+        )
+        assert b"Soldering Stand" in client.get(f'/people/{ada.pk}/').content
+
+    def test_reassigned_project_leaves_old_profile(self, client, workshop):
+        """Test that changing a project's creator purges the previous creator's profile"""
+        ada, grace, lamp = workshop['ada'], workshop['grace'], workshop['lamp']
+        assert b"Desk Lamp" in client.get(f'/people/{ada.pk}/').content
+        lamp.creator = grace
+        lamp.save()
+        assert b"Desk Lamp" not in client.get(f'/people/{ada.pk}/').content
+
+    def test_change_queues_regeneration(self, client, workshop, shared_cache):
+        """Test that purged pages are marked stale and a single job is queued"""
+        ada = workshop['ada']
+        client.get(f'/people/{ada.pk}/')
+        client.get('/people/')
+        ada.bio = "New bio"
+        ada.save()
+        assert set(CachedPage.objects.filter(stale=True).values_list('path', flat=True)) == {
+            f'/people/{ada.pk}/', '/people/',
+        }
+        assert Job.objects.filter(task='pages.regenerate').count() == 1
+
+    def test_process_local_cache_skips_regeneration(self, client, workshop):
+        """Test that no job is queued when its renders could not reach the web processes"""
+        ada = workshop['ada']
+        client.get(f'/people/{ada.pk}/')
+        ada.bio = "New bio"
+        ada.save()
+        assert CachedPage.objects.get(path=f'/people/{ada.pk}/').stale
+        assert not Job.objects.filter(task='pages.regenerate').exists()
+        assert dependencies.regenerate_stale() == 0
+
+    def test_related_refresh_purges_changed_neighbours(self, client, workshop):
+        """Test that recomputing related projects only purges pages whose neighbours moved"""
+        lamp, loom = workshop['lamp'], workshop['loom']
+        refresh_related()
+        Project.objects.create(title="Lamp Shade", description="Paper shade", category=lamp.category)
+        client.get(f'/projects/{lamp.slug}/')
+        client.get(f'/projects/{loom.slug}/')
+        refresh_related()
+        assert not is_cached(f'/projects/{lamp.slug}/')
+        assert is_cached(f'/projects/{loom.slug}/')
+
+    def test_change_during_render_is_not_cached(self, client, workshop):
+        """Test that a page rendered across a change is dropped again"""
+        stamp = dependencies.change_stamp()
+        client.get('/people/')
+        Person.objects.create(name="Linus")
+        dependencies.record_page(
+            CachedPage.objects.get(path='/people/').cache_key, '/people/', 'nb', set(), stamp
+        )
+        assert CachedPage.objects.get(path='/people/').stale
+        assert b"Linus" in client.get('/people/').content
+
+
+class TestRegeneration:
+    """Test the pages.regenerate job"""
+
+    @pytest.fixture(autouse=True)
+    def shared(self, shared_cache):
+        """Fixture: Regeneration only runs with a cache shared by every process"""
+
+    def test_job_warms_purged_pages(self, client, workshop):
+        """Test that the job renders purged pages into the cache again"""
+        lamp = workshop['lamp']
+        path = f'/projects/{lamp.slug}/'
+        client.get(path)
+        lamp.title = "Floor Lamp"
+        lamp.save()
+        run_pending()
+        assert is_cached(path)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(path)
+        assert len(ctx.captured_queries) == 0
+        assert b"Floor Lamp" in response.content
+
+    def test_job_renders_each_language(self, client, workshop, settings):
+        """Test that pages are re-rendered in the language they were cached in"""
+        ada = workshop['ada']
+        client.cookies[settings.LANGUAGE_COOKIE_NAME] = 'en'
+        client.get('/people/')
+        ada.name = "Ada Lovelace"
+        ada.save()
+        run_pending()
+        assert CachedPage.objects.get(path='/people/').language == 'en'
+        assert is_cached('/people/')
+        assert b"Ada Lovelace" in client.get('/people/').content
+
+    def test_job_forgets_deleted_pages(self, client, workshop):
+        """Test that pages of deleted rows are dropped rather than rendered"""
+        lamp = workshop['lamp']
+        client.get(f'/projects/{lamp.slug}/')
+        lamp.delete()
+        run_pending()
+        assert not CachedPage.objects.filter(path=f'/projects/{lamp.slug}/').exists()
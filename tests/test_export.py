@@ -0,0 +1,112 @@
+"""
+Static site export tests for The Cave Tech Labs application
+"""
+import json
+import os
+
+import pytest
+from django.core.management import CommandError, call_command
+from cavetechapp.export import MANIFEST_NAME, normalise_link, page_file, page_links
+from cavetechapp.models import Category, Project
+
+
+def export(output, *args):
+    """Run export_site without assets; return its summary line"""
+    with open(os.devnull, 'w') as devnull:
+        call_command('export_site', str(output), '--no-assets', *args, stdout=devnull, stderr=devnull)
+    with open(output / MANIFEST_NAME, encoding='utf-8') as f:
+        return json.load(f)['pages']
+
+
+@pytest.fixture
+def site(db, sample_category, sample_person):
+    """Fixture: A member with a project in each of two categories"""
+    other = Category.objects.create(name="Woodworking Test", slug="woodworking-test")
+    return [
+        Project.objects.create(title="Lamp", description="Test", category=sample_category, creator=sample_person),
+        Project.objects.create(title="Stool", description="Test", category=other),
+    ]
+
+
+class TestExportPaths:
+    """Test URL to file mapping and link discovery"""
+
+    def test_page_file(self):
+        """Test that paths become directories and queries file names"""
+        assert page_file('nb', '/') == 'nb/index.html'
+        assert page_file('en', '/people/3/') == 'en/people/3/index.html'
+        assert page_file('nb', '/projects/?category=art') == 'nb/projects/index~category=art.html'
+
+    def test_links_are_normalised(self):
+        """Test that only internal page links are followed"""
+        assert normalise_link('?page=2&amp;category=art', '/projects/?page=1') == '/projects/?page=2&category=art'
+        assert normalise_link('/people/#top', '/') == '/people/'
+        for href in ('/admin/', '/static/site.css', '/api/projects/', 'https://example.com/', '//cdn.example/x',
+                     'mailto:a@b.c', '/people/../admin/'):
+            assert normalise_link(href, '/') is None
+
+    def test_page_links_deduplicates(self):
+        """Test that each link is reported once, in order"""
+        content = '<a href="/people/">A</a><a href="/projects/">B</a><a href="/people/">C</a>'
+        assert page_links(content, '/') == ['/people/', '/projects/']
+
+
+class TestExportSite:
+    """Test the export_site command"""
+
+    @pytest.fixture(autouse=True)
+    def page_cache(self, settings):
+        settings.PAGE_CACHE_TIMEOUT = 60
+
+    def test_every_page_in_every_language(self, tmp_path, site, sample_person):
+        """Test that lists, details and category filters are written per language"""
+        pages = export(tmp_path)
+        for language in ('nb', 'en', 'zh-hans'):
+            for url in ('/', '/about/', '/people/', '/projects/', '/projects/?category=woodworking-test',
+                        f'/people/{sample_person.pk}/', f'/projects/{site[0].slug}/'):
+                assert (tmp_path / pages[f'{language} {url}']['file']).exists(), (language, url)
+        english = (tmp_path / 'en' / 'people' / 'index.html').read_text()
+        norwegian = (tmp_path / 'nb' / 'people' / 'index.html').read_text()
+        assert "Our Members" in english and "Våre medlemmer" in norwegian
+
+    def test_pagination_is_followed(self, tmp_path, sample_category):
+        """Test that pages reached only through links are exported"""
+        for i in range(14):
+            Project.objects.create(title=f"Project {i}", description="Test", category=sample_category)
+        pages = export(tmp_path, '--languages', 'en')
+        assert '/projects/?page=2' in {key.split(' ', 1)[1] for key in pages}
+
+    def test_incremental_export_rewrites_only_changed_pages(self, tmp_path, site, sample_person):
+        """Test that unchanged pages are not rewritten and deleted pages are removed"""
+        export(tmp_path, '--languages', 'en')
+        stool = tmp_path / 'en' / 'projects' / site[1].slug / 'index.html'
+        about = tmp_path / 'en' / 'about' / 'index.html'
+        os.utime(stool, (0, 0))
+        os.utime(about, (0, 0))
+
+        site[1].description = "Three legs"
+        site[1].save()
+        site[0].delete()
+        pages = export(tmp_path, '--languages', 'en', '--incremental')
+
+        assert "Three legs" in stool.read_text()
+        assert about.stat().st_mtime == 0
+        assert not (tmp_path / 'en' / 'projects' / 'lamp' / 'index.html').exists()
+        assert 'en /projects/lamp/' not in pages
+
+    def test_unknown_language(self, tmp_path, db):
+        """Test that language codes are validated"""
+        with pytest.raises(CommandError, match="xx"):
+            call_command('export_site', str(tmp_path), '--languages', 'xx', '--no-assets')
+
+    def test_assets_are_copied(self, tmp_path, settings, site):
+        """Test that collected static files and media are copied next to the pages"""
+        settings.STATIC_ROOT = tmp_path / 'collected'
+        settings.MEDIA_ROOT = tmp_path / 'uploads'
+        (tmp_path / 'uploads').mkdir()
+        (tmp_path / 'uploads' / 'note.txt').write_text("media")
+        output = tmp_path / 'site'
+        with open(os.devnull, 'w') as devnull:
+            call_command('export_site', str(output), '--languages', 'en', stdout=devnull, stderr=devnull)
+        assert (output / 'static' / 'i18n' / 'en.json').exists()
+        assert (output / 'media' / 'note.txt').read_text() == "media"
@@ -0,0 +1,167 @@
+"""
+Translation tests for The Cave Tech Labs application
+"""
+import json
+import os
+import shutil
+
+import pytest
+from cavetechapp import i18n
+from cavetechapp.i18n import translate
+from cavetechapp.models import SiteSettings
+
+
+class TestTranslate:
+    """Test dotted-key lookups in static/i18n/*.json"""
+
+    def test_translate_known_key(self, db):
+        """Test that keys resolve per language"""
+        assert translate('nav.people', 'nb') == "Medlemmer"
+        assert translate('nav.people', 'en') == "Members"
+        assert translate('nav.people', 'zh-hans') == "成员"
+
+    def test_translate_unknown_language_uses_default(self, db):
+        """Test that unsupported languages fall back to Norwegian"""
+        assert translate('nav.people', 'fr') == "Medlemmer"
+
+    def test_translate_missing_key_returns_key(self, db):
+        """Test that missing strings show their key"""
+        assert translate('nav.missing', 'en') == 'nav.missing'
+
+
+class TestServerSideTranslation:
+    """Test that pages are translated before they reach the browser"""
+
+    def test_default_language_is_norwegian(self, db, client):
+        """Test that pages render in Norwegian without a preference"""
+        content = client.get('/people/').content.decode()
+        assert '<html lang="nb"' in content
+        assert "Våre medlemmer" in content
+
+    def test_language_cookie_selects_language(self, db, client):
+        """Test that the language cookie set by the switcher is honoured"""
+        client.cookies['language'] = 'en'
+        content = client.get('/people/').content.decode()
+        assert '<html lang="en"' in content
+        assert "Our Members" in content
+        assert "Våre medlemmer" not in content
+
+    def test_accept_language_is_negotiated(self, db, client):
+        """Test that the browser language is used when no cookie is set"""
+        content = client.get('/people/', HTTP_ACCEPT_LANGUAGE='zh-CN,zh;q=0.9').content.decode()
+        assert "我们的成员" in content
+
+    def test_html_translation_keeps_markup(self, db, client):
+        """Test that data-i18n-html strings keep their <br>"""
+        client.cookies['language'] = 'en'
+        assert "Welcome to<br>CaveTech" in client.get('/').content.decode()
+
+    def test_only_active_language_is_shipped(self, db, client):
+        """Test that other languages' strings are not embedded in the page"""
+        client.cookies['language'] = 'en'
+        content = client.get('/').content.decode()
+        assert "Velkommen til" not in content
+        assert "欢迎来到" not in content
+
+    def test_catalogue_is_not_embedded(self, db, client):
+        """Test that pages do not ship the UI catalogue, which no script reads"""
+        content = client.get('/people/').content.decode()
+        assert 'i18n-catalogue' not in content
+        assert '"nav.home"' not in content
+
+    def test_page_cache_is_per_language(self, db, client):
+        """Test that a cached Norwegian page is not served to English visitors"""
+        client.get('/people/')
+        client.cookies['language'] = 'en'
+        assert "Our Members" in client.get('/people/').content.decode()
+
+
+class TestCompiledCatalogue:
+    """Test the flattened catalogue and its hot reload"""
+
+    @pytest.fixture(autouse=True)
+    def check_every_lookup(self, settings):
+        settings.I18N_RELOAD_INTERVAL = 0
+        yield
+        # Drop catalogues compiled from temporary files or test rows
+        i18n._compiled = None
+
+    @pytest.fixture
+    def i18n_dir(self, tmp_path, monkeypatch):
+        for path in i18n.source_files():
+            shutil.copy(path, tmp_path / path.name)
+        monkeypatch.setattr(i18n, 'I18N_DIR', tmp_path)
+        monkeypatch.setattr(i18n, 'CATEGORIES_FILE', tmp_path / 'categories.json')
+        i18n.load_catalogues(force=True)
+        return tmp_path
+
+    def test_keys_are_flattened(self, db):
+        """Test that nested JSON keys are compiled to dotted keys"""
+        catalogue = i18n.get_catalogue('en')
+        assert catalogue['nav.people'] == "Members"
+        assert catalogue['categories.electronics'] == "Electronics"
+        assert i18n.get_catalogue('nb')['categories.electronics'] == "Elektronikk"
+
+    def test_site_settings_are_compiled(self, db):
+        """Test that SiteSettings translations fall back to Norwegian, then the field"""
+        site = SiteSettings.get_settings()
+        site.about_title = "Base"
+        site.about_title_translations = {'nb': "Om oss", 'en': "About us"}
+        site.history = "Base history"
+        site.history_translations = {}
+        site.save()
+        assert i18n.translate('site.about_title', 'en') == "About us"
+        assert i18n.translate('site.about_title', 'zh-hans') == "Om oss"
+        assert i18n.translate('site.history', 'en') == "Base history"
+
+    def test_site_settings_change_reloads(self, db):
+        """Test that saving SiteSettings rebuilds the catalogue"""
+        site = SiteSettings.get_settings()
+        site.about_title_translations = {'en': "First"}
+        site.save()
+        assert i18n.translate('site.about_title', 'en') == "First"
+        site.about_title_translations = {'en': "Second"}
+        site.save()
+        assert i18n.translate('site.about_title', 'en') == "Second"
+
+    def test_file_change_reloads(self, db, i18n_dir):
+        """Test that editing a JSON file is picked up without a restart"""
+        version = i18n.catalogue_version()
+        path = i18n_dir / 'en.json'
+        data = json.loads(path.read_text(encoding='utf-8'))
+        data['nav']['people'] = "Crew"
+        path.write_text(json.dumps(data), encoding='utf-8')
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert i18n.translate('nav.people', 'en') == "Crew"
+        assert i18n.catalogue_version() != version
+
+    def test_unchanged_sources_are_not_recompiled(self, db, monkeypatch):
+        """Test that lookups reuse the compiled catalogue"""
+        i18n.get_catalogue('en')
+        def fail(*args, **kwargs):
+            raise AssertionError("recompiled")
+        monkeypatch.setattr(i18n, 'compile_catalogues', fail)
+        assert i18n.translate('nav.people', 'en') == "Members"
+
+    def test_reload_checks_are_throttled(self, db, settings, i18n_dir, monkeypatch):
+        """Test that sources are not re-checked within the reload interval"""
+        i18n.get_catalogue('en')
+        settings.I18N_RELOAD_INTERVAL = 3600
+        monkeypatch.setattr(i18n, '_current_stamp', lambda *args: pytest.fail("checked"))
+        assert i18n.translate('nav.people', 'en') == "Members"
+
+    def test_category_names_are_translated(self, db, client, sample_category):
+        """Test that category labels render in the active language"""
+        client.cookies['language'] = 'en'
+        assert "Electronics" in client.get('/projects/').content.decode()
+        client.cookies['language'] = 'nb'
+        assert "Elektronikk" in client.get('/projects/').content.decode()
+
+    def test_about_title_uses_active_language(self, db, client):
+        """Test that the About title is rendered from the catalogue"""
+        site = SiteSettings.get_settings()
+        site.about_title_translations = {'nb': "Om oss", 'en': "About us"}
+        site.save()
+        client.cookies['language'] = 'en'
+        assert "About us</h1>" in client.get('/about/').content.decode()
@@ -0,0 +1,121 @@
+"""
+Image rendition tests for The Cave Tech Labs application
+"""
+import pytest
+from io import BytesIO
+from django.core.files.base import ContentFile
+from django.template import Context, Template
+from PIL import Image
+from cavetechapp.images import get_renditions, manifest_name, target_widths
+from cavetechapp.jobs import run_pending
+from cavetechapp.models import Job, Person
+
+
+def make_upload(width=1600, height=1200):
+    """Return an in-memory JPEG upload"""
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'orange').save(buffer, 'JPEG')
+    return ContentFile(buffer.getvalue(), name='portrait.jpg')
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    """Fixture: Store uploads in a temporary MEDIA_ROOT"""
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+class TestRenditions:
+    """Test rendition generation"""
+
+    def test_target_widths_never_upscale(self):
+        """Test that small sources only get a rendition at their own width"""
+        assert target_widths(200) == [200]
+        assert target_widths(700) == [320, 640, 700]
+        assert target_widths(4000) == [320, 640, 960, 1280]
+
+    def test_upload_queues_renditions(self, db, media_root):
+        """Test that saving an image queues a job instead of resizing in the request"""
+        person = Person.objects.create(name="Pictured", image=make_upload())
+        assert not (media_root / manifest_name(person.image.name)).exists()
+        job = Job.objects.get(task='images.build_renditions')
+        assert job.payload == {'name': person.image.name, 'model': 'cavetechapp.Person'}
+
+    def test_worker_builds_renditions(self, db, media_root):
+        """Test that the queued job writes WebP and JPEG renditions and a manifest"""
+        person = Person.objects.create(name="Pictured", image=make_upload())
+        assert run_pending() == 1
+        assert (media_root / manifest_name(person.image.name)).exists()
+        manifest = get_renditions(person.image.name)
+        assert [w for w, _ in manifest['image/webp']] == [320, 640, 960, 1280]
+        assert [w for w, _ in manifest['image/jpeg']] == [320, 640, 960, 1280]
+        for _, path in manifest['image/webp']:
+            with Image.open(media_root / path) as rendition:
+                assert rendition.format == 'WEBP'
+
+    def test_missing_renditions_are_built_lazily(self, db, media_root):
+        """Test that renditions are created on first lookup if absent"""
+        person = Person.objects.create(name="Pictured", image=make_upload(500, 500))
+        manifest = get_renditions(person.image.name)
+        assert [w for w, _ in manifest['image/jpeg']] == [320, 500]
+
+    def test_unreadable_image_returns_none(self, db, media_root):
+        """Test that a broken upload falls back to no renditions"""
+        (media_root / 'broken.jpg').write_bytes(b'not an image')
+        assert get_renditions('broken.jpg') is None
+
+
+class TestResponsiveImageTag:
+    """Test the responsive_image template tag"""
+
+    def render(self, person):
+        template = Template(
+            '{% load responsive_images %}'
+            '{% responsive_image person.image alt=person.name sizes="33vw" class="w-full" %}'
+        )
+        return template.render(Context({'person': person}))
+
+    def test_tag_renders_srcset(self, db, media_root):
+        """Test that the tag emits WebP and JPEG srcsets"""
+        person = Person.objects.create(name="Pictured", image=make_upload())
+        run_pending()
+        html = self.render(person)
+        assert '<source type="image/webp"' in html
+        assert '-320w.webp 320w' in html
+        assert '-1280w.jpg 1280w' in html
+        assert 'sizes="33vw"' in html
+        assert 'class="w-full"' in html
+        assert 'loading="lazy"' in html
+
+    def test_tag_falls_back_before_worker_runs(self, db, media_root):
+        """Test that the original upload is shown until renditions exist"""
+        person = Person.objects.create(name="Pictured", image=make_upload())
+        html = self.render(person)
+        assert 'srcset' not in html
+        assert f'src="{person.image.url}"' in html
+
+    def test_tag_does_not_queue_jobs(self, db, media_root, django_assert_num_queries):
+        """Test that rendering an image without renditions neither queries nor queues anything"""
+        person = Person.objects.create(name="Pictured", image=make_upload())
+        Job.objects.all().delete()
+        with django_assert_num_queries(0):
+            self.render(person)
+        assert not Job.objects.exists()
+
+    def test_failed_renditions_are_not_requeued(self, db, media_root):
+        """Test that saving again does not queue a job that already failed for the upload"""
+        person = Person.objects.create(name="Pictured", image=make_upload())
+        Job.objects.update(status=Job.FAILED)
+        person.save()
+        assert Job.objects.count() == 1
+
+    def test_tag_without_image_renders_nothing(self, db):
+        """Test that an empty image field renders nothing"""
+        assert self.render(Person.objects.create(name="No Picture")) == ''
+
+    def test_people_list_uses_renditions(self, db, client, media_root):
+        """Test that listing pages emit srcset for member photos"""
+        Person.objects.create(name="Pictured", image=make_upload())
+        assert b'srcset=' not in client.get('/people/').content
+        run_pending()
+        assert b'srcset=' in client.get('/people/').content
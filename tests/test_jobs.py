@@ -0,0 +1,146 @@
+"""
+Background job queue tests for The Cave Tech Labs application
+"""
+import pytest
+from datetime import timedelta
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.utils import timezone
+from cavetechapp import jobs
+from cavetechapp.admin import JobAdmin
+from cavetechapp.models import Job
+
+calls = []
+
+
+@jobs.task('tests.record')
+def record(value):
+    calls.append(value)
+
+
+@jobs.task('tests.explode')
+def explode():
+    raise RuntimeError("boom")
+
+
+@jobs.task('tests.transaction')
+def in_transaction():
+    calls.append(not all(block._from_testcase for block in connection.atomic_blocks))
+
+
+@jobs.task('tests.autocommit', atomic=False)
+def in_autocommit():
+    calls.append(not all(block._from_testcase for block in connection.atomic_blocks))
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    """Fixture: Forget calls recorded by earlier tests"""
+    calls.clear()
+
+
+class TestJobQueue:
+    """Test queueing and running jobs"""
+
+    def test_enqueue_creates_pending_job(self, db):
+        """Test that enqueue stores the task and payload"""
+        job = jobs.enqueue('tests.record', value=1)
+        assert job.status == Job.PENDING
+        assert job.payload == {'value': 1}
+
+    def test_enqueue_deduplicates_pending_jobs(self, db):
+        """Test that an identical pending job is reused"""
+        assert jobs.enqueue('tests.record', value=1) == jobs.enqueue('tests.record', value=1)
+        assert Job.objects.count() == 1
+
+    def test_unique_enqueue_skips_running_and_failed_jobs(self, db):
+        """Test that a unique job is not queued again while running or after failing"""
+        job = jobs.enqueue('tests.record', unique=True, value=1)
+        for status in (Job.RUNNING, Job.FAILED):
+            Job.objects.filter(pk=job.pk).update(status=status)
+            assert jobs.enqueue('tests.record', unique=True, value=1) == job
+        assert Job.objects.count() == 1
+
+    def test_enqueue_unknown_task_raises(self, db):
+        """Test that queueing an unregistered task fails loudly"""
+        with pytest.raises(LookupError):
+            jobs.enqueue('tests.missing')
+
+    def test_run_pending_executes_jobs(self, db):
+        """Test that due jobs are run and marked done"""
+        job = jobs.enqueue('tests.record', value=42)
+        assert jobs.run_pending() == 1
+        job.refresh_from_db()
+        assert job.status == Job.DONE
+        assert job.attempts == 1
+        assert calls == [42]
+
+    def test_jobs_run_in_a_transaction_unless_told_not_to(self, db):
+        """Test that only tasks registered with atomic=False run outside a transaction"""
+        jobs.enqueue('tests.transaction')
+        jobs.enqueue('tests.autocommit')
+        jobs.run_pending()
+        assert calls == [True, False]
+
+    def test_page_regeneration_commits_per_page(self):
+        """Test that regenerating pages does not hold one transaction for the whole run"""
+        assert not jobs.get_task('pages.regenerate').atomic
+
+    def test_future_jobs_wait(self, db):
+        """Test that jobs are not run before run_after"""
+        jobs.enqueue('tests.record', run_after=timezone.now() + timedelta(hours=1), value=1)
+        assert jobs.run_pending() == 0
+
+    def test_failed_job_is_retried_later(self, db):
+        """Test that a failure schedules a retry with backoff"""
+        job = jobs.enqueue('tests.explode')
+        jobs.run_pending()
+        job.refresh_from_db()
+        assert job.status == Job.PENDING
+        assert job.run_after > timezone.now()
+        assert "boom" in job.last_error
+
+    def test_job_fails_after_max_attempts(self, db):
+        """Test that a job is marked failed once attempts run out"""
+        job = jobs.enqueue('tests.explode')
+        for _ in range(job.max_attempts):
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            jobs.run_pending()
+        job.refresh_from_db()
+        assert job.status == Job.FAILED
+        assert job.attempts == job.max_attempts
+
+    def test_stale_running_jobs_are_requeued(self, db):
+        """Test that jobs left running by a dead worker go back to the queue"""
+        job = jobs.enqueue('tests.record', value=1)
+        Job.objects.filter(pk=job.pk).update(status=Job.RUNNING)
+        assert jobs.requeue_stale(timeout=-1) == 1
+        job.refresh_from_db()
+        assert job.status == Job.PENDING
+
+    def test_run_jobs_command_drains_queue(self, db, shared_cache):
+        """Test that run_jobs --once processes everything due"""
+        jobs.enqueue('tests.record', value=1)
+        jobs.enqueue('tests.record', value=2)
+        call_command('run_jobs', '--once')
+        assert sorted(calls) == [1, 2]
+
+    def test_run_jobs_refuses_process_local_cache(self, db):
+        """Test that the worker does not start when its purges could not reach the web processes"""
+        jobs.enqueue('tests.record', value=1)
+        with pytest.raises(CommandError):
+            call_command('run_jobs', '--once')
+        assert calls == []
+
+
+class TestJobAdmin:
+    """Test Job admin configuration"""
+
+    def test_job_admin_list_display(self):
+        """Test that job admin shows status and attempts"""
+        assert 'status' in JobAdmin.list_display
+        assert 'attempts' in JobAdmin.list_display
+
+    def test_job_admin_has_retry_action(self):
+        """Test that failed jobs can be retried from the admin"""
+        assert 'retry_jobs' in JobAdmin.actions
@@ -1,9 +1,16 @@
 """
 Model tests for The Cave Tech Labs application
 """
+import io
+import json
+
 import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
 from django.test import TestCase
-from cavetechapp.models import Person, Project
+from django.test.utils import CaptureQueriesContext
+from cavetechapp.models import SITE_SETTINGS_VERSION_KEY, Person, Project, SiteSettings
 
 
 class TestPersonModel:
@@ -161,3 +168,110 @@ class TestProjectModel:
         sample_person.delete()
         sample_project.refresh_from_db()
         assert sample_project.creator is None
+
+
+class TestExcerpts:
+    """Test the stored card excerpts of projects and members"""
+
+    LONG = ' '.join(f"word{i}" for i in range(40))
+
+    def test_excerpt_is_computed_on_save(self, db, sample_category):
+        """Test that saving stores the first words of the long text"""
+        project = Project.objects.create(title="Long", description=self.LONG, category=sample_category)
+        person = Person.objects.create(name="Wordy", bio=self.LONG)
+        project.refresh_from_db()
+        person.refresh_from_db()
+        assert project.description_excerpt == ' '.join(self.LONG.split()[:Project.EXCERPT_WORDS]) + ' …'
+        assert person.bio_excerpt == ' '.join(self.LONG.split()[:Person.EXCERPT_WORDS]) + ' …'
+
+    def test_short_text_is_kept_whole(self, db):
+        """Test that text within the word limit is stored unchanged"""
+        person = Person.objects.create(name="Brief", bio="Makes lamps")
+        assert Person.objects.get(pk=person.pk).bio_excerpt == "Makes lamps"
+
+    def test_excerpt_follows_update_fields(self, db, sample_person):
+        """Test that saving the source with update_fields saves the excerpt too"""
+        sample_person.bio = "Rewritten"
+        sample_person.save(update_fields=['bio'])
+        assert Person.objects.get(pk=sample_person.pk).bio_excerpt == "Rewritten"
+
+    def test_deferred_source_is_not_loaded(self, db, sample_person):
+        """Test that saving a row loaded without its long text neither writes nor recomputes it"""
+        sample_person.bio = "Original bio"
+        sample_person.save()
+        person = Person.objects.defer('bio').get(pk=sample_person.pk)
+        person.name = "Renamed"
+        with CaptureQueriesContext(connection) as ctx:
+            person.save()
+        update, = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('UPDATE "cavetechapp_person"')]
+        assert '"bio" =' not in update
+        assert Person.objects.get(pk=person.pk).bio_excerpt == "Original bio"
+
+    def test_backfill_command_fills_bulk_updates(self, db, sample_category):
+        """Test that backfill_excerpts catches up on rows changed without save()"""
+        project = Project.objects.create(title="Bulk", description="Before", category=sample_category)
+        Project.objects.filter(pk=project.pk).update(description="After the bulk update")
+        out = io.StringIO()
+        call_command('backfill_excerpts', stdout=out)
+        project.refresh_from_db()
+        assert project.description_excerpt == "After the bulk update"
+        assert "Updated 1 projects" in out.getvalue()
+        assert project.updated_at > project.created_at
+
+
+class TestSiteSettingsCache:
+    """Test the cached SiteSettings accessor"""
+
+    def test_get_cached_returns_singleton(self, db):
+        """Test that the cached accessor returns the pk=1 instance"""
+        settings = SiteSettings.get_cached()
+        assert settings.pk == 1
+
+    def test_get_cached_skips_database_when_warm(self, db, django_assert_num_queries):
+        """Test that repeated lookups do not query the database"""
+        SiteSettings.get_cached()
+        with django_assert_num_queries(0):
+            SiteSettings.get_cached()
+
+    def test_get_cached_uses_shared_cache_when_memo_is_cold(self, db, django_assert_num_queries):
+        """Test that a fresh process is served from the shared cache"""
+        import cavetechapp.models as models
+        SiteSettings.get_cached()
+        models._site_settings_memo = (None, None)
+        with django_assert_num_queries(0):
+            assert SiteSettings.get_cached().pk == 1
+
+    def test_save_invalidates_cache(self, db):
+        """Test that saving SiteSettings refreshes the cached copy"""
+        settings = SiteSettings.get_cached()
+        settings.email = "new@example.com"
+        settings.save()
+        assert SiteSettings.get_cached().email == "new@example.com"
+
+    def test_invalidation_waits_for_commit(self, db):
+        """Test that the cached copy is only invalidated once the save commits"""
+        settings = SiteSettings.get_cached()
+        version = cache.get(SITE_SETTINGS_VERSION_KEY)
+        with transaction.atomic():
+            settings.email = "new@example.com"
+            settings.save()
+            assert cache.get(SITE_SETTINGS_VERSION_KEY) == version
+        assert cache.get(SITE_SETTINGS_VERSION_KEY) != version
+        assert SiteSettings.get_cached().email == "new@example.com"
+
+    def test_save_serialises_translations(self, db):
+        """Test that the About page payload is precomputed on save"""
+        settings = SiteSettings.get_settings()
+        settings.about_title_translations = {'en': "About us"}
+        settings.save()
+        payload = json.loads(SiteSettings.get_cached().translations_json)
+        assert payload['about_title'] == {'en': "About us"}
+        assert set(payload) == {'about_title', 'about_content', 'history'}
+
+    def test_save_with_update_fields_serialises_translations(self, db):
+        """Test that partial saves keep the payload in sync"""
+        settings = SiteSettings.get_settings()
+        settings.history_translations = {'nb': "Historie"}
+        settings.save(update_fields=['history_translations'])
+        settings.refresh_from_db()
+        assert json.loads(settings.translations_json)['history'] == {'nb': "Historie"}
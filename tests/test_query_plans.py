@@ -0,0 +1,144 @@
+"""
+Query plan regression tests for The Cave Tech Labs application
+
+Every query a public page runs is checked with EXPLAIN QUERY PLAN so a
+missing index shows up as a failing test rather than a slow page.
+"""
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from cavetechapp.models import Person, Project
+from cavetechapp.related import refresh_related
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason="EXPLAIN QUERY PLAN is SQLite syntax"
+)
+
+# "SCAN table" without "USING ... INDEX" reads every row of the table
+FULL_SCAN = re.compile(r'^SCAN (\S+)$')
+# "USE TEMP B-TREE FOR ORDER BY" sorts the result instead of reading an index in order
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+
+
+def is_table_summary(sql):
+    """
+    Validators for whole-table listings aggregate every row by design (and
+    are cached until the table changes), so they may scan.
+    """
+    return sql.startswith('SELECT COUNT(') and ' WHERE ' not in sql and ' LIMIT ' not in sql
+
+
+def is_ranked_search(sql):
+    """
+    Search results are ordered by relevance, which no index can provide;
+    only the matching rows (found through the FTS index) are sorted.
+    """
+    return 'bm25(' in sql
+
+
+def explain(queries):
+    """Return (sql, plan lines) for each captured query"""
+    plans = []
+    with connection.cursor() as cursor:
+        for query in queries:
+            cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+            plans.append((query['sql'], [row[-1] for row in cursor.fetchall()]))
+    return plans
+
+
+def query_plans(client, url):
+    """Fetch url and return (sql, plan lines) for each query it ran"""
+    with CaptureQueriesContext(connection) as ctx:
+        assert client.get(url).status_code == 200
+    return explain(ctx.captured_queries)
+
+
+@pytest.fixture
+def catalogue(db, settings, sample_category):
+    """Fixture: A few members and projects, with the page cache off"""
+    settings.PAGE_CACHE_TIMEOUT = 0
+    people = [Person.objects.create(name=f"Member {i}", bio="Bio") for i in range(3)]
+    projects = [
+        Project.objects.create(
+            title=f"Project {i}",
+            description="Test",
+            category=sample_category,
+            creator=people[i % 3],
+            featured=i % 2 == 0,
+        )
+        for i in range(6)
+    ]
+    return people, projects
+
+
+class TestQueryPlans:
+    """Test that the public pages' queries are served by indexes"""
+
+    @pytest.mark.parametrize('url', [
+        '/',
+        '/about/',
+        '/people/',
+        '/projects/',
+        '/projects/?category=electronics',
+        '/projects/?page=2',
+        '/search/?q=project',
+        '/api/projects/',
+        '/api/projects/?category=electronics&fields=slug,category',
+        '/api/people/',
+        '/api/categories/',
+        'person',
+        'project',
+    ])
+    def test_no_full_table_scans(self, client, catalogue, url):
+        """Test that no query reads a whole table or sorts without an index"""
+        people, projects = catalogue
+        url = {
+            'person': f'/people/{people[0].pk}/',
+            'project': f'/projects/{projects[0].slug}/',
+        }.get(url, url)
+
+        problems = []
+        for sql, plan in query_plans(client, url):
+            for line in plan:
+                if FULL_SCAN.match(line) and not is_table_summary(sql):
+                    problems.append(f"{line}: {sql}")
+                elif line == TEMP_SORT and not is_ranked_search(sql):
+                    problems.append(f"{line}: {sql}")
+        assert not problems, "\n".join(problems)
+
+    def test_stored_related_projects_use_index(self, client, catalogue):
+        """Test that precomputed neighbours are read through the (project, rank) index"""
+        _, projects = catalogue
+        refresh_related()
+        for sql, plan in query_plans(client, f'/projects/{projects[0].slug}/'):
+            assert not any(FULL_SCAN.match(line) for line in plan if not is_table_summary(sql)), sql
+            assert TEMP_SORT not in plan, sql
+
+    def test_keyset_page_uses_index(self, client, catalogue, sample_category):
+        """Test that ?after= pages seek into the ordering index"""
+        for i in range(12):
+            Project.objects.create(title=f"Extra {i}", description="Test", category=sample_category)
+        content = client.get('/projects/').content.decode()
+        after = re.search(r'after=([\w-]+)', content).group(1)
+        for sql, plan in query_plans(client, f'/projects/?after={after}'):
+            assert not any(FULL_SCAN.match(line) for line in plan if not is_table_summary(sql)), sql
+            assert TEMP_SORT not in plan, sql
+
+    def test_dependent_page_lookup_uses_index(self, client, catalogue, settings):
+        """Test that saving a project finds the cached pages showing it through indexes"""
+        people, projects = catalogue
+        settings.PAGE_CACHE_TIMEOUT = 60
+        for url in ['/', '/projects/', f'/people/{people[0].pk}/', f'/projects/{projects[0].slug}/']:
+            client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            projects[0].title = "Renamed"
+            projects[0].save()
+        plans = [
+            (sql, plan) for sql, plan in explain(ctx.captured_queries)
+            if 'cavetechapp_cachedpage' in sql or 'cavetechapp_pagedependency' in sql
+        ]
+        assert plans
+        for sql, plan in plans:
+            assert not any(FULL_SCAN.match(line) for line in plan), sql
@@ -0,0 +1,135 @@
+"""
+Related-project recommendation tests for The Cave Tech Labs application
+"""
+from datetime import datetime, timezone
+
+import pytest
+from cavetechapp.jobs import run_pending
+from cavetechapp.models import Category, Job, Project, RelatedProject
+from cavetechapp.related import compute_neighbours, refresh_related
+
+
+def row(pk, category=1, creator=None, title="", description="", day=1):
+    """A project row as read by refresh_related()"""
+    return {
+        'pk': pk, 'category_id': category, 'creator_id': creator,
+        'title': title, 'description': description,
+        'created_at': datetime(2024, 1, day, tzinfo=timezone.utc),
+    }
+
+
+def related_pks(neighbours, pk):
+    return [related_pk for _, related_pk in neighbours[pk]]
+
+
+class TestComputeNeighbours:
+    """Test the similarity scoring"""
+
+    def test_shared_words_outrank_category(self):
+        """Test that a text match in another category beats a bare category match"""
+        rows = [
+            row(1, category=1, description="laser cut plywood enclosure"),
+            row(2, category=1, description="knitting pattern"),
+            row(3, category=2, description="plywood enclosure for a laser"),
+            row(4, category=3, description="sourdough starter"),
+        ]
+        assert related_pks(compute_neighbours(rows), 1) == [3, 2]
+
+    def test_creator_breaks_ties(self):
+        """Test that a shared creator adds to the score"""
+        rows = [row(1, creator=7), row(2, creator=8, day=9), row(3, creator=7)]
+        assert related_pks(compute_neighbours(rows), 1) == [3, 2]
+
+    def test_newer_projects_win_ties(self):
+        """Test that equal scores are ordered newest first"""
+        rows = [row(1), row(2, day=2), row(3, day=3)]
+        assert related_pks(compute_neighbours(rows), 1) == [3, 2]
+
+    def test_common_words_are_ignored(self):
+        """Test that words used by most projects do not make them similar"""
+        rows = [
+            row(i, category=i, description=f"the project number{i}")
+            for i in range(1, 6)
+        ]
+        assert compute_neighbours(rows)[1] == []
+
+    def test_unrelated_projects_are_not_stored(self):
+        """Test that only positive scores become neighbours"""
+        rows = [row(1, category=1), row(2, category=2)]
+        assert compute_neighbours(rows) == {1: [], 2: []}
+
+    def test_count_limits_neighbours(self):
+        """Test that at most count neighbours are kept"""
+        rows = [row(i) for i in range(1, 10)]
+        assert all(len(ranked) == 2 for ranked in compute_neighbours(rows, count=2).values())
+
+
+@pytest.fixture
+def projects(db, sample_category, sample_person):
+    """Fixture: Projects in two categories, one sharing words across them"""
+    other = Category.objects.create(name="Woodworking Test", slug="woodworking-test")
+    return {
+        'lamp': Project.objects.create(
+            title="Desk Lamp", description="Walnut veneer", category=sample_category,
+            creator=sample_person,
+        ),
+        'radio': Project.objects.create(title="Radio", description="Crystal set", category=sample_category),
+        'shelf': Project.objects.create(title="Walnut Lamp Shelf", description="Desk veneer", category=other),
+        'stool': Project.objects.create(title="Stool", description="Turned legs", category=other),
+    }
+
+
+class TestRelatedTable:
+    """Test storing and serving the neighbours"""
+
+    def test_saving_queues_one_refresh(self, projects):
+        """Test that changes queue a single pending refresh job"""
+        assert Job.objects.filter(task='related.refresh', status=Job.PENDING).count() == 1
+
+    def test_job_fills_table(self, projects):
+        """Test that running the queue stores ranked neighbours"""
+        run_pending()
+        links = RelatedProject.objects.filter(project=projects['lamp'])
+        assert [link.related for link in links] == [projects['shelf'], projects['radio']]
+        assert [link.rank for link in links] == [0, 1]
+
+    def test_detail_view_serves_stored_neighbours(self, client, projects, settings):
+        """Test that the page shows the precomputed projects in rank order"""
+        settings.PAGE_CACHE_TIMEOUT = 0
+        refresh_related()
+        response = client.get(f"/projects/{projects['lamp'].slug}/")
+        assert list(response.context['related_projects']) == [projects['shelf'], projects['radio']]
+
+    def test_detail_view_falls_back_to_category(self, client, projects, settings):
+        """Test that projects without stored neighbours show their category"""
+        settings.PAGE_CACHE_TIMEOUT = 0
+        response = client.get(f"/projects/{projects['lamp'].slug}/")
+        assert list(response.context['related_projects']) == [projects['radio']]
+
+    def test_refresh_purges_cached_page(self, client, projects, settings):
+        """Test that a recompute changes the cached page and its ETag"""
+        settings.PAGE_CACHE_TIMEOUT = 60
+        url = f"/projects/{projects['lamp'].slug}/"
+        etag = client.get(url).headers['ETag']
+        refresh_related()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert b"Walnut Lamp Shelf" in response.content
+
+    def test_refresh_keeps_unchanged_rankings(self, client, projects, settings):
+        """Test that a recompute only rewrites the neighbours that changed"""
+        settings.PAGE_CACHE_TIMEOUT = 60
+        refresh_related()
+        url = f"/projects/{projects['stool'].slug}/"
+        etag = client.get(url).headers['ETag']
+        stool_links = list(RelatedProject.objects.filter(project=projects['stool']).values_list('pk', 'updated_at'))
+        Project.objects.create(title="Lamp Veneer", description="Walnut desk", category=projects['lamp'].category)
+        assert refresh_related() > 0
+        assert list(RelatedProject.objects.filter(project=projects['stool']).values_list('pk', 'updated_at')) == stool_links
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    def test_deleted_project_leaves_table(self, projects):
+        """Test that deleting a project removes the links pointing at it"""
+        refresh_related()
+        projects['shelf'].delete()
+        assert not RelatedProject.objects.filter(related_id=projects['shelf'].pk).exists()
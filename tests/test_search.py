@@ -0,0 +1,154 @@
+"""
+Full-text search tests for The Cave Tech Labs application
+"""
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from cavetechapp.models import Person, Project, SearchDocument
+from cavetechapp.search import parse_terms, search
+
+
+def titles(query):
+    """Titles of the documents matching query, best first"""
+    return [document.title for document in search(query)]
+
+
+@pytest.fixture
+def workshop(db, sample_category):
+    """Fixture: Two members and their projects"""
+    ada = Person.objects.create(name="Ada Lovelace", title="Mentor", bio="Writes analytical engine notes")
+    linus = Person.objects.create(name="Linus Solder", bio="Builds synthesizers")
+    lamp = Project.objects.create(
+        title="Desk Lamp", description="A lamp with a dimmer circuit",
+        category=sample_category, creator=ada,
+    )
+    synth = Project.objects.create(
+        title="Modular Synth", description="Analog oscillators and a lamp indicator",
+        category=sample_category, creator=linus,
+    )
+    return ada, linus, lamp, synth
+
+
+class TestSearchIndex:
+    """Test that documents follow the rows they index"""
+
+    def test_documents_are_created_on_save(self, workshop):
+        """Test that projects and members are indexed when saved"""
+        ada, _, lamp, _ = workshop
+        project = SearchDocument.objects.get(kind=SearchDocument.PROJECT, object_id=lamp.pk)
+        assert project.url == reverse('cavetechapp:project_detail', args=[lamp.slug])
+        assert "Ada Lovelace" in project.keywords
+        assert SearchDocument.objects.get(kind=SearchDocument.PERSON, object_id=ada.pk).title == "Ada Lovelace"
+
+    def test_updates_are_searchable(self, workshop):
+        """Test that edited text replaces the old text in the index"""
+        _, _, lamp, _ = workshop
+        lamp.description = "A lantern"
+        lamp.save()
+        assert "Desk Lamp" in titles("lantern")
+        assert "Desk Lamp" not in titles("dimmer")
+
+    def test_category_translations_are_indexed(self, workshop):
+        """Test that a project is found by its category name in any language"""
+        assert "Desk Lamp" in titles("elektronikk")
+        assert "Desk Lamp" in titles("电子产品")
+
+    def test_renamed_member_updates_projects(self, workshop):
+        """Test that a project's document follows its creator's name"""
+        ada, _, _, _ = workshop
+        ada.name = "Augusta King"
+        ada.save()
+        assert titles("augusta") == ["Augusta King", "Desk Lamp"]
+
+    def test_renamed_category_updates_projects(self, workshop, sample_category):
+        """Test that category edits reach the documents of its projects"""
+        sample_category.name = "Circuits"
+        sample_category.save()
+        assert set(titles("circuits")) == {"Desk Lamp", "Modular Synth"}
+
+    def test_deleted_rows_are_removed(self, workshop):
+        """Test that deleting a project or member drops it from results"""
+        ada, _, lamp, _ = workshop
+        lamp.delete()
+        assert "Desk Lamp" not in titles("lamp")
+        ada.delete()
+        assert titles("ada") == []
+
+    def test_rebuild_command(self, workshop):
+        """Test that the index can be rebuilt from the tables"""
+        SearchDocument.objects.all().delete()
+        call_command('rebuild_search_index', stdout=open('/dev/null', 'w'))
+        assert SearchDocument.objects.count() == 4
+        assert "Modular Synth" in titles("oscillators")
+
+
+class TestSearchQuery:
+    """Test matching and ranking"""
+
+    def test_terms_drop_query_syntax(self):
+        """Test that operators and quotes in the query are ignored"""
+        assert parse_terms('lamp" OR NEAR(x) -"synth*') == ['lamp', 'or', 'near', 'x', 'synth']
+        assert parse_terms('   ') == []
+
+    def test_all_terms_must_match(self, workshop):
+        """Test that every term has to appear in a result"""
+        assert titles("lamp dimmer") == ["Desk Lamp"]
+
+    def test_terms_match_prefixes(self, workshop):
+        """Test that partial words find results"""
+        assert titles("synthes") == ["Linus Solder"]
+
+    def test_title_matches_rank_first(self, workshop):
+        """Test that a match in the title outranks one in the description"""
+        assert titles("lamp") == ["Desk Lamp", "Modular Synth"]
+
+    def test_empty_query(self, workshop):
+        """Test that an empty query matches nothing"""
+        assert titles("") == []
+        assert titles("!!!") == []
+
+
+class TestSearchView:
+    """Test the /search/ page"""
+
+    def test_results_are_listed(self, client, workshop):
+        """Test that matches are rendered with links"""
+        _, _, lamp, _ = workshop
+        response = client.get('/search/', {'q': 'lamp'})
+        assert response.status_code == 200
+        assert [result.title for result in response.context['results']] == ["Desk Lamp", "Modular Synth"]
+        assert reverse('cavetechapp:project_detail', args=[lamp.slug]) in response.content.decode()
+
+    def test_no_query_shows_prompt(self, client, db):
+        """Test that the page renders without a query"""
+        response = client.get('/search/')
+        assert response.status_code == 200
+        assert list(response.context['results']) == []
+
+    def test_results_are_paginated(self, client, sample_category):
+        """Test that results are split into numbered pages"""
+        for i in range(15):
+            Project.objects.create(title=f"Robot {i}", description="Test", category=sample_category)
+        response = client.get('/search/', {'q': 'robot'})
+        assert len(response.context['results']) == 12
+        assert response.context['next_query'] == 'q=robot&page=2'
+        response = client.get('/search/', {'q': 'robot', 'page': 2})
+        assert len(response.context['results']) == 3
+
+    def test_page_cache_follows_index(self, client, settings, workshop):
+        """Test that a cached results page is purged when documents change"""
+        settings.PAGE_CACHE_TIMEOUT = 60
+        assert b"Desk Lamp" in client.get('/search/', {'q': 'lamp'}).content
+        Project.objects.filter(title="Desk Lamp").get().delete()
+        assert b"Desk Lamp" not in client.get('/search/', {'q': 'lamp'}).content
+
+
+class TestAdminSearch:
+    """Test that the admin changelists search the index"""
+
+    def test_admin_search_uses_index(self, admin_client, workshop):
+        """Test that the project changelist finds projects by creator and category"""
+        response = admin_client.get('/admin/cavetechapp/project/', {'q': 'lovelace'})
+        assert [project.title for project in response.context['cl'].result_list] == ["Desk Lamp"]
+        response = admin_client.get('/admin/cavetechapp/person/', {'q': 'mentor'})
+        assert [person.name for person in response.context['cl'].result_list] == ["Ada Lovelace"]
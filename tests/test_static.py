@@ -0,0 +1,169 @@
+"""
+Static file pipeline tests for The Cave Tech Labs application
+"""
+import gzip
+import json
+import os
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import CommandError, call_command
+from django.template import Context, Template
+from cavetechapp.management.commands.subset_fonts import template_text, used_codepoints
+from django.utils.http import http_date
+
+
+@pytest.fixture
+def collected(settings, tmp_path):
+    """Fixture: Run collectstatic with the hashed, compressed storage"""
+    settings.STATIC_ROOT = tmp_path
+    settings.STORAGES = {
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'cavetechapp.storage.CompressedManifestStaticFilesStorage'},
+    }
+    call_command('collectstatic', interactive=False, verbosity=0, ignore_patterns=['admin'])
+    manifest = json.loads((tmp_path / 'staticfiles.json').read_text())
+    return tmp_path, manifest['paths']
+
+
+class TestCompressedManifestStorage:
+    """Test the files written by collectstatic"""
+
+    def test_files_get_hashed_names(self, collected):
+        """Test that collected files are fingerprinted"""
+        root, paths = collected
+        hashed = paths['fonts/dream-avenue.ttf']
+        assert hashed != 'fonts/dream-avenue.ttf'
+        assert (root / hashed).exists()
+        assert staticfiles_storage.url('fonts/dream-avenue.ttf') == f'/static/{hashed}'
+
+    def test_compressible_files_get_gzip_variant(self, collected):
+        """Test that a smaller .gz is written next to text and font files"""
+        root, paths = collected
+        original = root / paths['i18n/en.json']
+        compressed = root / (paths['i18n/en.json'] + '.gz')
+        assert gzip.decompress(compressed.read_bytes()) == original.read_bytes()
+        assert compressed.stat().st_size < original.stat().st_size
+        assert (root / (paths['fonts/dream-avenue.ttf'] + '.gz')).exists()
+
+    def test_brotli_variant_when_available(self, collected):
+        """Test that a .br is written when brotli is installed"""
+        brotli = pytest.importorskip('brotli')
+        root, paths = collected
+        original = root / paths['i18n/en.json']
+        compressed = root / (paths['i18n/en.json'] + '.br')
+        assert brotli.decompress(compressed.read_bytes()) == original.read_bytes()
+
+
+class TestStaticFilesMiddleware:
+    """Test serving collected files from STATIC_ROOT"""
+
+    def test_hashed_file_is_immutable(self, collected, client):
+        """Test that fingerprinted files are cached for a year"""
+        _, paths = collected
+        response = client.get(f"/static/{paths['fonts/dream-avenue.ttf']}")
+        assert response.status_code == 200
+        assert 'immutable' in response.headers['Cache-Control']
+        assert 'max-age=31536000' in response.headers['Cache-Control']
+        assert response.headers['Content-Type'] == 'font/ttf'
+
+    def test_unhashed_file_is_revalidated(self, collected, client, settings):
+        """Test that original names get the short lifetime"""
+        response = client.get('/static/i18n/en.json')
+        assert response.headers['Cache-Control'] == f'public, max-age={settings.STATIC_MAX_AGE}'
+
+    def test_precompressed_variant_is_negotiated(self, collected, client):
+        """Test that gzip clients receive the .gz file"""
+        _, paths = collected
+        path = f"/static/{paths['i18n/en.json']}"
+        response = client.get(path, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['Content-Type'] == 'application/json'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        body = gzip.decompress(b''.join(response.streaming_content))
+        assert json.loads(body)['nav']['people'] == "Members"
+
+        response = client.get(path)
+        assert 'Content-Encoding' not in response.headers
+
+    def test_not_modified(self, collected, client):
+        """Test that If-Modified-Since is answered with 304"""
+        root, paths = collected
+        name = paths['fonts/dream-avenue.ttf']
+        mtime = (root / name).stat().st_mtime
+        response = client.get(f'/static/{name}', HTTP_IF_MODIFIED_SINCE=http_date(mtime + 1))
+        assert response.status_code == 304
+
+    def test_missing_and_unsafe_paths_fall_through(self, collected, client):
+        """Test that unknown files and traversal attempts are not served"""
+        assert client.get('/static/missing.css').status_code == 404
+        assert client.get('/static/../manage.py').status_code == 404
+        assert client.get('/static/%2e%2e/manage.py').status_code == 404
+
+
+class TestSubsetFonts:
+    """Test the font subsetting command"""
+
+    def test_template_text_skips_markup(self):
+        """Test that only rendered text is collected from templates"""
+        text = template_text()
+        assert "CaveTech" in text
+        assert "{% t" not in text
+        assert "font-family" not in text
+
+    def test_codepoints_cover_translations(self):
+        """Test that nb/en strings are covered but zh-hans is not"""
+        codepoints = used_codepoints()
+        assert {ord(c) for c in "Våre medlemmer"} <= codepoints
+        assert ord("们") not in codepoints
+
+    def test_committed_subset_is_current(self):
+        """Test that the committed WOFF2 subset matches the templates"""
+        pytest.importorskip('fontTools')
+        call_command('subset_fonts', check=True)
+
+
+class TestBuildCss:
+    """Test the Tailwind build step and the stylesheet tag"""
+
+    @pytest.fixture
+    def fake_cli(self, tmp_path, settings, monkeypatch):
+        """Fixture: A stand-in Tailwind CLI that records its arguments"""
+        from cavetechapp.management.commands import build_css
+        cli = tmp_path / 'tailwindcss'
+        cli.write_text(
+            '#!/bin/sh\n'
+            'echo "$@" > "$(dirname "$0")/args"\n'
+            'while [ "$1" != "--output" ]; do shift; done\n'
+            'echo "body{margin:0}" > "$2"\n'
+        )
+        cli.chmod(0o755)
+        settings.TAILWIND_CLI = str(cli)
+        monkeypatch.setattr(build_css, 'OUTPUT', tmp_path / 'css' / 'site.css')
+        return tmp_path
+
+    def test_build_css_runs_cli(self, fake_cli):
+        """Test that the CLI is run with the project config and minified"""
+        call_command('build_css', stdout=open(os.devnull, 'w'))
+        args = (fake_cli / 'args').read_text()
+        assert 'tailwind.config.js' in args
+        assert '--minify' in args
+        assert (fake_cli / 'css' / 'site.css').read_text() == "body{margin:0}\n"
+
+    def test_build_css_without_cli(self, settings):
+        """Test that a missing CLI is reported"""
+        settings.TAILWIND_CLI = 'no-such-tailwindcss'
+        with pytest.raises(CommandError, match="not found"):
+            call_command('build_css')
+
+    def test_stylesheet_links_built_file(self, monkeypatch):
+        """Test that the built stylesheet replaces the CDN compiler"""
+        monkeypatch.setattr('cavetechapp.templatetags.site_css.finders.find', lambda path: '/built/site.css')
+        html = Template('{% load site_css %}{% tailwind_stylesheet %}').render(Context())
+        assert html == '<link rel="stylesheet" href="/static/css/site.css">'
+
+    def test_stylesheet_falls_back_to_cdn(self, monkeypatch):
+        """Test that pages stay styled before the first build"""
+        monkeypatch.setattr('cavetechapp.templatetags.site_css.finders.find', lambda path: None)
+        html = Template('{% load site_css %}{% tailwind_stylesheet %}').render(Context())
+        assert 'cdn.tailwindcss.com' in html
@@ -2,8 +2,15 @@
 View tests for The Cave Tech Labs application
 """
 import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import connection
 from django.test import Client
-from cavetechapp.models import Person, Project
+from django.test.utils import CaptureQueriesContext
+from django.utils import translation
+from cavetechapp.cache import page_cache_key
+from cavetechapp.models import Category, Person, Project, SiteSettings
+from cavetechapp.templatetags.fragments import fragment_version
 
 
 class TestIndexView:
@@ -210,3 +217,384 @@ class TestProjectDetailView:
         """Test that project detail returns 404 for nonexistent project"""
         response = client.get('/projects/nonexistent-project/')
         assert response.status_code == 404
+
+
+class TestAboutView:
+    """Test the About page view"""
+
+    @pytest.fixture(autouse=True)
+    def disable_page_cache(self, settings):
+        settings.PAGE_CACHE_TIMEOUT = 0
+
+    def test_about_embeds_precomputed_translations(self, db, client, monkeypatch):
+        """Test that the translations payload is not re-encoded per request"""
+        site = SiteSettings.get_settings()
+        site.about_content = "Innhold"
+        site.about_content_translations = {'en': "Content"}
+        site.save()
+        monkeypatch.setattr(SiteSettings, 'build_translations_json', lambda self: pytest.fail("encoded"))
+        client.cookies['language'] = 'en'
+        content = client.get('/about/').content.decode()
+        assert site.translations_json in content
+        assert 'data-default="Content"' in content
+
+
+class TestPagination:
+    """Test page-number and cursor pagination on the listing views"""
+
+    def make_projects(self, count, category):
+        return [
+            Project.objects.create(title=f"Paged {i}", description="Test", category=category)
+            for i in range(count)
+        ]
+
+    def test_projects_list_first_page_is_limited(self, db, client, sample_category):
+        """Test that the projects list shows one page of projects"""
+        self.make_projects(15, sample_category)
+        response = client.get('/projects/')
+        assert len(response.context['projects']) == 12
+        assert response.context['is_paginated']
+        assert response.context['next_query']
+
+    def test_projects_list_page_number(self, db, client, sample_category):
+        """Test that ?page= returns the remaining projects"""
+        self.make_projects(15, sample_category)
+        response = client.get('/projects/?page=2')
+        assert len(response.context['projects']) == 3
+        assert response.context['next_query'] is None
+
+    def test_projects_list_cursor_walks_all_rows(self, db, client, sample_category):
+        """Test that following ?after= cursors visits every project once, newest first"""
+        projects = self.make_projects(30, sample_category)
+        seen = []
+        url = '/projects/'
+        while url:
+            response = client.get(url)
+            seen.extend(response.context['projects'])
+            next_query = response.context['next_query']
+            url = f'/projects/?{next_query}' if next_query else None
+        expected = sorted(projects, key=lambda p: (-p.created_at.timestamp(), p.pk))
+        assert seen == expected
+
+    def test_projects_list_cursor_keeps_category_filter(self, db, client, sample_category):
+        """Test that the next link keeps the ?category= filter"""
+        self.make_projects(15, sample_category)
+        response = client.get(f'/projects/?category={sample_category.slug}')
+        assert f'category={sample_category.slug}' in response.context['next_query']
+
+    def test_projects_list_invalid_cursor_falls_back_to_first_page(self, db, client, sample_category):
+        """Test that a malformed cursor shows the first page"""
+        self.make_projects(3, sample_category)
+        response = client.get('/projects/?after=not-a-cursor')
+        assert response.status_code == 200
+        assert len(response.context['projects']) == 3
+
+    def test_people_list_cursor_orders_by_name(self, db, client):
+        """Test that people pages continue alphabetically from the cursor"""
+        for i in range(14):
+            Person.objects.create(name=f"Member {i:02d}")
+        first = client.get('/people/')
+        second = client.get(f"/people/?{first.context['next_query']}")
+        names = [p.name for p in first.context['people']] + [p.name for p in second.context['people']]
+        assert names == [f"Member {i:02d}" for i in range(14)]
+
+
+class TestQueryBudget:
+    """Test that no view issues more queries as the number of rows grows"""
+
+    @pytest.fixture(autouse=True)
+    def disable_page_cache(self, settings):
+        """Measure the views themselves, not the page cache"""
+        settings.PAGE_CACHE_TIMEOUT = 0
+
+    def count_queries(self, client, url):
+        """Return the number of queries issued while rendering url"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        assert response.status_code == 200
+        return len(ctx.captured_queries)
+
+    def assert_constant_queries(self, client, url, add_rows):
+        """Render url before and after add_rows() and compare query counts"""
+        add_rows(2)
+        client.get(url)  # warm per-process caches such as SiteSettings
+        before = self.count_queries(client, url)
+        add_rows(10)
+        after = self.count_queries(client, url)
+        assert after == before, f"{url}: {before} queries with few rows, {after} with more"
+
+    def make_projects(self, category=None, creator=None, **kwargs):
+        """Return a callable creating n projects, each with its own category and creator"""
+        def add_rows(n):
+            start = Project.objects.count()
+            for i in range(start, start + n):
+                Project.objects.create(
+                    title=f"Budget Project {i}",
+                    description="Test",
+                    category=category or Category.objects.create(name=f"Budget Category {i}"),
+                    creator=creator or Person.objects.create(name=f"Budget Person {i}"),
+                    **kwargs
+                )
+        return add_rows
+
+    def test_index_query_budget(self, db, client):
+        """Test that the homepage loads featured projects and people in bulk"""
+        self.assert_constant_queries(client, '/', self.make_projects(featured=True))
+
+    def test_people_list_query_budget(self, db, client):
+        """Test that the people list does not query per person"""
+        def add_rows(n):
+            for i in range(n):
+                Person.objects.create(name=f"Budget Member {Person.objects.count()}")
+        self.assert_constant_queries(client, '/people/', add_rows)
+
+    def test_person_detail_query_budget(self, db, client, sample_person):
+        """Test that a profile loads the categories of its projects in bulk"""
+        self.assert_constant_queries(
+            client, f'/people/{sample_person.pk}/', self.make_projects(creator=sample_person)
+        )
+
+    def test_projects_list_query_budget(self, db, client):
+        """Test that the projects list loads categories and creators in bulk"""
+        self.assert_constant_queries(client, '/projects/', self.make_projects())
+
+    def test_projects_list_filtered_query_budget(self, db, client, sample_category):
+        """Test that the category filter loads creators in bulk"""
+        self.assert_constant_queries(
+            client, f'/projects/?category={sample_category.slug}',
+            self.make_projects(category=sample_category)
+        )
+
+    def test_project_detail_query_budget(self, db, client, sample_category):
+        """Test that related projects load their creators in bulk"""
+        project = Project.objects.create(
+            title="Budget Detail", description="Test", category=sample_category
+        )
+        self.assert_constant_queries(
+            client, f'/projects/{project.slug}/', self.make_projects(category=sample_category)
+        )
+
+
+class TestPageCache:
+    """Test the full-page response cache"""
+
+    def test_second_request_is_served_without_queries(self, db, client, sample_category):
+        """Test that a repeated request does not touch the database"""
+        Project.objects.create(title="Cached", description="Test", category=sample_category, featured=True)
+        first = client.get('/')
+        with CaptureQueriesContext(connection) as ctx:
+            second = client.get('/')
+        assert len(ctx.captured_queries) == 0
+        assert second.content == first.content
+
+    def test_project_change_purges_project_pages(self, db, client, sample_category):
+        """Test that saving a project refreshes the projects list"""
+        project = Project.objects.create(title="Cached", description="Test", category=sample_category)
+        client.get('/projects/')
+        project.title = "Renamed"
+        project.save()
+        assert b"Renamed" in client.get('/projects/').content
+
+    def test_deleting_person_purges_people_list(self, db, client, sample_person):
+        """Test that deleting a person refreshes the people list"""
+        assert sample_person.name.encode() in client.get('/people/').content
+        sample_person.delete()
+        assert sample_person.name.encode() not in client.get('/people/').content
+
+    def test_unrelated_change_keeps_about_page(self, db, client, sample_person):
+        """Test that the about page survives changes to people"""
+        client.get('/about/')
+        sample_person.name = "Someone Else"
+        sample_person.save()
+        with CaptureQueriesContext(connection) as ctx:
+            client.get('/about/')
+        assert len(ctx.captured_queries) == 0
+
+    def test_category_filter_is_cached_separately(self, db, client, sample_category):
+        """Test that ?category= variants get their own cache entry"""
+        Project.objects.create(title="Filtered", description="Test", category=sample_category)
+        client.get('/projects/')
+        response = client.get('/projects/?category=no-such-category')
+        assert b"Filtered" not in response.content
+
+    def test_cache_key_varies_by_language(self, db, rf):
+        """Test that each language gets its own cache entry"""
+        request = rf.get('/')
+        with translation.override('nb'):
+            nb_key = page_cache_key(request, (Project,))
+        with translation.override('en'):
+            en_key = page_cache_key(request, (Project,))
+        assert nb_key != en_key
+
+    def test_authenticated_requests_bypass_cache(self, db, client, admin_user, sample_person):
+        """Test that logged-in editors always see a fresh render"""
+        client.force_login(admin_user)
+        client.get('/people/')
+        with CaptureQueriesContext(connection) as ctx:
+            client.get('/people/')
+        assert len(ctx.captured_queries) > 0
+
+    def test_page_cache_can_be_disabled(self, db, client, settings):
+        """Test that PAGE_CACHE_TIMEOUT = 0 turns the cache off"""
+        settings.PAGE_CACHE_TIMEOUT = 0
+        client.get('/people/')
+        with CaptureQueriesContext(connection) as ctx:
+            client.get('/people/')
+        assert len(ctx.captured_queries) > 0
+
+
+class TestConditionalGet:
+    """Test ETag / Last-Modified validators on the public views"""
+
+    def test_views_send_validators(self, db, client, sample_person):
+        """Test that pages carry ETag and Last-Modified headers"""
+        for url in ['/', '/about/', '/people/', f'/people/{sample_person.pk}/', '/projects/']:
+            response = client.get(url)
+            assert response.has_header('ETag'), url
+            assert response.has_header('Last-Modified'), url
+
+    def test_matching_etag_returns_304(self, db, client, sample_category):
+        """Test that a matching If-None-Match short-circuits to 304"""
+        project = Project.objects.create(title="Validated", description="Test", category=sample_category)
+        etag = client.get(f'/projects/{project.slug}/')['ETag']
+        response = client.get(f'/projects/{project.slug}/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response.content == b''
+
+    def test_warm_304_issues_no_queries(self, db, client, sample_person):
+        """Test that revalidating an unchanged page does not touch the database"""
+        etag = client.get('/people/')['ETag']
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get('/people/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert len(ctx.captured_queries) == 0
+
+    def test_if_modified_since_returns_304(self, db, client, sample_person):
+        """Test that If-Modified-Since with the Last-Modified value returns 304"""
+        last_modified = client.get('/people/')['Last-Modified']
+        response = client.get('/people/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304
+
+    def test_etag_changes_when_category_changes(self, db, client, sample_category):
+        """Test that editing a project's category invalidates the detail ETag"""
+        project = Project.objects.create(title="Validated", description="Test", category=sample_category)
+        etag = client.get(f'/projects/{project.slug}/')['ETag']
+        sample_category.description = "Changed"
+        sample_category.save()
+        response = client.get(f'/projects/{project.slug}/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_etag_changes_when_row_is_deleted(self, db, client):
+        """Test that deleting a row changes the list ETag"""
+        Person.objects.create(name="Stays")
+        leaving = Person.objects.create(name="Leaves")
+        etag = client.get('/people/')['ETag']
+        leaving.delete()
+        response = client.get('/people/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_deploy_changes_etag_and_page_key(self, db, client, settings, sample_person):
+        """Test that a new SITE_VERSION neither revalidates nor serves pages of the old build"""
+        settings.SITE_VERSION = 'build-1'
+        response = client.get('/people/')
+        etag = response.headers['ETag']
+        settings.SITE_VERSION = 'build-2'
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get('/people/', HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert len(ctx.captured_queries) > 0
+
+    def test_missing_page_has_no_validators(self, db, client):
+        """Test that 404 responses are not given an ETag"""
+        response = client.get('/projects/nonexistent-project/')
+        assert response.status_code == 404
+        assert not response.has_header('ETag')
+
+
+class TestListingColumns:
+    """Test that listings read the stored excerpts instead of the long text"""
+
+    @pytest.fixture(autouse=True)
+    def no_page_cache(self, settings):
+        """Fixture: Render every request, so every listing query runs"""
+        settings.PAGE_CACHE_TIMEOUT = 0
+
+    @pytest.mark.parametrize('path', ['/', '/projects/', '/people/'])
+    def test_listing_skips_long_text(self, db, client, sample_category, sample_person, path):
+        """Test that listing pages never select the description or bio columns"""
+        Project.objects.create(
+            title="Listed", description="Test", category=sample_category, creator=sample_person, featured=True
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            assert client.get(path).status_code == 200
+        columns = ('"cavetechapp_project"."description"', '"cavetechapp_person"."bio"')
+        for query in ctx.captured_queries:
+            assert not any(column in query['sql'] for column in columns)
+
+    def test_cards_show_excerpts(self, db, client, sample_category, sample_person):
+        """Test that cards render the stored excerpts"""
+        Project.objects.create(
+            title="Excerpted", description=' '.join(['lamp'] * 30), category=sample_category
+        )
+        content = client.get('/projects/').content.decode()
+        assert ' '.join(['lamp'] * 20) + ' …' in content
+
+
+class TestCardFragments:
+    """Test the cached project and member cards"""
+
+    @pytest.fixture(autouse=True)
+    def no_page_cache(self, settings):
+        """Fixture: Render every request, so only the fragment cache is in play"""
+        settings.PAGE_CACHE_TIMEOUT = 0
+
+    def test_project_card_is_cached(self, db, client, sample_category):
+        """Test that a rendered card is stored under its row's version"""
+        Project.objects.create(title="Carded", description="Test", category=sample_category)
+        client.get('/projects/')
+        project = Project.objects.select_related('category', 'creator').get(title="Carded")
+        with translation.override('nb'):
+            key = make_template_fragment_key('project_card', [fragment_version(project), 20])
+        assert "Carded" in cache.get(key)
+
+    def test_cached_cards_are_reused(self, db, client, sample_person):
+        """Test that a card is rendered once and then served from the cache"""
+        client.get('/people/')
+        cache.set(
+            make_template_fragment_key('person_card', [fragment_version(Person.objects.get()), True]),
+            '<p>From the cache</p>',
+        )
+        assert b"From the cache" in client.get('/people/').content
+
+    def test_edited_row_gets_a_new_card(self, db, client, sample_category):
+        """Test that saving a project renders its card again"""
+        project = Project.objects.create(title="Before", description="Test", category=sample_category)
+        client.get('/projects/')
+        project.title = "After"
+        project.save()
+        content = client.get('/projects/').content
+        assert b"After" in content
+        assert b"Before" not in content
+
+    def test_related_row_change_refreshes_card(self, db, client, sample_category, sample_person):
+        """Test that renaming a project's creator renders its card again"""
+        Project.objects.create(
+            title="Credited", description="Test", category=sample_category, creator=sample_person
+        )
+        client.get('/projects/')
+        sample_person.name = "Renamed Maker"
+        sample_person.save()
+        assert b"Renamed Maker" in client.get('/projects/').content
+
+    def test_cards_vary_by_language(self, db, client, settings, sample_category, sample_person):
+        """Test that each language gets its own copy of a card"""
+        Project.objects.create(
+            title="Bilingual", description="Test", category=sample_category, creator=sample_person
+        )
+        client.cookies[settings.LANGUAGE_COOKIE_NAME] = 'nb'
+        assert b"<span>av</span>" in client.get('/projects/').content
+        client.cookies[settings.LANGUAGE_COOKIE_NAME] = 'en'
+        assert b"<span>by</span>" in client.get('/projects/').content
+